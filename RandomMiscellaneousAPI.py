@@ -12,22 +12,112 @@
 #    altamente configurable y está diseñada para ofrecer respuestas claras,
 #    estructuradas y listas para integrarse en sistemas frontend, scripts 
 #    automatizados o entornos de desarrollo.
-# Requisitos: pip install Flask, pip install flask-cors, pip install flasgger, pip install faker
-# Librerías: Flask, jsonify, request, CORS, Swagger, Faker, randint, sample, uniform, choices, choice, datetime, timedelta
+# Requisitos: pip install Flask, pip install flask-cors, pip install flasgger, pip install faker, pip install numpy
+# Librerías: Flask, jsonify, request, g, CORS, Swagger, Faker, numpy, orjson, msgpack, cbor2, Random, datetime, timedelta
 #####################
 
 ### LIBRERÍAS ###
 # Instaladas
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, stream_with_context, g, has_request_context, send_from_directory
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import HTTPException
 from flask_cors import CORS
-from flasgger import Swagger
-from faker import Faker
+# Opcionales (serialización)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+# Opcionales (compresión)
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+# Opcionales (bloqueo de archivos entre procesos; no existe en Windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 # Nativas
-from random import randint, sample, uniform, choices, choice
+from random import Random
+import random
 from datetime import datetime, timedelta
+from collections import OrderedDict
+from threading import Condition, Lock, Thread, local
+from time import monotonic, perf_counter, sleep, time
+from bisect import bisect_left
+from itertools import chain, combinations, combinations_with_replacement, islice
+from types import MappingProxyType
+from functools import cache, wraps
+import atexit
+import cProfile
+import codecs
+import csv
+import hashlib
+import hmac
+import importlib.util
+import heapq
+import io
+import json
+import math
+import os
+import pstats
+import secrets
+import shutil
+import string
+import struct
+import sys
+import tempfile
+import zlib
 #################
 
+### CLASE ###
+# Nombre: ProveedorJSON
+# Descripción: Proveedor JSON de Flask que codifica con orjson cuando está
+#    instalado y con json de la librería estándar en otro caso. Mantiene las
+#    claves ordenadas y los tipos que ya soporta Flask (fechas, Decimal, UUID...).
+#    Las respuestas de jsonify y de respuesta_json pasan por aquí.
+###############
+class ProveedorJSON(DefaultJSONProvider):
+    if orjson is not None:
+        OPCIONES = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.codificar(obj).decode('utf-8')
+
+    # Codifica directamente a bytes, sin pasar por str cuando se usa orjson.
+    # orjson no acepta enteros de más de 64 bits (NumAleatorio con límites
+    # grandes); en ese caso se codifica con json de la librería estándar.
+    def codificar(self, obj):
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=self.default, option=self.OPCIONES)
+            except orjson.JSONEncodeError:
+                pass
+        return json.dumps(obj, default=self.default, ensure_ascii=self.ensure_ascii,
+                          sort_keys=self.sort_keys, separators=(',', ':')).encode('utf-8')
+
+    def response(self, *args, **kwargs):
+        if self.compact is None and self._app.debug:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.codificar(obj), mimetype=self.mimetype)
+
 app = Flask(__name__)
+app.json = ProveedorJSON(app)
 CORS(app)
 
 # Configuración de Swagger
@@ -45,7 +135,2559 @@ swagger_config = {
     "basePath": "/"
 }
 
-swagger = Swagger(app, template=swagger_config)
+# Con RMAPI_PRODUCCION=1 no se importa flasgger: la especificación se genera
+# antes con generar_openapi.py y se sirve desde static/openapi.json
+MODO_PRODUCCION = os.environ.get('RMAPI_PRODUCCION', '') == '1'
+ARCHIVO_OPENAPI = os.path.join(app.static_folder, 'openapi.json')
+
+if not MODO_PRODUCCION:
+    from flasgger import Swagger
+    swagger = Swagger(app, template=swagger_config)
+
+### CONFIGURACIÓN ###
+# Límites de los parámetros de los endpoints (ver con_parametros). MAX_CANTIDAD
+# es el límite de cantidad por petición cuando no se usa masivo, formato
+# binario ni stream.
+MAX_CANTIDAD = int(os.environ.get('RMAPI_MAX_CANTIDAD', 100))
+MAX_DADOS = int(os.environ.get('RMAPI_MAX_DADOS', 10))
+MAX_LONGITUD_BINARIO = int(os.environ.get('RMAPI_MAX_LONGITUD_BINARIO', 128))
+MAX_DECIMALES = int(os.environ.get('RMAPI_MAX_DECIMALES', 10))
+# Mazos por zapato en BarajaAleatoria y comodines por mazo
+MAX_MAZOS = int(os.environ.get('RMAPI_MAX_MAZOS', 100))
+MAX_COMODINES = 2
+# Tablas alias de SeleccionAleatoria con pesos que se mantienen en memoria
+MAX_TABLAS_ALIAS = int(os.environ.get('RMAPI_MAX_TABLAS_ALIAS', 256))
+# Líneas que guarda el reservorio de /api/MuestraReservorio
+MAX_RESERVORIO = int(os.environ.get('RMAPI_MAX_RESERVORIO', 100000))
+# Mezcla externa (/api/MezclaAleatoria): memoria máxima aproximada de las líneas
+# que se mezclan en memoria, cubetas por partición, directorio de los archivos
+# temporales, bytes por lectura de las cubetas y tamaño máximo del cuerpo
+MEZCLA_MEMORIA = int(os.environ.get('RMAPI_MEZCLA_MEMORIA', 64 << 20))
+MEZCLA_CUBETAS = int(os.environ.get('RMAPI_MEZCLA_CUBETAS', 64))
+MEZCLA_DIRECTORIO = os.environ.get('RMAPI_MEZCLA_DIR') or None
+MEZCLA_BLOQUE = 1 << 20
+MAX_MEZCLA_BYTES = int(os.environ.get('RMAPI_MAX_MEZCLA_BYTES', 16 << 30))
+# Tamaño de los bloques con que se lee el cuerpo de las peticiones POST con listas
+BLOQUE_LECTURA = int(os.environ.get('RMAPI_BLOQUE_LECTURA', 1 << 16))
+# Sesiones de baraja (/api/SesionBaraja). Cada worker guarda las suyas en
+# memoria; caducan tras RMAPI_SESION_TTL segundos sin usarse y no se crean más
+# si la memoria de todas superaría RMAPI_SESIONES_MAX_BYTES.
+SESION_TTL_SEGUNDOS = int(os.environ.get('RMAPI_SESION_TTL', 1800))
+SESIONES_MAX_BYTES = int(os.environ.get('RMAPI_SESIONES_MAX_BYTES', 64 << 20))
+# Límite de lanzamientos de moneda y dado con resumen=1 (solo conteos)
+MAX_LANZAMIENTOS_RESUMEN = int(os.environ.get('RMAPI_MAX_RESUMEN', 10**12))
+# Pool de instancias de Faker por locale
+FAKER_LOCALE_DEFECTO = 'es_MX'
+FAKER_MAX_LOCALES = int(os.environ.get('RMAPI_FAKER_MAX_LOCALES', 8))
+FAKER_TTL_SEGUNDOS = int(os.environ.get('RMAPI_FAKER_TTL', 3600))
+# Límite de cantidad para el modo masivo (masivo=1)
+MAX_CANTIDAD_MASIVO = int(os.environ.get('RMAPI_MAX_MASIVO', 1000000))
+# Salida en streaming (stream=ndjson|csv)
+FORMATOS_STREAM = ('ndjson', 'csv')
+MAX_CANTIDAD_STREAM = int(os.environ.get('RMAPI_MAX_STREAM', 10000000))
+FILAS_POR_BLOQUE_STREAM = int(os.environ.get('RMAPI_FILAS_BLOQUE_STREAM', 4096))
+# Formatos de respuesta de los endpoints numéricos (formato=... o cabecera Accept)
+FORMATOS_RESPUESTA = MappingProxyType({
+    'json': 'application/json',
+    'octet': 'application/octet-stream',
+    'msgpack': 'application/msgpack',
+    'cbor': 'application/cbor',
+})
+# Cantidad máxima de llamadas por lote en /api/batch
+MAX_LLAMADAS_BATCH = int(os.environ.get('RMAPI_MAX_BATCH', 100))
+# Buffer de entropía rellenado en segundo plano
+ENTROPIA_BYTES = int(os.environ.get('RMAPI_ENTROPIA_BYTES', 1 << 20))
+ENTROPIA_BLOQUE = int(os.environ.get('RMAPI_ENTROPIA_BLOQUE', 1 << 16))
+# Límites de ContraseñaAleatoria
+MAX_CANTIDAD_CONTRASENAS = int(os.environ.get('RMAPI_MAX_CONTRASENAS', 10000))
+MAX_LONGITUD_CONTRASENA = int(os.environ.get('RMAPI_MAX_LONGITUD_CONTRASENA', 1024))
+# Compresión de respuestas (Accept-Encoding)
+COMPRESION_MINIMO_BYTES = int(os.environ.get('RMAPI_COMPRESION_MINIMO', 1024))
+TIPOS_COMPRIMIBLES = ('application/json', 'application/x-ndjson', 'text/csv', 'text/html', 'text/plain')
+# gunicorn define SERVER_SOFTWARE antes de cargar la aplicación; fuera de
+# gunicorn (servidor de desarrollo, benchmarks, generar_openapi.py) hay un
+# solo proceso y no hace falta compartir nada entre workers
+BAJO_GUNICORN = os.environ.get('SERVER_SOFTWARE', '').startswith('gunicorn/')
+# PID del proceso que importa la API: con preload_app es el maestro de gunicorn
+PID_PRINCIPAL = os.getpid()
+# Métricas (/metrics). Con RMAPI_METRICAS_DIR, o bajo gunicorn, cada worker
+# vuelca sus contadores en un archivo de este directorio; por defecto uno
+# temporal que depende de PID_PRINCIPAL y lo comparten todos los workers. En
+# un solo proceso las métricas se quedan en memoria.
+DIRECTORIO_METRICAS = os.environ.get('RMAPI_METRICAS_DIR') or (
+    os.path.join(tempfile.gettempdir(), f'rmapi_metricas_{PID_PRINCIPAL}') if BAJO_GUNICORN else None)
+# Sesiones de baraja. Con RMAPI_SESIONES_DIR, o bajo gunicorn, se guardan en
+# archivos de este directorio para que cualquier worker atienda cualquier
+# sesión; en un solo proceso se quedan en memoria.
+DIRECTORIO_SESIONES = os.environ.get('RMAPI_SESIONES_DIR') or (
+    os.path.join(tempfile.gettempdir(), f'rmapi_sesiones_{PID_PRINCIPAL}') if BAJO_GUNICORN else None)
+INTERVALO_METRICAS = float(os.environ.get('RMAPI_METRICAS_INTERVALO', 1.0))
+LIMITES_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Perfilado bajo demanda: las peticiones con la cabecera X-Perfil-Token igual a
+# RMAPI_PERFIL_TOKEN se ejecutan con cProfile (desactivado si no se define).
+# Con RMAPI_PERFIL_DIR el perfil se guarda en ese directorio; si no, se
+# devuelve como archivo adjunto en lugar de la respuesta.
+TOKEN_PERFIL = os.environ.get('RMAPI_PERFIL_TOKEN', '')
+DIRECTORIO_PERFILES = os.environ.get('RMAPI_PERFIL_DIR', '')
+LINEAS_PERFIL = int(os.environ.get('RMAPI_PERFIL_LINEAS', 40))
+# Campos de las respuestas que indican cuántos elementos se generaron
+CAMPOS_CANTIDAD = ('cantidad', 'total_lanzamientos', 'total_decisiones', 'total_cartas')
+#####################
+
+### TABLAS ###
+# Tablas constantes que usan los endpoints. Se construyen una sola vez al
+# importar el módulo y son inmutables, así cada petición solo hace el muestreo.
+
+# Baraja inglesa de 52 cartas
+BARAJA = (
+    "AS", "2S", "3S", "4S", "5S", "6S", "7S", "8S", "9S", "10S", "JS", "QS", "KS",
+    "AD", "2D", "3D", "4D", "5D", "6D", "7D", "8D", "9D", "10D", "JD", "QD", "KD",
+    "AC", "2C", "3C", "4C", "5C", "6C", "7C", "8C", "9C", "10C", "JC", "QC", "KC",
+    "AH", "2H", "3H", "4H", "5H", "6H", "7H", "8H", "9H", "10H", "JH", "QH", "KH"
+)
+
+# Las cartas se manejan como enteros: 0 a 51 son las de BARAJA en ese orden y
+# 52 y 53 los comodines rojo y negro. Solo las repartidas se convierten a texto
+# indexando esta tupla.
+COMODINES = ("RJ", "BJ")
+NOMBRES_CARTAS = BARAJA + COMODINES
+
+# Clases de caracteres de las contraseñas
+CLASES_CONTRASENA = MappingProxyType({
+    'minusculas': 'abcdefghijklmnopqrstuvwxyz',
+    'mayusculas': 'ABCDEFGHIJKLMNOPQRSTUVWXYZ',
+    'digitos': '0123456789',
+    'simbolos': '!#$%&*-=+?',
+})
+CARACTERES_CONTRASENA = ''.join(CLASES_CONTRASENA.values())
+
+# Caracteres ASCII imprimibles y extendidos (sin DEL)
+CARACTERES_VALIDOS = ''.join(chr(i) for i in range(32, 255) if i != 127)
+
+# Rangos de emojis
+EMOJI_RANGOS = (
+    range(0x1F600, 0x1F64F + 1),  # Emoticons
+    range(0x1F300, 0x1F5FF + 1),  # Símbolos y pictogramas
+    range(0x1F680, 0x1F6FF + 1),  # Transporte y mapas
+    range(0x1F1E6, 0x1F1FF + 1),  # Banderas
+    range(0x1F900, 0x1F9FF + 1),  # Símbolos suplementarios
+    range(0x1FA70, 0x1FAFF + 1),  # Extensión de símbolos
+)
+
+# Países por continente
+PAISES_POR_CONTINENTE = MappingProxyType({
+    'america': ("Argentina", "Bahamas", "Barbados", "Belice", "Bolivia", "Brasil", "Canadá", "Chile", "Colombia", "Costa Rica",
+        "Cuba", "Dominica", "Ecuador", "El Salvador", "Estados Unidos", "Granada", "Guatemala", "Guyana", "Haití",
+        "Honduras", "Jamaica", "México", "Nicaragua", "Panamá", "Paraguay", "Perú", "República Dominicana",
+        "San Cristóbal y Nieves", "Santa Lucía", "San Vicente y las Granadinas", "Surinam", "Trinidad y Tobago",
+        "Uruguay", "Venezuela"),
+    'europa': ("Alemania", "Andorra", "Austria", "Bélgica", "Bosnia y Herzegovina", "Bulgaria", "Chipre", "Croacia",
+        "Dinamarca", "Eslovaquia", "Eslovenia", "España", "Estonia", "Finlandia", "Francia", "Grecia", "Hungría",
+        "Irlanda", "Islandia", "Italia", "Kosovo", "Letonia", "Liechtenstein", "Lituania", "Luxemburgo", "Malta",
+        "Moldavia", "Mónaco", "Montenegro", "Noruega", "Países Bajos", "Polonia", "Portugal", "Reino Unido",
+        "República Checa", "Rumania", "Rusia", "San Marino", "Serbia", "Suecia", "Suiza", "Ucrania", "Vaticano"),
+    'asia': ("Afganistán", "Arabia Saudita", "Armenia", "Azerbaiyán", "Bangladés", "Baréin", "Birmania", "Brunéi", "Bután",
+        "Camboya", "Catar", "China", "Corea del Norte", "Corea del Sur", "Emiratos Árabes Unidos", "Filipinas",
+        "Georgia", "India", "Indonesia", "Irak", "Irán", "Israel", "Japón", "Jordania", "Kazajistán", "Kirguistán",
+        "Kuwait", "Laos", "Líbano", "Malasia", "Maldivas", "Mongolia", "Nepal", "Omán", "Pakistán", "Singapur",
+        "Siria", "Sri Lanka", "Tayikistán", "Tailandia", "Timor Oriental", "Turkmenistán", "Turquía", "Uzbekistán",
+        "Vietnam", "Yemen"),
+    'africa': ("Angola", "Argelia", "Benín", "Botsuana", "Burkina Faso", "Burundi", "Cabo Verde", "Camerún", "Chad",
+        "Comoras", "Congo", "Costa de Marfil", "Egipto", "Eritrea", "Esuatini", "Etiopía", "Gabón", "Gambia",
+        "Ghana", "Guinea", "Guinea-Bisáu", "Guinea Ecuatorial", "Kenia", "Lesoto", "Liberia", "Libia", "Madagascar",
+        "Malaui", "Malí", "Marruecos", "Mauricio", "Mauritania", "Mozambique", "Namibia", "Níger", "Nigeria",
+        "República Centroafricana", "República Democrática del Congo", "Ruanda", "Santo Tomé y Príncipe",
+        "Senegal", "Seychelles", "Sierra Leona", "Somalia", "Sudáfrica", "Sudán", "Sudán del Sur", "Tanzania",
+        "Togo", "Túnez", "Uganda", "Yibuti", "Zambia", "Zimbabue"),
+    'oceania': ("Australia", "Fiyi", "Islas Marshall", "Islas Salomón", "Kiribati", "Micronesia", "Nauru", "Nueva Zelanda",
+        "Palaos", "Papúa Nueva Guinea", "Samoa", "Tonga", "Tuvalu", "Vanuatu")
+})
+
+PAIS_A_CONTINENTE = MappingProxyType({
+    pais: continente
+    for continente, paises in PAISES_POR_CONTINENTE.items()
+    for pais in paises
+})
+
+# Países candidatos para cada una de las 32 combinaciones de continentes.
+# La llave es el conjunto de continentes; el conjunto vacío equivale a no filtrar.
+PAISES_POR_FILTRO = MappingProxyType({
+    frozenset(combinacion): tuple(chain.from_iterable(PAISES_POR_CONTINENTE[c] for c in combinacion))
+    for r in range(1, len(PAISES_POR_CONTINENTE) + 1)
+    for combinacion in combinations(PAISES_POR_CONTINENTE, r)
+} | {frozenset(): tuple(PAIS_A_CONTINENTE)})
+
+# Resultados posibles de un lanzamiento de varios dados sin importar el orden.
+# Es una tupla de arreglos: cuántas veces sale cada cara (una fila por
+# resultado), su probabilidad (coeficiente multinomial / 6^dados) y su suma.
+# Con 10 dados son 3003 resultados; se calcula al primer uso de cada cantidad
+# de dados y queda en caché.
+@cache
+def combinaciones_dados(dados):
+    import numpy as np
+
+    caras = np.array([np.bincount(combinacion, minlength=6)
+                      for combinacion in combinations_with_replacement(range(6), dados)], dtype=np.int64)
+    formas = np.array([math.factorial(dados) // math.prod(math.factorial(k) for k in fila) for fila in caras.tolist()])
+    probabilidades = formas / formas.sum()
+    return caras, probabilidades, caras @ np.arange(1, 7)
+################
+
+### CLASE ###
+# Nombre: MetricasProceso
+# Descripción: Contadores de métricas del proceso actual: peticiones por
+#    endpoint, método y status; errores por code; histograma de latencia y
+#    elementos generados. Se actualizan en memoria y, si hay directorio, un
+#    hilo en segundo plano los vuelca como JSON en un archivo propio del
+#    proceso cada INTERVALO_METRICAS segundos si hubo cambios, así las
+#    peticiones no escriben en disco; /metrics suma los archivos de todos los
+#    workers. Si el proceso cambia de PID (fork de un worker) los contadores
+#    heredados se descartan y el hilo se vuelve a crear.
+# Parámetros:
+#   - directorio: Directorio compartido de los archivos de métricas, o None
+#     para contar solo en memoria (un solo proceso).
+#   - intervalo: Segundos mínimos entre volcados.
+###############
+class MetricasProceso:
+    def __init__(self, directorio, intervalo):
+        self._directorio = directorio
+        self._intervalo = intervalo
+        self._candado = Lock()
+        self._reiniciar()
+
+    def _reiniciar(self):
+        self._pid = os.getpid()
+        self._peticiones = {}
+        self._errores = {}
+        self._latencias = {}
+        self._elementos = {}
+        self._pendiente = False
+        if self._directorio is not None:
+            self._archivo = os.path.join(self._directorio, f'{self._pid}-{os.urandom(4).hex()}.json')
+            Thread(target=self._volcar_periodicamente, args=(self._pid,), daemon=True).start()
+
+    def _volcar_periodicamente(self, pid):
+        while True:
+            sleep(self._intervalo)
+            if self._pid != pid:
+                return
+            if self._pendiente:
+                self.volcar()
+
+    def _comprobar_proceso(self):
+        if self._pid != os.getpid():
+            self._reiniciar()
+
+    def registrar(self, endpoint, metodo, status, codigo, segundos, elementos):
+        with self._candado:
+            self._comprobar_proceso()
+
+            clave = f'{endpoint}\t{metodo}\t{status}'
+            self._peticiones[clave] = self._peticiones.get(clave, 0) + 1
+            if codigo is not None:
+                clave = f'{endpoint}\t{codigo}'
+                self._errores[clave] = self._errores.get(clave, 0) + 1
+
+            # Conteos por cubeta (no acumulados) y, al final, la suma de segundos
+            histograma = self._latencias.get(endpoint)
+            if histograma is None:
+                histograma = self._latencias[endpoint] = [0] * (len(LIMITES_LATENCIA) + 1) + [0.0]
+            histograma[bisect_left(LIMITES_LATENCIA, segundos)] += 1
+            histograma[-1] += segundos
+
+            if elementos:
+                self._elementos[endpoint] = self._elementos.get(endpoint, 0) + elementos
+
+            self._pendiente = True
+
+    def sumar_elementos(self, endpoint, elementos):
+        with self._candado:
+            self._comprobar_proceso()
+            self._elementos[endpoint] = self._elementos.get(endpoint, 0) + elementos
+            self._pendiente = True
+
+    def volcar(self):
+        if self._directorio is None:
+            return
+        with self._candado:
+            self._comprobar_proceso()
+            datos = json.dumps({
+                'peticiones': self._peticiones,
+                'errores': self._errores,
+                'latencias': self._latencias,
+                'elementos': self._elementos,
+            })
+            archivo = self._archivo
+            self._pendiente = False
+
+        os.makedirs(self._directorio, exist_ok=True)
+        temporal = f'{archivo}.{os.urandom(4).hex()}.tmp'
+        with open(temporal, 'w', encoding='utf-8') as salida:
+            salida.write(datos)
+        os.replace(temporal, archivo)
+
+    def sumar_procesos(self):
+        totales = {'peticiones': {}, 'errores': {}, 'latencias': {}, 'elementos': {}}
+        if self._directorio is None:
+            with self._candado:
+                self._comprobar_proceso()
+                totales['peticiones'].update(self._peticiones)
+                totales['errores'].update(self._errores)
+                totales['latencias'].update((endpoint, list(histograma)) for endpoint, histograma in self._latencias.items())
+                totales['elementos'].update(self._elementos)
+            return totales
+
+        try:
+            nombres = os.listdir(self._directorio)
+        except FileNotFoundError:
+            return totales
+
+        for nombre in nombres:
+            if not nombre.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self._directorio, nombre), encoding='utf-8') as entrada:
+                    datos = json.load(entrada)
+            except (OSError, ValueError):
+                continue
+
+            for seccion in ('peticiones', 'errores', 'elementos'):
+                for clave, valor in datos[seccion].items():
+                    totales[seccion][clave] = totales[seccion].get(clave, 0) + valor
+            for endpoint, histograma in datos['latencias'].items():
+                acumulado = totales['latencias'].get(endpoint)
+                if acumulado is None:
+                    totales['latencias'][endpoint] = list(histograma)
+                else:
+                    totales['latencias'][endpoint] = [a + b for a, b in zip(acumulado, histograma)]
+        return totales
+
+metricas = MetricasProceso(DIRECTORIO_METRICAS, INTERVALO_METRICAS)
+
+### FUNCIÓN ###
+# Nombre: limpiar_metricas
+# Descripción: Borra los archivos de métricas de ejecuciones anteriores. Lo usa
+#    gunicorn.conf.py al arrancar y al terminar el servidor, y se registra con
+#    atexit para el proceso principal. El directorio solo se elimina si es el
+#    temporal por defecto.
+###############
+def limpiar_metricas():
+    limpiar_directorio(DIRECTORIO_METRICAS, 'RMAPI_METRICAS_DIR', ('.json', '.tmp'))
+
+### FUNCIÓN ###
+# Nombre: limpiar_directorio
+# Descripción: Borra los archivos con las extensiones dadas de un directorio
+#    compartido entre workers. Solo actúa en el proceso principal, no en los
+#    workers que heredan los registros de atexit, y elimina el directorio si
+#    no se eligió con su variable de entorno.
+# Parámetros:
+#   - directorio: Directorio compartido, o None si no se usa.
+#   - variable: Variable de entorno con la que se puede elegir el directorio.
+#   - extensiones: Extensiones de los archivos a borrar.
+###############
+def limpiar_directorio(directorio, variable, extensiones):
+    if directorio is None or os.getpid() != PID_PRINCIPAL:
+        return
+    try:
+        nombres = os.listdir(directorio)
+    except FileNotFoundError:
+        return
+    for nombre in nombres:
+        if nombre.endswith(extensiones):
+            try:
+                os.remove(os.path.join(directorio, nombre))
+            except FileNotFoundError:
+                pass
+    if not os.environ.get(variable):
+        try:
+            os.rmdir(directorio)
+        except OSError:
+            pass
+
+# El directorio temporal por defecto no debe sobrevivir al proceso principal
+# aunque el servidor se detenga sin pasar por on_exit de gunicorn.conf.py
+if DIRECTORIO_METRICAS is not None and not os.environ.get('RMAPI_METRICAS_DIR'):
+    atexit.register(limpiar_metricas)
+
+### FUNCIÓN ###
+# Nombre: etiqueta_endpoint
+# Descripción: Etiqueta del endpoint de la petición actual para las métricas:
+#    la regla de la ruta, o 'sin_ruta' si no coincidió con ninguna.
+# Respuesta: Texto con la etiqueta.
+###############
+def etiqueta_endpoint():
+    return request.url_rule.rule if request.url_rule is not None else 'sin_ruta'
+
+### FUNCIÓN ###
+# Nombre: iniciar_medicion
+# Descripción: Guarda el instante de inicio de la petición. Se registra antes
+#    que los demás before_request para medir también las peticiones que estos
+#    rechazan.
+###############
+@app.before_request
+def iniciar_medicion():
+    g.inicio_peticion = perf_counter()
+
+### FUNCIÓN ###
+# Nombre: iniciar_perfil
+# Descripción: Si la petición trae un X-Perfil-Token válido, empieza a perfilar
+#    con cProfile el hilo que la atiende (incluye la validación).
+###############
+@app.before_request
+def iniciar_perfil():
+    token = request.headers.get('X-Perfil-Token')
+    if not TOKEN_PERFIL or token is None or not hmac.compare_digest(token, TOKEN_PERFIL):
+        return None
+
+    perfil = cProfile.Profile()
+    try:
+        perfil.enable()
+    except ValueError:
+        # Ya hay otro perfilador activo en el hilo
+        return None
+    g.perfil = perfil
+    return None
+
+### FUNCIÓN ###
+# Nombre: marcar_generacion
+# Descripción: Marca el fin de la validación y el inicio de la generación para
+#    Server-Timing. Se llama desde las funciones que obtienen aleatoriedad; solo
+#    cuenta la primera llamada de la petición.
+###############
+def marcar_generacion():
+    if has_request_context() and 'inicio_generacion' not in g:
+        g.inicio_generacion = perf_counter()
+
+### FUNCIÓN ###
+# Nombre: preparar_semilla
+# Descripción: Lee el argumento opcional seed de cualquier endpoint. Si viene,
+#    la petición usa generadores propios inicializados con esa semilla, de modo
+#    que peticiones idénticas devuelven resultados idénticos.
+# Respuesta: Respuesta de error 400 si la semilla no es un entero no negativo.
+###############
+@app.before_request
+def preparar_semilla():
+    semilla = request.args.get('seed')
+    if semilla is None:
+        return None
+
+    try:
+        semilla = int(semilla)
+    except ValueError:
+        semilla = -1
+
+    if semilla < 0:
+        return respuesta_error('La semilla debe ser un entero mayor o igual a 0.', 1004)
+
+    g.semilla = semilla
+    return None
+
+### FUNCIÓN ###
+# Nombre: obtener_rng
+# Descripción: Devuelve el generador random.Random de la petición actual. Con
+#    seed se crea uno nuevo a partir de la semilla; sin ella se usa uno propio
+#    del hilo, así los hilos del servidor no comparten el estado del módulo
+#    random.
+# Respuesta: Instancia de random.Random.
+###############
+_rng_hilo = local()
+
+def obtener_rng():
+    marcar_generacion()
+    rng = g.get('rng')
+    if rng is None:
+        semilla = g.get('semilla')
+        if semilla is not None:
+            rng = Random(semilla)
+        else:
+            rng = getattr(_rng_hilo, 'rng', None)
+            if rng is None:
+                rng = _rng_hilo.rng = Random()
+        g.rng = rng
+    return rng
+
+### FUNCIÓN ###
+# Nombre: obtener_rng_np
+# Descripción: Equivalente de obtener_rng para el Generator de NumPy.
+# Respuesta: Instancia de numpy.random.Generator.
+###############
+def obtener_rng_np():
+    import numpy as np
+
+    marcar_generacion()
+    rng_np = g.get('rng_np')
+    if rng_np is None:
+        semilla = g.get('semilla')
+        if semilla is not None:
+            rng_np = np.random.default_rng(semilla)
+        else:
+            rng_np = getattr(_rng_hilo, 'rng_np', None)
+            if rng_np is None:
+                rng_np = _rng_hilo.rng_np = np.random.default_rng()
+        g.rng_np = rng_np
+    return rng_np
+
+### CLASE ###
+# Nombre: BufferEntropia
+# Descripción: Buffer circular preasignado con bytes aleatorios de os.urandom.
+#    Un hilo en segundo plano lo rellena por bloques y los generadores toman
+#    porciones con tomar(), de modo que la entropía se pide al sistema en
+#    lecturas grandes en lugar de una llamada por valor. Si el buffer no tiene
+#    suficientes bytes, tomar() los lee directamente con os.urandom.
+# Parámetros:
+#   - tamano: Tamaño del buffer en bytes.
+#   - bloque: Bytes que se leen de os.urandom en cada relleno.
+###############
+class BufferEntropia:
+    def __init__(self, tamano, bloque):
+        self.tamano = tamano
+        self.bloque = min(bloque, tamano)
+        self.reiniciar()
+
+    # Descarta el contenido y el hilo de relleno. Se usa también después de un
+    # fork, donde el hilo no existe y los bytes heredados estarían repetidos.
+    def reiniciar(self):
+        # Despierta al hilo anterior (si sigue vivo) para que termine; sin
+        # bloquear, por si el candado quedó tomado al momento del fork.
+        anterior = getattr(self, '_condicion', None)
+        if anterior is not None and anterior.acquire(blocking=False):
+            self._condicion = None
+            anterior.notify_all()
+            anterior.release()
+
+        self._datos = bytearray(self.tamano)
+        self._inicio = 0
+        self._disponibles = 0
+        self._condicion = Condition()
+        self._hilo = None
+
+    def _iniciar_hilo(self):
+        with self._condicion:
+            if self._hilo is None:
+                self._hilo = Thread(target=self._rellenar, args=(self._condicion,), daemon=True)
+                self._hilo.start()
+
+    def _rellenar(self, condicion):
+        while True:
+            with condicion:
+                while condicion is self._condicion and self._disponibles > self.tamano - self.bloque:
+                    condicion.wait()
+                if condicion is not self._condicion:
+                    break
+                fin = (self._inicio + self._disponibles) % self.tamano
+
+            # La lectura se hace fuera del candado; el espacio libre solo crece
+            # mientras tanto, así que la región [fin, fin + bloque) sigue libre.
+            nuevos = os.urandom(self.bloque)
+
+            with condicion:
+                if condicion is not self._condicion:
+                    break
+                primera = min(self.bloque, self.tamano - fin)
+                self._datos[fin:fin + primera] = nuevos[:primera]
+                self._datos[:self.bloque - primera] = nuevos[primera:]
+                self._disponibles += self.bloque
+
+    def tomar(self, n):
+        if self._hilo is None:
+            self._iniciar_hilo()
+
+        with self._condicion:
+            if n <= self._disponibles:
+                inicio = self._inicio
+                primera = min(n, self.tamano - inicio)
+                datos = bytes(self._datos[inicio:inicio + primera]) + bytes(self._datos[:n - primera])
+                self._inicio = (inicio + n) % self.tamano
+                self._disponibles -= n
+                self._condicion.notify()
+                return datos
+
+        return os.urandom(n)
+
+buffer_entropia = BufferEntropia(ENTROPIA_BYTES, ENTROPIA_BLOQUE)
+
+### FUNCIÓN ###
+# Nombre: bytes_aleatorios
+# Descripción: Devuelve bytes aleatorios para la petición actual. Con seed salen
+#    del generador de la petición, para que sean reproducibles; sin ella, del
+#    buffer de entropía.
+# Parámetros:
+#   - n: Cantidad de bytes.
+# Respuesta: Objeto bytes de longitud n.
+###############
+def bytes_aleatorios(n):
+    marcar_generacion()
+    if g.get('semilla') is not None:
+        return obtener_rng().randbytes(n)
+    return buffer_entropia.tomar(n)
+
+### FUNCIÓN ###
+# Nombre: tipo_rechazo
+# Descripción: Elige el tipo entero más pequeño capaz de representar k valores
+#    y calcula el límite de aceptación del muestreo por rechazo.
+# Parámetros:
+#   - k: Cantidad de valores posibles (hasta 2**32).
+# Respuesta: Tupla (dtype, valores representables, límite de aceptación).
+###############
+def tipo_rechazo(k):
+    import numpy as np
+
+    if k <= 1 << 8:
+        tipo = np.dtype('u1')
+    elif k <= 1 << 16:
+        tipo = np.dtype('<u2')
+    else:
+        tipo = np.dtype('<u4')
+    espacio = 1 << (8 * tipo.itemsize)
+    return tipo, espacio, espacio - espacio % k
+
+### FUNCIÓN ###
+# Nombre: enteros_uniformes
+# Descripción: Convierte bytes aleatorios en enteros uniformes en [0, k) de
+#    forma vectorizada. Usa muestreo por rechazo: se descartan los valores
+#    mayores o iguales al mayor múltiplo de k que cabe en el tipo, así el
+#    módulo no introduce sesgo.
+# Parámetros:
+#   - n: Cantidad de enteros.
+#   - k: Cantidad de valores posibles (hasta 2**32).
+#   - leer: Función que devuelve n bytes aleatorios (por defecto bytes_aleatorios).
+# Respuesta: Arreglo de NumPy con n enteros.
+###############
+def enteros_uniformes(n, k, leer=None):
+    import numpy as np
+
+    leer = leer or bytes_aleatorios
+    tipo, espacio, limite = tipo_rechazo(k)
+
+    resultado = np.empty(n, dtype=np.int64)
+    llenos = 0
+    while llenos < n:
+        faltan = n - llenos
+        pedir = faltan * espacio // limite + 16
+        valores = np.frombuffer(leer(pedir * tipo.itemsize), dtype=tipo)
+        valores = valores[valores < limite][:faltan]
+        resultado[llenos:llenos + len(valores)] = valores % k
+        llenos += len(valores)
+    return resultado
+
+### FUNCIÓN ###
+# Nombre: colores_aleatorios
+# Descripción: Genera colores hexadecimales tomando 3 bytes por color.
+# Parámetros:
+#   - n: Cantidad de colores.
+# Respuesta: Lista de colores en formato #rrggbb.
+###############
+def colores_aleatorios(n):
+    texto = bytes_aleatorios(3 * n).hex()
+    return ['#' + texto[i:i + 6] for i in range(0, 6 * n, 6)]
+
+### FUNCIÓN ###
+# Nombre: dados_aleatorios
+# Descripción: Genera los resultados de n lanzamientos de varios dados.
+# Parámetros:
+#   - n: Cantidad de lanzamientos.
+#   - dados: Dados por lanzamiento.
+# Respuesta: Lista con una lista de resultados (1 a 6) por lanzamiento.
+###############
+def dados_aleatorios(n, dados):
+    return (enteros_uniformes(n * dados, 6) + 1).reshape(n, dados).tolist()
+
+### FUNCIÓN ###
+# Nombre: cartas_aleatorias
+# Descripción: Reparte cartas sin repetir de un zapato de varios mazos. Se
+#    eligen posiciones del zapato y cada posición se convierte al código de
+#    su carta dentro del mazo, sin construir el zapato.
+# Parámetros:
+#   - n: Cantidad de cartas.
+#   - mazos: Mazos del zapato.
+#   - comodines: Comodines por mazo (0 a MAX_COMODINES).
+# Respuesta: Arreglo de NumPy con el código de cada carta (índice de NOMBRES_CARTAS).
+###############
+def cartas_aleatorias(n, mazos, comodines):
+    tamano_mazo = len(BARAJA) + comodines
+    posiciones = obtener_rng_np().choice(mazos * tamano_mazo, n, replace=False)
+    return posiciones % tamano_mazo
+
+### FUNCIÓN ###
+# Nombre: zapato_barajado
+# Descripción: Baraja un zapato completo de varios mazos.
+# Parámetros:
+#   - mazos: Mazos del zapato.
+#   - comodines: Comodines por mazo.
+# Respuesta: bytearray con el código de cada carta (un byte por carta).
+###############
+def zapato_barajado(mazos, comodines):
+    tamano_mazo = len(BARAJA) + comodines
+    return bytearray((obtener_rng_np().permutation(mazos * tamano_mazo) % tamano_mazo).astype('u1'))
+
+### CLASE ###
+# Nombre: ZapatoSesion
+# Descripción: Estado de una sesión de baraja: las cartas del zapato ya
+#    barajadas, un byte por carta, y cuántas quedan por repartir. Se reparte
+#    desde el final, así robar n cartas es copiar n bytes.
+###############
+class ZapatoSesion:
+    __slots__ = ('cartas', 'restantes', 'mazos', 'comodines', 'expira')
+
+    def __init__(self, cartas, mazos, comodines, expira):
+        self.cartas = cartas
+        self.restantes = len(cartas)
+        self.mazos = mazos
+        self.comodines = comodines
+        self.expira = expira
+
+    def estado(self):
+        return {'restantes': self.restantes, 'total': len(self.cartas), 'mazos': self.mazos, 'comodines': self.comodines}
+
+### CLASE ###
+# Nombre: SesionesBaraja
+# Descripción: Sesiones de baraja en la memoria del proceso (un solo proceso,
+#    sin DIRECTORIO_SESIONES), de la menos a la más usada
+#    recientemente. Cada acceso renueva la caducidad y mueve la sesión al
+#    final, así las caducadas siempre están al principio y se eliminan sin
+#    recorrer las demás. La memoria se cuenta por sesión (cartas más
+#    BYTES_FIJOS) y no se crean sesiones que superarían el máximo.
+# Parámetros:
+#   - ttl: Segundos sin uso tras los que caduca una sesión.
+#   - max_bytes: Memoria máxima de todas las sesiones.
+###############
+class SesionesBaraja:
+    # Memoria aproximada de una sesión además de sus cartas (objetos e identificador)
+    BYTES_FIJOS = 400
+
+    def __init__(self, ttl, max_bytes):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sesiones = OrderedDict()
+        self.bytes = 0
+        self.candado = Lock()
+
+    def _purgar(self, ahora):
+        while self.sesiones:
+            sesion_id, sesion = next(iter(self.sesiones.items()))
+            if sesion.expira > ahora:
+                break
+            self._quitar(sesion_id)
+
+    def _quitar(self, sesion_id):
+        sesion = self.sesiones.pop(sesion_id)
+        self.bytes -= len(sesion.cartas) + self.BYTES_FIJOS
+
+    # Sesión vigente con la caducidad renovada, o None
+    def _usar(self, sesion_id):
+        ahora = monotonic()
+        self._purgar(ahora)
+        sesion = self.sesiones.get(sesion_id)
+        if sesion is not None:
+            sesion.expira = ahora + self.ttl
+            self.sesiones.move_to_end(sesion_id)
+        return sesion
+
+    # Devuelve el identificador de la sesión, o None si no hay memoria
+    def crear(self, cartas, mazos, comodines):
+        tamano = len(cartas) + self.BYTES_FIJOS
+        with self.candado:
+            ahora = monotonic()
+            self._purgar(ahora)
+            if self.bytes + tamano > self.max_bytes:
+                return None
+            sesion_id = secrets.token_urlsafe(12)
+            self.sesiones[sesion_id] = ZapatoSesion(cartas, mazos, comodines, ahora + self.ttl)
+            self.bytes += tamano
+            return sesion_id
+
+    def estado(self, sesion_id):
+        with self.candado:
+            sesion = self._usar(sesion_id)
+            return None if sesion is None else sesion.estado()
+
+    # Devuelve (códigos en bytes o None si no alcanzan, estado), o None si no existe
+    def robar(self, sesion_id, n):
+        with self.candado:
+            sesion = self._usar(sesion_id)
+            if sesion is None:
+                return None
+            if n > sesion.restantes:
+                return None, sesion.estado()
+            sesion.restantes -= n
+            return bytes(sesion.cartas[sesion.restantes:sesion.restantes + n]), sesion.estado()
+
+    def barajar(self, sesion_id):
+        with self.candado:
+            sesion = self._usar(sesion_id)
+            if sesion is None:
+                return None
+            sesion.cartas[:] = zapato_barajado(sesion.mazos, sesion.comodines)
+            sesion.restantes = len(sesion.cartas)
+            return sesion.estado()
+
+    def cerrar(self, sesion_id):
+        with self.candado:
+            if sesion_id not in self.sesiones:
+                return False
+            self._quitar(sesion_id)
+            return True
+
+### CLASE ###
+# Nombre: SesionesBarajaArchivos
+# Descripción: Sesiones de baraja compartidas entre los workers de gunicorn.
+#    Cada sesión es un archivo del directorio con una cabecera (cartas
+#    restantes, mazos y comodines) seguida de las cartas, un byte por carta;
+#    cada operación lo abre con bloqueo exclusivo (flock), así cualquier
+#    worker puede atender cualquier petición de la sesión. La fecha de
+#    modificación del archivo es el último uso: toda operación reescribe la
+#    cabecera, y las sesiones sin usar en ttl segundos se eliminan al crear
+#    otras. La memoria de todas las sesiones se recalcula recorriendo el
+#    directorio como mucho cada INTERVALO_BARRIDO segundos por worker, así
+#    que el máximo es aproximado con varios workers.
+# Parámetros:
+#   - directorio: Directorio compartido de los archivos de sesión.
+#   - ttl: Segundos sin uso tras los que caduca una sesión.
+#   - max_bytes: Memoria máxima de todas las sesiones.
+###############
+class SesionesBarajaArchivos:
+    BYTES_FIJOS = SesionesBaraja.BYTES_FIJOS
+    # Cartas restantes, mazos y comodines
+    CABECERA = struct.Struct('<IHB')
+    EXTENSION = '.baraja'
+    INTERVALO_BARRIDO = 1.0
+    # Caracteres de secrets.token_urlsafe; el identificador llega en la URL
+    CARACTERES_ID = frozenset(string.ascii_letters + string.digits + '-_')
+
+    def __init__(self, directorio, ttl, max_bytes):
+        self.directorio = directorio
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.ultimo_barrido = None
+        self.candado = Lock()
+
+    def _ruta(self, sesion_id):
+        if not sesion_id or not self.CARACTERES_ID.issuperset(sesion_id):
+            return None
+        return os.path.join(self.directorio, sesion_id + self.EXTENSION)
+
+    def _bloquear(self, archivo):
+        if fcntl is not None:
+            fcntl.flock(archivo.fileno(), fcntl.LOCK_EX)
+
+    # Elimina las sesiones caducadas y vuelve a contar la memoria de las demás
+    def _barrer(self, ahora):
+        self.ultimo_barrido = ahora
+        self.bytes = 0
+        try:
+            entradas = list(os.scandir(self.directorio))
+        except FileNotFoundError:
+            return
+
+        for entrada in entradas:
+            if not entrada.name.endswith(self.EXTENSION):
+                continue
+            try:
+                datos = entrada.stat()
+                if ahora - datos.st_mtime > self.ttl:
+                    # Se comprueba de nuevo con el bloqueo por si otro worker
+                    # la acaba de usar
+                    with open(entrada.path, 'r+b') as archivo:
+                        self._bloquear(archivo)
+                        datos = os.fstat(archivo.fileno())
+                        if ahora - datos.st_mtime > self.ttl:
+                            os.remove(entrada.path)
+                            continue
+            except OSError:
+                continue
+            self.bytes += datos.st_size + self.BYTES_FIJOS
+
+    # Abre la sesión vigente con bloqueo exclusivo, o devuelve None
+    def _abrir(self, sesion_id):
+        ruta = self._ruta(sesion_id)
+        if ruta is None:
+            return None
+        try:
+            archivo = open(ruta, 'r+b')
+        except FileNotFoundError:
+            return None
+
+        self._bloquear(archivo)
+        datos = os.fstat(archivo.fileno())
+        # Eliminada mientras se esperaba el bloqueo, o caducada
+        if datos.st_nlink == 0 or time() - datos.st_mtime > self.ttl:
+            archivo.close()
+            return None
+        return archivo
+
+    def _leer_cabecera(self, archivo):
+        archivo.seek(0)
+        return self.CABECERA.unpack(archivo.read(self.CABECERA.size))
+
+    # Escribir la cabecera también renueva la caducidad (fecha de modificación)
+    def _escribir_cabecera(self, archivo, restantes, mazos, comodines):
+        archivo.seek(0)
+        archivo.write(self.CABECERA.pack(restantes, mazos, comodines))
+
+    def _estado(self, restantes, mazos, comodines):
+        return {'restantes': restantes, 'total': mazos * (len(BARAJA) + comodines), 'mazos': mazos, 'comodines': comodines}
+
+    # Devuelve el identificador de la sesión, o None si no hay memoria
+    def crear(self, cartas, mazos, comodines):
+        tamano = self.CABECERA.size + len(cartas) + self.BYTES_FIJOS
+        with self.candado:
+            ahora = time()
+            if self.ultimo_barrido is None or ahora - self.ultimo_barrido >= self.INTERVALO_BARRIDO:
+                self._barrer(ahora)
+            if self.bytes + tamano > self.max_bytes:
+                return None
+
+            os.makedirs(self.directorio, exist_ok=True)
+            sesion_id = secrets.token_urlsafe(12)
+            with open(self._ruta(sesion_id), 'xb') as archivo:
+                archivo.write(self.CABECERA.pack(len(cartas), mazos, comodines))
+                archivo.write(cartas)
+            self.bytes += tamano
+            return sesion_id
+
+    def estado(self, sesion_id):
+        with self.candado:
+            archivo = self._abrir(sesion_id)
+            if archivo is None:
+                return None
+            with archivo:
+                cabecera = self._leer_cabecera(archivo)
+                self._escribir_cabecera(archivo, *cabecera)
+            return self._estado(*cabecera)
+
+    # Devuelve (códigos en bytes o None si no alcanzan, estado), o None si no existe
+    def robar(self, sesion_id, n):
+        with self.candado:
+            archivo = self._abrir(sesion_id)
+            if archivo is None:
+                return None
+            with archivo:
+                restantes, mazos, comodines = self._leer_cabecera(archivo)
+                if n > restantes:
+                    self._escribir_cabecera(archivo, restantes, mazos, comodines)
+                    return None, self._estado(restantes, mazos, comodines)
+                restantes -= n
+                archivo.seek(self.CABECERA.size + restantes)
+                codigos = archivo.read(n)
+                self._escribir_cabecera(archivo, restantes, mazos, comodines)
+            return codigos, self._estado(restantes, mazos, comodines)
+
+    def barajar(self, sesion_id):
+        with self.candado:
+            archivo = self._abrir(sesion_id)
+            if archivo is None:
+                return None
+            with archivo:
+                _, mazos, comodines = self._leer_cabecera(archivo)
+                cartas = zapato_barajado(mazos, comodines)
+                self._escribir_cabecera(archivo, len(cartas), mazos, comodines)
+                archivo.write(cartas)
+            return self._estado(len(cartas), mazos, comodines)
+
+    def cerrar(self, sesion_id):
+        ruta = self._ruta(sesion_id)
+        if ruta is None:
+            return False
+        try:
+            os.remove(ruta)
+        except FileNotFoundError:
+            return False
+        return True
+
+if DIRECTORIO_SESIONES is not None:
+    sesiones_baraja = SesionesBarajaArchivos(DIRECTORIO_SESIONES, SESION_TTL_SEGUNDOS, SESIONES_MAX_BYTES)
+else:
+    sesiones_baraja = SesionesBaraja(SESION_TTL_SEGUNDOS, SESIONES_MAX_BYTES)
+
+### FUNCIÓN ###
+# Nombre: limpiar_sesiones
+# Descripción: Borra los archivos de sesiones de baraja de ejecuciones
+#    anteriores. Como limpiar_metricas, lo usa gunicorn.conf.py al arrancar y
+#    al terminar el servidor y se registra con atexit para el proceso
+#    principal; el directorio solo se elimina si es el temporal por defecto.
+###############
+def limpiar_sesiones():
+    limpiar_directorio(DIRECTORIO_SESIONES, 'RMAPI_SESIONES_DIR', (SesionesBarajaArchivos.EXTENSION,))
+
+if DIRECTORIO_SESIONES is not None and not os.environ.get('RMAPI_SESIONES_DIR'):
+    atexit.register(limpiar_sesiones)
+
+### FUNCIÓN ###
+# Nombre: sesion_no_encontrada
+# Descripción: Respuesta de error de una sesión de baraja que no existe.
+# Respuesta: Respuesta de error 404.
+###############
+def sesion_no_encontrada():
+    return respuesta_error('La sesión no existe o ya caducó.', 1005, 404)
+
+### FUNCIÓN ###
+# Nombre: resumen_dados
+# Descripción: Cuenta los resultados de n lanzamientos de varios dados sin
+#    generar cada lanzamiento. Se muestrea una sola multinomial de n ensayos
+#    sobre los resultados posibles de combinaciones_dados y de ella salen tanto
+#    los conteos de cada cara como los de cada suma, así ambos describen los
+#    mismos lanzamientos y el costo no depende de n.
+# Parámetros:
+#   - n: Cantidad de lanzamientos.
+#   - dados: Dados por lanzamiento.
+#   - sumas: Si se incluye la distribución de la suma.
+# Respuesta: Diccionario con "caras" (conteos de 1 a 6) y, si se pidió,
+#    "sumas" (pares [suma, conteo]).
+###############
+def resumen_dados(n, dados, sumas):
+    import numpy as np
+
+    caras, probabilidades, totales = combinaciones_dados(dados)
+    conteos = obtener_rng_np().multinomial(n, probabilidades)
+    resumen = {'caras': (conteos @ caras).tolist()}
+
+    if sumas:
+        por_suma = np.zeros(5 * dados + 1, dtype=np.int64)
+        np.add.at(por_suma, totales - dados, conteos)
+        resumen['sumas'] = [[dados + i, conteo] for i, conteo in enumerate(por_suma.tolist())]
+
+    return resumen
+
+### FUNCIÓN ###
+# Nombre: letras_aleatorias
+# Descripción: Genera letras mayúsculas entre A y Z.
+# Parámetros:
+#   - n: Cantidad de letras.
+# Respuesta: Lista de letras.
+###############
+def letras_aleatorias(n):
+    return list((enteros_uniformes(n, 26) + 65).astype('u1').tobytes().decode('ascii'))
+
+### FUNCIÓN ###
+# Nombre: binarios_aleatorios
+# Descripción: Genera números binarios como texto a partir de los bits de
+#    bytes aleatorios.
+# Parámetros:
+#   - n: Cantidad de números.
+#   - longitud: Bits por número.
+# Respuesta: Lista de textos con '0' y '1'.
+###############
+def binarios_aleatorios(n, longitud):
+    texto = (bits_aleatorios(n, longitud) + 48).tobytes().decode('ascii')
+    return [texto[i:i + longitud] for i in range(0, n * longitud, longitud)]
+
+### FUNCIÓN ###
+# Nombre: bits_aleatorios
+# Descripción: Genera una matriz de bits aleatorios.
+# Parámetros:
+#   - n: Cantidad de números.
+#   - longitud: Bits por número.
+# Respuesta: Arreglo uint8 de n x longitud con valores 0 y 1.
+###############
+def bits_aleatorios(n, longitud):
+    import numpy as np
+
+    bits = np.unpackbits(np.frombuffer(bytes_aleatorios(-(-n * longitud // 8)), dtype=np.uint8))
+    return bits[:n * longitud].reshape(n, longitud)
+
+### CLASE ###
+# Nombre: ReservaBytes
+# Descripción: Bytes aleatorios leídos por adelantado en una sola lectura. Si la
+#    estimación se queda corta (por los valores rechazados), se completa con
+#    otra lectura de la misma fuente.
+# Parámetros:
+#   - leer: Función que devuelve n bytes aleatorios.
+#   - estimado: Bytes que se leen de inicio.
+###############
+class ReservaBytes:
+    def __init__(self, leer, estimado):
+        self._leer = leer
+        self._datos = leer(estimado)
+        self._posicion = 0
+
+    def leer(self, n):
+        if self._posicion + n > len(self._datos):
+            self._datos = self._datos[self._posicion:] + self._leer(max(n, 4096))
+            self._posicion = 0
+        datos = self._datos[self._posicion:self._posicion + n]
+        self._posicion += n
+        return datos
+
+### FUNCIÓN ###
+# Nombre: generar_contrasenas
+# Descripción: Motor de contraseñas. Toda la aleatoriedad de la petición sale de
+#    una sola lectura de la fuente (os.urandom, salvo con seed) y se convierte a
+#    índices del conjunto de caracteres con muestreo por rechazo, sin sesgo.
+#    Para cada clase requerida se elige una posición distinta al azar y se
+#    coloca un caracter de esa clase, así el requisito se cumple siempre sin
+#    tener que generar la contraseña de nuevo.
+# Parámetros:
+#   - n: Cantidad de contraseñas.
+#   - longitud: Longitud de cada contraseña.
+#   - clases_requeridas: Nombres de CLASES_CONTRASENA que deben aparecer al menos una vez.
+#   - leer: Función que devuelve n bytes aleatorios.
+# Respuesta: Lista de contraseñas.
+###############
+def generar_contrasenas(n, longitud, clases_requeridas, leer):
+    import numpy as np
+
+    marcar_generacion()
+    # Enteros que se van a pedir: (cantidad, valores posibles)
+    pedidos = [(n * longitud, len(CARACTERES_CONTRASENA))]
+    for j, clase in enumerate(clases_requeridas):
+        pedidos += [(n, longitud - j), (n, len(CLASES_CONTRASENA[clase]))]
+
+    estimado = 0
+    for cantidad, k in pedidos:
+        tipo, espacio, limite = tipo_rechazo(k)
+        estimado += (cantidad * espacio // limite * 11 // 10 + 16) * tipo.itemsize
+    reserva = ReservaBytes(leer, estimado)
+
+    tabla = np.frombuffer(CARACTERES_CONTRASENA.encode('ascii'), dtype=np.uint8)
+    matriz = tabla[enteros_uniformes(n * longitud, len(tabla), reserva.leer)].reshape(n, longitud)
+
+    filas = np.arange(n)
+    ocupadas = np.empty((0, n), dtype=np.int64)
+    for j, clase in enumerate(clases_requeridas):
+        # Posición uniforme entre las longitud - j libres: se recorre sobre las
+        # ya ocupadas (ordenadas) para no repetir ninguna
+        posiciones = enteros_uniformes(n, longitud - j, reserva.leer)
+        for ocupada in ocupadas:
+            posiciones += posiciones >= ocupada
+
+        caracteres_clase = np.frombuffer(CLASES_CONTRASENA[clase].encode('ascii'), dtype=np.uint8)
+        matriz[filas, posiciones] = caracteres_clase[enteros_uniformes(n, len(caracteres_clase), reserva.leer)]
+        ocupadas = np.sort(np.vstack([ocupadas, posiciones]), axis=0)
+
+    texto = matriz.tobytes().decode('ascii')
+    return [texto[i:i + longitud] for i in range(0, n * longitud, longitud)]
+
+### FUNCIÓN ###
+# Nombre: reiniciar_generadores
+# Descripción: Vuelve a sembrar desde el sistema operativo todos los generadores
+#    del proceso. Se llama en cada worker después del fork (ver gunicorn.conf.py)
+#    para que los workers no hereden el mismo estado y devuelvan secuencias
+#    repetidas.
+###############
+def reiniciar_generadores():
+    global _rng_hilo
+    random.seed()
+    # Faker se importa al primer uso; si ya está cargado se siembra su random
+    faker_generator = sys.modules.get('faker.generator')
+    if faker_generator is not None:
+        faker_generator.random.seed()
+    # NumPy también se importa al primer uso
+    numpy_random = sys.modules.get('numpy.random')
+    if numpy_random is not None:
+        numpy_random.seed()
+    _rng_hilo = local()
+    buffer_entropia.reiniciar()
+
+### FUNCIÓN ###
+# Nombre: obtener_faker
+# Descripción: Devuelve una instancia de Faker ya construida para el locale
+#    indicado. Las instancias se guardan en un pool compartido por todo el
+#    proceso, de modo que los proveedores del locale solo se cargan una vez.
+#    Se descartan los locales que no se han usado en FAKER_TTL_SEGUNDOS y, si
+#    el pool supera FAKER_MAX_LOCALES, el menos usado recientemente.
+#    Faker se importa aquí, en la primera llamada, porque solo lo usa
+#    NombreAleatorio y su importación es la más lenta del arranque.
+# Parámetros:
+#   - locale: Locale de Faker (por ejemplo es_MX o en_US).
+#    Como la instancia es compartida, se devuelve junto con un candado que debe
+#    tomarse mientras se le asigna el generador de la petición y se usa.
+# Respuesta: Tupla (instancia de Faker, candado).
+###############
+_faker_pool = OrderedDict()
+_faker_pool_lock = Lock()
+
+def obtener_faker(locale):
+    from faker import Faker
+
+    marcar_generacion()
+    ahora = monotonic()
+
+    with _faker_pool_lock:
+        # Descartar los locales que llevan tiempo sin usarse
+        while _faker_pool:
+            locale_antiguo, (_, _, ultimo_uso) = next(iter(_faker_pool.items()))
+            if ahora - ultimo_uso <= FAKER_TTL_SEGUNDOS:
+                break
+            del _faker_pool[locale_antiguo]
+
+        if locale in _faker_pool:
+            fake, candado, _ = _faker_pool.pop(locale)
+        else:
+            fake, candado = Faker(locale), Lock()
+
+        _faker_pool[locale] = (fake, candado, ahora)
+
+        while len(_faker_pool) > FAKER_MAX_LOCALES:
+            _faker_pool.popitem(last=False)
+
+    return fake, candado
+
+### FUNCIÓN ###
+# Nombre: nombres_faker
+# Descripción: Genera nombres con una instancia compartida de Faker usando el
+#    generador de la petición. El candado solo se toma mientras se genera cada
+#    nombre: si se cediera con él tomado, un cliente lento en streaming
+#    bloquearía a las demás peticiones del mismo locale.
+# Parámetros:
+#   - fake: Instancia de Faker.
+#   - candado: Candado de la instancia.
+#   - rng: Generador random.Random de la petición.
+#   - cantidad: Cantidad de nombres.
+# Respuesta: Generador con los nombres.
+###############
+def nombres_faker(fake, candado, rng, cantidad):
+    for _ in range(cantidad):
+        with candado:
+            fake.random = rng
+            nombre = fake.name()
+        yield nombre
+
+### CLASE ###
+# Nombre: TablaAlias
+# Descripción: Tabla alias de Vose de una lista de valores con pesos. Se
+#    construye en O(n) y después cada muestra cuesta O(1): se elige una columna
+#    al azar y, según su probabilidad, el valor de la columna o su alias.
+# Parámetros:
+#   - valores: Lista de valores.
+#   - pesos: Lista de pesos no negativos, al menos uno mayor a 0.
+###############
+class TablaAlias:
+    __slots__ = ('valores', 'pesos', 'probabilidad', 'alias', 'positivos')
+
+    def __init__(self, valores, pesos):
+        import numpy as np
+
+        # Se divide entre el mayor peso para que la suma no se desborde a inf
+        # con pesos cercanos a 1e308, lo que volvería uniforme la tabla
+        maximo = max(pesos)
+        relativos = [peso / maximo for peso in pesos]
+        n = len(pesos)
+        total = sum(relativos)
+        escalados = [peso * n / total for peso in relativos]
+        probabilidad = [1.0] * n
+        alias = list(range(n))
+        pequenos = [i for i, peso in enumerate(escalados) if peso < 1]
+        grandes = [i for i, peso in enumerate(escalados) if peso >= 1]
+
+        while pequenos and grandes:
+            pequeno = pequenos.pop()
+            grande = grandes.pop()
+            probabilidad[pequeno] = escalados[pequeno]
+            alias[pequeno] = grande
+            escalados[grande] += escalados[pequeno] - 1
+            (pequenos if escalados[grande] < 1 else grandes).append(grande)
+        # Las columnas que quedan (por redondeo) tienen probabilidad 1
+
+        self.valores = np.array(valores, dtype=object)
+        self.pesos = np.array(pesos, dtype=np.float64)
+        self.probabilidad = np.array(probabilidad)
+        self.alias = np.array(alias)
+        self.positivos = int(np.count_nonzero(self.pesos))
+
+    # k valores con reemplazo
+    def muestrear(self, rng_np, k):
+        import numpy as np
+
+        columnas = rng_np.integers(0, len(self.alias), size=k)
+        indices = np.where(rng_np.random(k) < self.probabilidad[columnas], columnas, self.alias[columnas])
+        return self.valores[indices].tolist()
+
+    # k valores sin reemplazo (Efraimidis-Spirakis): cada valor recibe la llave
+    # log(u) / peso y se toman las k mayores, en orden descendente
+    def muestrear_sin_repeticion(self, rng_np, k):
+        import numpy as np
+
+        with np.errstate(divide='ignore'):
+            llaves = np.log(rng_np.random(len(self.pesos))) / self.pesos
+        mayores = np.argpartition(llaves, -k)[-k:]
+        return self.valores[mayores[np.argsort(llaves[mayores])[::-1]]].tolist()
+
+### FUNCIÓN ###
+# Nombre: obtener_tabla_alias
+# Descripción: Devuelve la tabla alias de una lista de valores con pesos. Las
+#    tablas se guardan en un LRU de MAX_TABLAS_ALIAS entradas con llave el hash
+#    de los textos recibidos, así las listas que se piden seguido solo se
+#    validan y construyen una vez.
+# Parámetros:
+#   - valores_str: Valores separados por comas.
+#   - pesos_str: Pesos separados por comas.
+# Respuesta: Tupla (TablaAlias, None) o (None, mensaje de error).
+###############
+_tablas_alias = OrderedDict()
+_tablas_alias_lock = Lock()
+
+def obtener_tabla_alias(valores_str, pesos_str):
+    llave = hashlib.blake2b(f'{valores_str}\0{pesos_str}'.encode('utf-8'), digest_size=16).digest()
+
+    with _tablas_alias_lock:
+        tabla = _tablas_alias.get(llave)
+        if tabla is not None:
+            _tablas_alias.move_to_end(llave)
+            return tabla, None
+
+    valores = valores_str.split(',')
+    pesos = pesos_str.split(',')
+
+    if len(pesos) != len(valores):
+        return None, 'La cantidad de pesos debe ser igual a la cantidad de valores.'
+    try:
+        pesos = [float(peso) for peso in pesos]
+    except ValueError:
+        pesos = [-1.0]
+    if not all(0 <= peso < float('inf') for peso in pesos):
+        return None, 'Los pesos deben ser números mayores o iguales a 0.'
+    if not any(pesos):
+        return None, 'Al menos un peso debe ser mayor a 0.'
+
+    tabla = TablaAlias(valores, pesos)
+
+    with _tablas_alias_lock:
+        _tablas_alias[llave] = tabla
+        while len(_tablas_alias) > MAX_TABLAS_ALIAS:
+            _tablas_alias.popitem(last=False)
+
+    return tabla, None
+
+### FUNCIÓN ###
+# Nombre: leer_bloques_lineas
+# Descripción: Lee un flujo de bytes en bloques de BLOQUE_LECTURA y devuelve
+#    las líneas de cada bloque decodificadas como UTF-8, sin guardar el cuerpo
+#    completo. La línea que queda cortada al final de un bloque pasa al
+#    siguiente. Acepta finales de línea \n y \r\n y omite las líneas vacías.
+# Parámetros:
+#   - flujo: Objeto con read(n), por ejemplo request.stream.
+# Respuesta: Generador con una lista de líneas por bloque.
+###############
+def leer_bloques_lineas(flujo):
+    decodificador = codecs.getincrementaldecoder('utf-8')()
+    pendiente = ''
+
+    while True:
+        bloque = flujo.read(BLOQUE_LECTURA)
+        texto = pendiente + decodificador.decode(bloque, final=not bloque)
+        lineas = texto.split('\n')
+        pendiente = lineas.pop() if bloque else ''
+        if '\r' in texto:
+            lineas = [linea.rstrip('\r') for linea in lineas]
+        lineas = list(filter(None, lineas))
+        if lineas:
+            yield lineas
+        if not bloque:
+            break
+
+### FUNCIÓN ###
+# Nombre: leer_arreglo_json
+# Descripción: Lee un arreglo JSON de un flujo de bytes en bloques de
+#    BLOQUE_LECTURA y devuelve sus elementos uno por uno con raw_decode, así
+#    solo se guarda en memoria el bloque que se está leyendo.
+# Parámetros:
+#   - flujo: Objeto con read(n), por ejemplo request.stream.
+# Respuesta: Generador con los elementos. Lanza ValueError si el cuerpo no es un arreglo JSON.
+###############
+def leer_arreglo_json(flujo):
+    decodificador = codecs.getincrementaldecoder('utf-8')()
+    decodificar = json.JSONDecoder().raw_decode
+    texto = ''
+    posicion = 0
+    fin = False
+    # Lo que se espera a continuación: '[', el primer elemento (o ']'), ',' (o ']') o un elemento
+    esperado = 'inicio'
+
+    while True:
+        while posicion < len(texto) and texto[posicion] in ' \t\r\n':
+            posicion += 1
+        leer = posicion == len(texto)
+
+        if not leer:
+            caracter = texto[posicion]
+            if esperado == 'inicio':
+                if caracter != '[':
+                    raise ValueError('El cuerpo debe ser un arreglo JSON.')
+                posicion += 1
+                esperado = 'primero'
+            elif caracter == ']' and esperado in ('primero', 'separador'):
+                # Después del arreglo solo puede haber espacios
+                resto = texto[posicion + 1:]
+                while True:
+                    if resto.strip(' \t\r\n'):
+                        raise ValueError('Hay datos después del arreglo JSON.')
+                    if fin:
+                        return
+                    bloque = flujo.read(BLOQUE_LECTURA)
+                    fin = not bloque
+                    resto = decodificador.decode(bloque, final=fin)
+            elif esperado == 'separador':
+                if caracter != ',':
+                    raise ValueError('Los elementos deben ir separados por comas.')
+                posicion += 1
+                esperado = 'elemento'
+            else:
+                try:
+                    valor, final = decodificar(texto, posicion)
+                except json.JSONDecodeError as error:
+                    # Solo se lee más si el bloque pudo cortar el elemento: una
+                    # cadena sin cerrar, o un literal o escape \uXXXX incompleto
+                    # en los últimos 5 caracteres. Cualquier otro error es de
+                    # sintaxis y se rechaza sin acumular el resto del cuerpo.
+                    incompleto = error.msg.startswith('Unterminated string') or len(texto) - error.pos <= 5
+                    if fin or not incompleto:
+                        raise
+                    final = len(texto)
+                # Al final del bloque un número o un literal puede estar incompleto
+                # ("-3." se decodifica como -3), así que se espera a tener más texto
+                leer = not fin and (final == len(texto) or texto[final] in '.eE+-0123456789')
+                if not leer:
+                    yield valor
+                    posicion = final
+                    esperado = 'separador'
+
+        if leer:
+            if fin:
+                raise ValueError('El arreglo JSON está incompleto.')
+            bloque = flujo.read(BLOQUE_LECTURA)
+            fin = not bloque
+            texto = texto[posicion:] + decodificador.decode(bloque, final=fin)
+            posicion = 0
+
+### FUNCIÓN ###
+# Nombre: bloques_cuerpo
+# Descripción: Devuelve los valores del cuerpo de la petición en bloques según
+#    su Content-Type, leyéndolos de forma incremental:
+#      - application/json: un arreglo JSON.
+#      - application/x-ndjson: un valor JSON por línea.
+#      - cualquier otro (text/plain): un valor de texto por línea.
+# Respuesta: Generador con listas de valores. Lanza ValueError si el cuerpo no es válido.
+###############
+def bloques_cuerpo():
+    if request.mimetype == 'application/json':
+        elementos = leer_arreglo_json(request.stream)
+        return iter(lambda: list(islice(elementos, FILAS_POR_BLOQUE_STREAM)), [])
+    bloques = leer_bloques_lineas(request.stream)
+    if request.mimetype == 'application/x-ndjson':
+        return ([json.loads(linea) for linea in lineas] for lineas in bloques)
+    return bloques
+
+### FUNCIÓN ###
+# Nombre: uniforme_abierto
+# Descripción: Número aleatorio uniforme en (0, 1), para poder sacar su logaritmo.
+# Parámetros:
+#   - rng: Generador random.Random de la petición.
+# Respuesta: Número decimal.
+###############
+def uniforme_abierto(rng):
+    u = rng.random()
+    while u == 0.0:
+        u = rng.random()
+    return u
+
+### FUNCIÓN ###
+# Nombre: salto_reservorio
+# Descripción: Cantidad de elementos que se saltan en el algoritmo L antes del
+#    siguiente reemplazo (distribución geométrica de parámetro w).
+# Parámetros:
+#   - rng: Generador random.Random de la petición.
+#   - w: Umbral actual del reservorio, en (0, 1].
+# Respuesta: Número entero.
+###############
+def salto_reservorio(rng, w):
+    if w >= 1.0:
+        return 0
+    return math.floor(math.log(uniforme_abierto(rng)) / math.log1p(-w))
+
+### FUNCIÓN ###
+# Nombre: muestra_reservorio
+# Descripción: Muestreo de reservorio con el algoritmo L: toma k elementos
+#    distintos de bloques de tamaño total desconocido en una sola pasada,
+#    guardando solo los k elementos del reservorio. En lugar de sortear cada
+#    elemento se sortea cuántos saltar hasta el siguiente reemplazo, así los
+#    elementos saltados solo se cuentan y el costo aleatorio es O(k log(n/k)).
+# Parámetros:
+#   - bloques: Iterable con listas de elementos.
+#   - k: Tamaño de la muestra.
+#   - rng: Generador random.Random de la petición.
+# Respuesta: Tupla (lista con la muestra en orden aleatorio, total de elementos leídos).
+###############
+def muestra_reservorio(bloques, k, rng):
+    reservorio = []
+    total = 0
+    # Índice global del siguiente elemento que entra al reservorio
+    siguiente = k
+    w = 1.0
+
+    for bloque in bloques:
+        inicio = total
+        total += len(bloque)
+
+        if len(reservorio) < k:
+            reservorio.extend(bloque[:k - len(reservorio)])
+            if len(reservorio) < k:
+                continue
+            w = math.exp(math.log(uniforme_abierto(rng)) / k)
+            siguiente += salto_reservorio(rng, w)
+
+        while siguiente < total:
+            reservorio[rng.randrange(k)] = bloque[siguiente - inicio]
+            w *= math.exp(math.log(uniforme_abierto(rng)) / k)
+            siguiente += salto_reservorio(rng, w) + 1
+
+    rng.shuffle(reservorio)
+    return reservorio, total
+
+### FUNCIÓN ###
+# Nombre: bloques_ponderados
+# Descripción: Separa las líneas "peso<TAB>valor" de cada bloque en un arreglo
+#    de pesos y la lista de valores.
+# Parámetros:
+#   - bloques: Iterable con listas de líneas.
+# Respuesta: Generador con tuplas (pesos, valores). Lanza ValueError si una
+#    línea no tiene tabulador o su peso no es un número mayor o igual a 0.
+###############
+def bloques_ponderados(bloques):
+    import numpy as np
+
+    for lineas in bloques:
+        partes = [linea.partition('\t') for linea in lineas]
+        if not all(separador for _, separador, _ in partes):
+            raise ValueError('Falta el tabulador entre el peso y el valor.')
+        pesos = np.array([peso for peso, _, _ in partes]).astype(np.float64)
+        if not np.all((pesos >= 0) & (pesos < np.inf)):
+            raise ValueError('Los pesos deben ser números mayores o iguales a 0.')
+        yield pesos, [valor for _, _, valor in partes]
+
+### FUNCIÓN ###
+# Nombre: muestra_reservorio_ponderada
+# Descripción: Muestreo de reservorio ponderado sin reemplazo (algoritmo
+#    A-ExpJ de Efraimidis y Spirakis). Cada elemento recibe la llave
+#    log(u) / peso y el reservorio guarda las k mayores en un montículo; en
+#    lugar de sortear cada elemento se sortea cuánto peso saltar hasta el
+#    siguiente reemplazo y se busca en la suma acumulada de los pesos del bloque.
+# Parámetros:
+#   - bloques: Iterable con tuplas (pesos, valores).
+#   - k: Tamaño de la muestra.
+#   - rng: Generador random.Random de la petición.
+# Respuesta: Tupla (lista con la muestra de mayor a menor llave, total de
+#    elementos leídos, elementos con peso mayor a 0).
+###############
+def muestra_reservorio_ponderada(bloques, k, rng):
+    import numpy as np
+
+    # Montículo de (llave, índice, valor); el índice evita comparar valores
+    monticulo = []
+    total = 0
+    positivos = 0
+    # Peso que falta saltar hasta el siguiente reemplazo
+    restante = None
+
+    for pesos, valores in bloques:
+        inicio = total
+        total += len(valores)
+        positivos += int(np.count_nonzero(pesos))
+        i = 0
+
+        while len(monticulo) < k and i < len(valores):
+            if pesos[i] > 0:
+                heapq.heappush(monticulo, (math.log(uniforme_abierto(rng)) / pesos[i], inicio + i, valores[i]))
+            i += 1
+        if len(monticulo) < k:
+            continue
+
+        acumulados = np.cumsum(pesos[i:])
+        base = 0.0
+        while True:
+            if restante is None:
+                restante = math.log(uniforme_abierto(rng)) / monticulo[0][0]
+            j = int(np.searchsorted(acumulados, base + restante, side='right'))
+            if j == len(acumulados):
+                if len(acumulados):
+                    restante -= acumulados[-1] - base
+                break
+
+            # El nuevo elemento entra con una llave mayor al mínimo del reservorio
+            peso = pesos[i + j]
+            minimo = math.exp(peso * monticulo[0][0])
+            llave = math.log(minimo + (1 - minimo) * (1.0 - rng.random())) / peso
+            heapq.heapreplace(monticulo, (llave, inicio + i + j, valores[i + j]))
+            base = acumulados[j]
+            restante = None
+
+    monticulo.sort(reverse=True)
+    return [valor for _, _, valor in monticulo], total, positivos
+
+### FUNCIÓN ###
+# Nombre: leer_bloques_bytes
+# Descripción: Lee un flujo de bytes por bloques y devuelve sus líneas como
+#    bytes, sin decodificar y tal como llegan: a diferencia de
+#    leer_bloques_lineas se conservan las líneas vacías y el \r final, así la
+#    mezcla es una permutación exacta de la entrada. Un \n al final del flujo
+#    cierra la última línea y no agrega una vacía.
+# Parámetros:
+#   - flujo: Objeto con read(n), por ejemplo request.stream o un archivo.
+#   - tamano: Bytes por lectura (por defecto BLOQUE_LECTURA).
+# Respuesta: Generador con una lista de líneas por bloque.
+###############
+def leer_bloques_bytes(flujo, tamano=BLOQUE_LECTURA):
+    pendiente = b''
+
+    while True:
+        bloque = flujo.read(tamano)
+        if not bloque:
+            if pendiente:
+                yield [pendiente]
+            break
+        lineas = (pendiente + bloque).split(b'\n')
+        pendiente = lineas.pop()
+        if lineas:
+            yield lineas
+
+### CLASE ###
+# Nombre: MezclaExterna
+# Descripción: Mezcla aleatoria de líneas que no caben en memoria. Mientras las
+#    líneas caben en MEZCLA_MEMORIA se guardan en una lista; después cada línea
+#    se manda a una de MEZCLA_CUBETAS cubetas al azar, que son archivos
+#    temporales. Al generar la salida cada cubeta se carga y se mezcla en
+#    memoria (o, si no cabe, se vuelve a repartir en cubetas) y se escribe a
+#    continuación de la anterior. Repartir al azar y mezclar cada cubeta da una
+#    permutación uniforme de todas las líneas.
+# Parámetros:
+#   - rng_np: Generador de NumPy de la petición.
+###############
+class MezclaExterna:
+    # Memoria aproximada de una línea en la lista, además de sus bytes
+    BYTES_POR_LINEA = 48
+
+    def __init__(self, rng_np):
+        self.rng_np = rng_np
+        self.lineas = []
+        self.memoria = 0
+        self.total = 0
+        self.bytes = 0
+        self.directorio = None
+        # Cubetas de la primera partición: listas [ruta, archivo, líneas]
+        self.cubetas = None
+
+    def _crear_cubetas(self):
+        if self.directorio is None:
+            self.directorio = tempfile.mkdtemp(prefix='rmapi_mezcla_', dir=MEZCLA_DIRECTORIO)
+        cubetas = []
+        for _ in range(MEZCLA_CUBETAS):
+            descriptor, ruta = tempfile.mkstemp(dir=self.directorio)
+            cubetas.append([ruta, os.fdopen(descriptor, 'wb', buffering=1 << 16), 0])
+        return cubetas
+
+    def _repartir(self, lineas, cubetas):
+        import numpy as np
+
+        destinos = self.rng_np.integers(0, len(cubetas), size=len(lineas))
+        orden = np.argsort(destinos, kind='stable').tolist()
+        conteos = np.bincount(destinos, minlength=len(cubetas)).tolist()
+        inicio = 0
+        for cubeta, conteo in zip(cubetas, conteos):
+            if conteo:
+                cubeta[1].write(b'\n'.join([lineas[i] for i in orden[inicio:inicio + conteo]]) + b'\n')
+                cubeta[2] += conteo
+                inicio += conteo
+
+    # Agrega un bloque de líneas; pasa a disco cuando se supera MEZCLA_MEMORIA
+    def agregar(self, lineas):
+        self.total += len(lineas)
+        tamano = sum(map(len, lineas))
+        self.bytes += tamano
+
+        if self.cubetas is None:
+            self.lineas.extend(lineas)
+            self.memoria += tamano + self.BYTES_POR_LINEA * len(lineas)
+            if self.memoria <= MEZCLA_MEMORIA:
+                return
+            self.cubetas = self._crear_cubetas()
+            lineas, self.lineas = self.lineas, []
+
+        self._repartir(lineas, self.cubetas)
+
+    def _mezclar_memoria(self, lineas):
+        orden = self.rng_np.permutation(len(lineas)).tolist()
+        for inicio in range(0, len(orden), FILAS_POR_BLOQUE_STREAM):
+            yield b'\n'.join([lineas[i] for i in orden[inicio:inicio + FILAS_POR_BLOQUE_STREAM]]) + b'\n'
+
+    def _vaciar(self, ruta, conteo):
+        tamano = os.path.getsize(ruta)
+
+        # Una sola línea no se puede repartir aunque no quepa en memoria
+        if tamano + self.BYTES_POR_LINEA * conteo <= MEZCLA_MEMORIA or conteo <= 1:
+            with open(ruta, 'rb') as archivo:
+                lineas = archivo.read().split(b'\n')
+            os.remove(ruta)
+            lineas.pop()
+            yield from self._mezclar_memoria(lineas)
+            return
+
+        cubetas = self._crear_cubetas()
+        with open(ruta, 'rb') as archivo:
+            for lineas in leer_bloques_bytes(archivo, MEZCLA_BLOQUE):
+                self._repartir(lineas, cubetas)
+        os.remove(ruta)
+        for cubeta in cubetas:
+            cubeta[1].close()
+        for ruta_cubeta, _, conteo_cubeta in cubetas:
+            yield from self._vaciar(ruta_cubeta, conteo_cubeta)
+
+    # Generador con las líneas mezcladas en bloques de bytes; borra los
+    # archivos temporales al terminar
+    def generar(self):
+        try:
+            if self.cubetas is None:
+                yield from self._mezclar_memoria(self.lineas)
+                return
+            for cubeta in self.cubetas:
+                cubeta[1].close()
+            for ruta, _, conteo in self.cubetas:
+                yield from self._vaciar(ruta, conteo)
+        finally:
+            self.limpiar()
+
+    def limpiar(self):
+        self.lineas = []
+        if self.cubetas is not None:
+            for cubeta in self.cubetas:
+                cubeta[1].close()
+        if self.directorio is not None:
+            shutil.rmtree(self.directorio, ignore_errors=True)
+            self.directorio = None
+
+### FUNCIÓN ###
+# Nombre: respuesta_masiva
+# Descripción: Construye la respuesta JSON del modo masivo en una sola pasada,
+#    uniendo los valores ya convertidos a texto sin pasar cada uno por jsonify.
+# Parámetros:
+#   - campo: Nombre del campo que contiene la lista de valores.
+#   - valores_json: Elementos del arreglo JSON ya serializados y separados por comas.
+#   - cantidad: Cantidad de valores generados.
+# Respuesta: Respuesta JSON con la misma forma que la del modo normal.
+###############
+def respuesta_masiva(campo, valores_json, cantidad):
+    return respuesta_json({'cantidad': cantidad}, {campo: f'[{valores_json}]'.encode('ascii')})
+
+# Campos fijos de las respuestas exitosas, ya codificados
+ENVOLTURA_EXITO = (('error', b'"error":false'), ('status', b'"status":200'))
+
+### FUNCIÓN ###
+# Nombre: respuesta_json
+# Descripción: Respuesta JSON exitosa. Los campos "status" y "error" se toman ya
+#    codificados de ENVOLTURA_EXITO y cada campo de datos se codifica una sola
+#    vez con el proveedor JSON de la aplicación; el resultado es el mismo que
+#    jsonify (claves ordenadas) con status 200 y error false.
+# Parámetros:
+#   - datos: Diccionario con los campos de la respuesta (sin status ni error).
+#   - codificados: Diccionario opcional de campos cuyo valor ya es JSON en bytes.
+# Respuesta: Respuesta de Flask con status 200.
+###############
+def respuesta_json(datos, codificados=None):
+    g.inicio_serializacion = perf_counter()
+    g.elementos = next((datos[campo] for campo in CAMPOS_CANTIDAD if campo in datos), None)
+    codificar = app.json.codificar
+    partes = [(clave, b'"' + clave.encode('utf-8') + b'":' + codificar(valor)) for clave, valor in datos.items()]
+    if codificados:
+        partes.extend((clave, b'"' + clave.encode('utf-8') + b'":' + valor) for clave, valor in codificados.items())
+    partes.extend(ENVOLTURA_EXITO)
+    partes.sort(key=lambda parte: parte[0])
+    cuerpo = b'{' + b','.join(parte for _, parte in partes) + b'}'
+    g.fin_serializacion = perf_counter()
+    return app.response_class(cuerpo, status=200, mimetype=app.json.mimetype)
+
+### FUNCIÓN ###
+# Nombre: negociar_formato
+# Descripción: Obtiene el formato de respuesta a partir de la cabecera Accept
+#    cuando no viene el argumento formato. JSON tiene preferencia cuando el
+#    cliente acepta cualquier tipo.
+# Respuesta: Nombre del formato ('json', 'octet', 'msgpack' o 'cbor').
+###############
+def negociar_formato():
+    tipos = {tipo: nombre for nombre, tipo in FORMATOS_RESPUESTA.items()}
+    tipos['application/x-msgpack'] = 'msgpack'
+    mejor = request.accept_mimetypes.best_match(list(tipos))
+    return tipos.get(mejor, 'json')
+
+### FUNCIÓN ###
+# Nombre: validar_formato
+# Descripción: Comprueba que la librería del formato de respuesta esté
+#    instalada en el servidor.
+# Parámetros:
+#   - formato: Formato ya validado por el esquema del endpoint.
+# Respuesta: Respuesta de error 406 si el formato no está disponible, None en otro caso.
+###############
+def validar_formato(formato):
+    if (formato == 'msgpack' and msgpack is None) or (formato == 'cbor' and cbor2 is None):
+        return respuesta_error(f'El formato {formato} no está disponible en este servidor.', 1004, 406)
+
+    return None
+
+### FUNCIÓN ###
+# Nombre: respuesta_error
+# Descripción: Respuesta JSON de error con la forma común de la API.
+# Parámetros:
+#   - mensaje: Texto del error.
+#   - codigo: Código de error de la API.
+#   - status: Status HTTP (por defecto 400).
+# Respuesta: Tupla (respuesta, status), como las de jsonify en los endpoints.
+###############
+def respuesta_error(mensaje, codigo, status=400):
+    return jsonify({
+        'status': status,
+        'error': True,
+        'message': mensaje,
+        'code': codigo
+    }), status
+
+# Tipos de parámetro: (conversión, tipo OpenAPI, si un valor que no se puede
+# convertir es un error). Los enteros y decimales inválidos toman el valor por
+# defecto, igual que request.args.get(..., type=int).
+TIPOS_PARAMETRO = MappingProxyType({
+    'entero': (int, 'integer', False),
+    'decimal': (float, 'number', False),
+    'texto': (str, 'string', False),
+    'opcion': (str.lower, 'string', False),
+    'fecha': (lambda valor: datetime.strptime(valor, '%d/%m/%Y'), 'string', True),
+    'hora': (lambda valor: datetime.strptime(valor, '%H:%M:%S').time(), 'string', True),
+})
+
+### CLASE ###
+# Nombre: Parametro
+# Descripción: Declaración de un argumento de query de un endpoint. La misma
+#    declaración se compila en la función que lo valida y genera su
+#    documentación OpenAPI.
+# Parámetros:
+#   - nombre: Nombre del argumento.
+#   - tipo: Clave de TIPOS_PARAMETRO (por defecto 'entero').
+#   - defecto: Valor si no viene el argumento. Los textos se convierten con el
+#       tipo; una función se llama en cada petición.
+#   - minimo, maximo: Límites inclusivos. maximo puede ser una función que
+#       recibe los valores ya validados y devuelve el límite.
+#   - opciones: Valores permitidos además del valor por defecto.
+#   - requerido: Si el argumento debe venir y no estar vacío.
+#   - etiqueta: Sujeto de los mensajes de error de los límites.
+#   - codigo_minimo, codigo_maximo: Códigos de error de los límites.
+#   - codigo: Código de error del tipo, las opciones y requerido.
+#   - mensaje: Mensaje que sustituye a todos los mensajes de error.
+#   - mensaje_minimo, mensaje_maximo: Mensajes propios de cada límite, para
+#       conservar los textos anteriores de cada endpoint. mensaje_maximo puede
+#       incluir {limite}.
+#   - descripcion: Descripción para la documentación.
+###############
+class Parametro:
+    def __init__(self, nombre, tipo='entero', defecto=None, minimo=None, maximo=None, opciones=None,
+                 requerido=False, etiqueta='La cantidad', codigo_minimo=1001, codigo_maximo=1000,
+                 codigo=1002, mensaje=None, mensaje_minimo=None, mensaje_maximo=None, descripcion=None):
+        self.nombre = nombre
+        self.tipo = tipo
+        self.defecto = defecto
+        self.minimo = minimo
+        self.maximo = maximo
+        self.opciones = opciones
+        self.requerido = requerido
+        self.etiqueta = etiqueta
+        self.codigo_minimo = codigo_minimo
+        self.codigo_maximo = codigo_maximo
+        self.codigo = codigo
+        self.mensaje = mensaje
+        self.mensaje_minimo = (mensaje_minimo or f'{etiqueta} debe ser mayor a {minimo - 1}.') if minimo is not None else None
+        self.mensaje_maximo = mensaje_maximo or f'{etiqueta} debe ser menor a {{limite}}.'
+        self.descripcion = descripcion
+
+    def error(self, codigo, mensaje):
+        return respuesta_error(self.mensaje or mensaje, codigo)
+
+    # Devuelve la función que valida el argumento en cada petición. Todo lo que
+    # no depende de la petición se resuelve aquí, una sola vez.
+    def compilar(self):
+        nombre = self.nombre
+        convertir, _, estricto = TIPOS_PARAMETRO[self.tipo]
+        defecto = self.defecto
+        por_peticion = callable(defecto)
+        if isinstance(defecto, str):
+            defecto = convertir(defecto)
+        requerido = self.requerido
+        opciones = frozenset(self.opciones) if self.opciones is not None else None
+        minimo = self.minimo
+        maximo = self.maximo
+        maximo_variable = callable(maximo)
+
+        def validar(args, valores):
+            crudo = args.get(nombre)
+            valor = None
+            if crudo is not None:
+                try:
+                    valor = convertir(crudo)
+                except ValueError:
+                    if estricto:
+                        return self.error(self.codigo, f'Valor no válido para {nombre}.')
+                    crudo = None
+            if crudo is None:
+                valor = defecto() if por_peticion else defecto
+
+            if requerido and not valor:
+                return self.error(self.codigo, f'Falta el parámetro {nombre}.')
+            if opciones is not None and valor not in opciones and valor != defecto:
+                return self.error(self.codigo, f'Valor no válido para {nombre}.')
+            if minimo is not None and valor < minimo:
+                return self.error(self.codigo_minimo, self.mensaje_minimo)
+            limite = maximo(valores) if maximo_variable else maximo
+            if limite is not None and valor > limite:
+                return self.error(self.codigo_maximo, self.mensaje_maximo.format(limite=limite))
+
+            valores[nombre] = valor
+            return None
+
+        return validar
+
+    # Líneas YAML del parámetro para la sección parameters de flasgger
+    def documentar(self):
+        lineas = [
+            f'  - name: {self.nombre}',
+            '    in: query',
+            f'    type: {TIPOS_PARAMETRO[self.tipo][1]}',
+            f"    required: {'true' if self.requerido else 'false'}",
+        ]
+        if self.defecto not in (None, '') and not callable(self.defecto):
+            lineas.append(f'    default: {json.dumps(self.defecto, ensure_ascii=False)}')
+        if self.opciones is not None:
+            lineas.append(f'    enum: {json.dumps(list(self.opciones), ensure_ascii=False)}')
+        if self.minimo is not None:
+            lineas.append(f'    minimum: {self.minimo}')
+        if self.maximo is not None and not callable(self.maximo):
+            lineas.append(f'    maximum: {self.maximo}')
+        if self.descripcion:
+            lineas.append(f'    description: {json.dumps(self.descripcion, ensure_ascii=False)}')
+        return lineas
+
+### CLASE ###
+# Nombre: Esquema
+# Descripción: Parámetros de un endpoint compilados en una tupla de funciones de
+#    validación, más las reglas entre varios parámetros. Los parámetros cuyo
+#    máximo depende de otros (la cantidad según stream o masivo) se validan al
+#    final para que esos otros ya estén convertidos.
+# Parámetros:
+#   - parametros: Tupla de Parametro, en el orden de la documentación.
+#   - reglas: Tuplas (condición, código, mensaje). La condición recibe los
+#       valores validados y devuelve True si la petición no es válida.
+###############
+class Esquema:
+    def __init__(self, parametros, reglas=()):
+        self.parametros = parametros
+        self.reglas = reglas
+        ordenados = sorted(parametros, key=lambda parametro: callable(parametro.maximo))
+        self.pasos = tuple(parametro.compilar() for parametro in ordenados)
+
+    # Devuelve (valores, None) o (None, respuesta de error)
+    def validar(self, args):
+        valores = {}
+        for paso in self.pasos:
+            error = paso(args, valores)
+            if error is not None:
+                return None, error
+        for condicion, codigo, mensaje in self.reglas:
+            if condicion(valores):
+                return None, respuesta_error(mensaje, codigo)
+        return valores, None
+
+    # Agrega los parámetros al docstring de la vista: al inicio de su sección
+    # parameters si ya tiene una (parámetros de ruta) o antes de responses.
+    # seed se documenta en todos los endpoints porque la lee preparar_semilla.
+    def documentar(self, docstring):
+        parametros = self.parametros
+        if not any(parametro.nombre == 'seed' for parametro in parametros):
+            parametros += (PARAMETRO_SEED,)
+        lineas = '\n'.join('    ' + linea for parametro in parametros for linea in parametro.documentar())
+        if '\n    parameters:\n' in docstring:
+            return docstring.replace('\n    parameters:\n', '\n    parameters:\n' + lineas + '\n', 1)
+        return docstring.replace('\n    responses:', '\n    parameters:\n' + lineas + '\n    responses:', 1)
+
+### FUNCIÓN ###
+# Nombre: con_parametros
+# Descripción: Decorador de los endpoints GET. Al importar el módulo compila sus
+#    parámetros en un Esquema y agrega la documentación al docstring; en cada
+#    petición valida los argumentos con una sola llamada y pasa a la vista el
+#    diccionario parametros con los valores ya convertidos. Si algo no es
+#    válido responde el error sin ejecutar la vista. Si el endpoint elige el
+#    formato por la cabecera Accept lo marca en g para agregar_vary_accept.
+# Parámetros:
+#   - parametros: Parametro del endpoint.
+#   - reglas: Reglas entre parámetros (ver Esquema).
+# Respuesta: Decorador de la vista.
+###############
+def con_parametros(*parametros, reglas=()):
+    esquema = Esquema(parametros, reglas)
+    negocia_formato = any(parametro.defecto is negociar_formato for parametro in parametros)
+
+    def decorador(vista):
+        vista.__doc__ = esquema.documentar(vista.__doc__)
+
+        @wraps(vista)
+        def validar_y_ejecutar(**argumentos):
+            if negocia_formato:
+                g.vary_accept = True
+            valores, error = esquema.validar(request.args)
+            if error is not None:
+                return error
+            return vista(valores, **argumentos)
+
+        return validar_y_ejecutar
+
+    return decorador
+
+### FUNCIÓN ###
+# Nombre: parametro_cantidad
+# Descripción: Parámetro de cantidad con el límite según el modo de la
+#    petición: MAX_CANTIDAD_STREAM con stream, MAX_CANTIDAD_MASIVO con masivo=1
+#    o un formato binario, MAX_LANZAMIENTOS_RESUMEN con resumen=1 (en los
+#    endpoints que los tienen) y maximo en otro caso.
+# Parámetros:
+#   - nombre: Nombre del argumento (por defecto 'cantidad').
+#   - etiqueta: Sujeto de los mensajes de error.
+#   - descripcion: Descripción para la documentación.
+#   - maximo: Límite sin stream ni masivo (por defecto MAX_CANTIDAD).
+#   - masivo: Si el endpoint tiene modo masivo o formatos binarios.
+#   - resumen: Si el endpoint tiene modo resumen.
+#   - mensaje_minimo, mensaje_maximo: Mensajes propios de los límites (ver Parametro).
+# Respuesta: Parametro.
+###############
+def parametro_cantidad(nombre='cantidad', etiqueta='La cantidad', descripcion='Cantidad de valores a generar.',
+                       maximo=MAX_CANTIDAD, masivo=False, resumen=False, mensaje_minimo=None, mensaje_maximo=None):
+    def limite(valores):
+        if valores.get('stream'):
+            return MAX_CANTIDAD_STREAM
+        if masivo and (valores.get('masivo') or valores.get('formato', 'json') != 'json'):
+            return MAX_CANTIDAD_MASIVO
+        if resumen and valores.get('resumen'):
+            return MAX_LANZAMIENTOS_RESUMEN
+        return maximo
+
+    if masivo:
+        limites = f'Máximo {maximo}; {MAX_CANTIDAD_MASIVO} con masivo=1 o formato binario y {MAX_CANTIDAD_STREAM} con stream.'
+    elif resumen:
+        limites = f'Máximo {maximo}; {MAX_LANZAMIENTOS_RESUMEN} con resumen=1 y {MAX_CANTIDAD_STREAM} con stream.'
+    else:
+        limites = f'Máximo {maximo}; {MAX_CANTIDAD_STREAM} con stream.'
+    return Parametro(nombre, defecto=1, minimo=1, maximo=limite, etiqueta=etiqueta,
+                     mensaje_minimo=mensaje_minimo, mensaje_maximo=mensaje_maximo,
+                     descripcion=f'{descripcion} {limites}')
+
+# Mensajes de la cantidad de NumAleatorio y NumDecimalAleatorio, iguales a los
+# que esos endpoints devolvían antes de declarar sus parámetros con Parametro
+MENSAJES_CANTIDAD_NUMEROS = MappingProxyType({
+    'mensaje_minimo': 'La cantidad debe ser mayor a cero.',
+    'mensaje_maximo': 'El límite de la cantidad debe ser menor a {limite}.',
+})
+
+# Parámetros comunes a varios endpoints
+PARAMETRO_SEED = Parametro('seed', descripcion='Semilla para obtener resultados reproducibles.')
+PARAMETRO_STREAM = Parametro(
+    'stream', 'opcion', '', opciones=FORMATOS_STREAM, codigo=1004,
+    mensaje='Formato de stream no válido. Usa "ndjson" o "csv".',
+    descripcion='Devuelve los valores en streaming (chunked) como NDJSON o CSV y eleva el límite de cantidad.'
+)
+PARAMETRO_COMPACT = Parametro(
+    'compact', defecto=0,
+    descripcion='Si es 1 los resultados se devuelven como arreglo en lugar de un objeto con claves numeradas.'
+)
+PARAMETRO_MASIVO = Parametro(
+    'masivo', defecto=0,
+    descripcion='1 para generar en bloque con NumPy y elevar el límite de cantidad.'
+)
+PARAMETRO_FORMATO = Parametro(
+    'formato', 'opcion', negociar_formato, opciones=tuple(FORMATOS_RESPUESTA), codigo=1004,
+    mensaje='Formato no válido. Usa "json", "octet", "msgpack" o "cbor".',
+    descripcion='Formato de la respuesta. Si no se indica se negocia con la cabecera Accept.'
+)
+PARAMETRO_RESUMEN = Parametro(
+    'resumen', defecto=0,
+    descripcion='1 para devolver solo los conteos, muestreados de una distribución binomial o multinomial, '
+                'en lugar de cada lanzamiento.'
+)
+PARAMETRO_MAZOS = Parametro(
+    'mazos', defecto=1, minimo=1, maximo=MAX_MAZOS, etiqueta='La cantidad de mazos', codigo_minimo=1002,
+    descripcion='Mazos del zapato, por ejemplo 8 para blackjack.'
+)
+PARAMETRO_COMODINES = Parametro(
+    'comodines', defecto=0, minimo=0, maximo=MAX_COMODINES, codigo_minimo=1002, codigo_maximo=1002,
+    mensaje=f'Los comodines por mazo deben ser entre 0 y {MAX_COMODINES}.',
+    descripcion='Comodines por mazo (RJ rojo, BJ negro).'
+)
+PARAMETRO_ENTEROS = Parametro(
+    'enteros', defecto=0,
+    descripcion='1 para devolver el código de cada carta: 0 a 51 en el orden AS..KS, AD..KD, AC..KC, AH..KH; 52 y 53 comodines.'
+)
+# El modo resumen no tiene salida en streaming
+REGLA_RESUMEN_STREAM = (
+    lambda valores: valores['resumen'] and valores['stream'],
+    1004, 'El resumen no está disponible con stream.'
+)
+# Los formatos binarios no están disponibles con stream
+REGLA_STREAM_JSON = (
+    lambda valores: valores['stream'] and valores['formato'] != 'json',
+    1004, 'El streaming solo está disponible con formato json.'
+)
+
+### FUNCIÓN ###
+# Nombre: respuesta_binaria
+# Descripción: Devuelve un arreglo de NumPy como octetos crudos, MessagePack o
+#    CBOR, sin convertir cada valor a texto. En los tres casos los datos van
+#    como un bloque contiguo de bytes que el cliente puede leer directamente en
+#    un buffer (por ejemplo con numpy.frombuffer):
+#      - octet: el cuerpo es el arreglo; el tipo va en la cabecera X-Dtype.
+#      - msgpack: mapa con el arreglo como bin y su tipo en "dtype".
+#      - cbor: mapa con el arreglo como typed array (RFC 8746).
+# Parámetros:
+#   - formato: 'octet', 'msgpack' o 'cbor'.
+#   - campo: Nombre del campo con los datos (como en la respuesta JSON).
+#   - arreglo: Arreglo de NumPy en orden little-endian.
+#   - etiqueta_cbor: Etiqueta CBOR del typed array (64 uint8, 79 int64 LE, 86 float64 LE).
+#   - extra: Campos adicionales de la respuesta.
+# Respuesta: Respuesta de Flask con el contenido binario.
+###############
+def respuesta_binaria(formato, campo, arreglo, etiqueta_cbor, extra):
+    g.inicio_serializacion = perf_counter()
+    g.elementos = extra.get('cantidad')
+    datos = arreglo.tobytes()
+
+    if formato == 'octet':
+        cabeceras = {'X-Dtype': arreglo.dtype.str}
+        cabeceras.update({f"X-{clave.replace('_', '-').title()}": str(valor) for clave, valor in extra.items()})
+        g.fin_serializacion = perf_counter()
+        return app.response_class(datos, status=200, mimetype=FORMATOS_RESPUESTA['octet'], headers=cabeceras)
+
+    respuesta = {'status': 200, 'error': False, 'dtype': arreglo.dtype.str, **extra}
+    if formato == 'msgpack':
+        respuesta[campo] = datos
+        cuerpo = msgpack.packb(respuesta, use_bin_type=True)
+    else:
+        respuesta[campo] = cbor2.CBORTag(etiqueta_cbor, datos)
+        cuerpo = cbor2.dumps(respuesta)
+    g.fin_serializacion = perf_counter()
+    return app.response_class(cuerpo, status=200, mimetype=FORMATOS_RESPUESTA[formato])
+
+### FUNCIÓN ###
+# Nombre: tamanos_bloque
+# Descripción: Divide una cantidad en bloques de FILAS_POR_BLOQUE_STREAM para
+#    generar valores con NumPy sin crear el arreglo completo.
+# Parámetros:
+#   - cantidad: Cantidad total de valores.
+# Respuesta: Generador con el tamaño de cada bloque.
+###############
+def tamanos_bloque(cantidad):
+    for inicio in range(0, cantidad, FILAS_POR_BLOQUE_STREAM):
+        yield min(FILAS_POR_BLOQUE_STREAM, cantidad - inicio)
+
+### FUNCIÓN ###
+# Nombre: respuesta_stream
+# Descripción: Devuelve una respuesta en streaming (chunked) que envía los
+#    valores a medida que se generan, en bloques de FILAS_POR_BLOQUE_STREAM
+#    filas. En NDJSON cada línea es un valor JSON (u objeto si hay varias
+#    columnas); en CSV la primera línea contiene los nombres de las columnas
+#    y las listas se escriben separadas por espacios.
+# Parámetros:
+#   - formato: 'ndjson' o 'csv'.
+#   - columnas: Tupla con los nombres de las columnas.
+#   - filas: Iterable con los valores (o tuplas, si hay varias columnas).
+# Respuesta: Respuesta de Flask con el contenido generado perezosamente.
+###############
+def respuesta_stream(formato, columnas, filas):
+    una_columna = len(columnas) == 1
+    endpoint = etiqueta_endpoint()
+
+    def generar_ndjson():
+        # Sin escapar los caracteres no ASCII, igual que las respuestas JSON con orjson
+        codificar = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+        if una_columna:
+            lineas = map(codificar, filas)
+        else:
+            lineas = (codificar(dict(zip(columnas, fila))) for fila in filas)
+        total = 0
+        while True:
+            bloque = list(islice(lineas, FILAS_POR_BLOQUE_STREAM))
+            if not bloque:
+                break
+            total += len(bloque)
+            yield '\n'.join(bloque) + '\n'
+        metricas.sumar_elementos(endpoint, total)
+
+    def generar_csv():
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer, lineterminator='\n')
+        escritor.writerow(columnas)
+        yield buffer.getvalue()
+
+        def celda(valor):
+            return ' '.join(map(str, valor)) if isinstance(valor, list) else valor
+
+        if una_columna:
+            filas_csv = ((celda(fila),) for fila in filas)
+        else:
+            filas_csv = (tuple(map(celda, fila)) for fila in filas)
+        total = 0
+        while True:
+            bloque = list(islice(filas_csv, FILAS_POR_BLOQUE_STREAM))
+            if not bloque:
+                break
+            total += len(bloque)
+            buffer.seek(0)
+            buffer.truncate()
+            escritor.writerows(bloque)
+            yield buffer.getvalue()
+        metricas.sumar_elementos(endpoint, total)
+
+    if formato == 'csv':
+        return app.response_class(stream_with_context(generar_csv()), status=200, mimetype='text/csv')
+    return app.response_class(stream_with_context(generar_ndjson()), status=200, mimetype='application/x-ndjson')
+
+### CLASE ###
+# Nombre: Compresor
+# Descripción: Compresor incremental para una codificación de Content-Encoding.
+#    Cada llamada a comprimir devuelve los bytes del fragmento ya vaciados
+#    (sync flush), así el cliente puede descomprimir un stream a medida que
+#    llega; terminar cierra el flujo.
+# Parámetros:
+#   - codificacion: 'zstd', 'br' o 'gzip'.
+###############
+class Compresor:
+    def __init__(self, codificacion):
+        if codificacion == 'zstd':
+            objeto = zstandard.ZstdCompressor(level=3).compressobj()
+            self._comprimir = objeto.compress
+            self._vaciar = lambda: objeto.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            self._terminar = objeto.flush
+        elif codificacion == 'br':
+            objeto = brotli.Compressor(quality=4)
+            self._comprimir = objeto.process
+            self._vaciar = objeto.flush
+            self._terminar = objeto.finish
+        else:
+            objeto = zlib.compressobj(6, zlib.DEFLATED, 31)
+            self._comprimir = objeto.compress
+            self._vaciar = lambda: objeto.flush(zlib.Z_SYNC_FLUSH)
+            self._terminar = objeto.flush
+
+    def comprimir(self, datos):
+        return self._comprimir(datos) + self._vaciar()
+
+    def terminar(self):
+        return self._terminar()
+
+# Codificaciones disponibles, en orden de preferencia del servidor
+CODIFICACIONES = tuple(
+    codificacion for codificacion, disponible in
+    (('zstd', zstandard is not None), ('br', brotli is not None), ('gzip', True))
+    if disponible
+)
+
+### FUNCIÓN ###
+# Nombre: agregar_vary_accept
+# Descripción: Agrega Accept a Vary en todas las respuestas (JSON, binarias o
+#    de error) de los endpoints que eligen el formato por la cabecera Accept,
+#    para que un caché compartido no entregue msgpack o CBOR a un cliente que
+#    pidió JSON en la misma URL. Se suma al Accept-Encoding de
+#    comprimir_respuesta.
+# Parámetros:
+#   - respuesta: Respuesta de Flask.
+# Respuesta: La misma respuesta.
+###############
+@app.after_request
+def agregar_vary_accept(respuesta):
+    if g.get('vary_accept'):
+        respuesta.vary.add('Accept')
+    return respuesta
+
+### FUNCIÓN ###
+# Nombre: comprimir_respuesta
+# Descripción: Comprime la respuesta con la mejor codificación que acepte el
+#    cliente (Accept-Encoding). Solo se comprimen tipos de texto: los formatos
+#    binarios llevan datos aleatorios que no se reducen. Las respuestas menores
+#    a COMPRESION_MINIMO_BYTES se envían sin comprimir; las de streaming se
+#    comprimen fragmento a fragmento.
+# Parámetros:
+#   - respuesta: Respuesta de Flask.
+# Respuesta: La misma respuesta, comprimida si corresponde.
+###############
+@app.after_request
+def comprimir_respuesta(respuesta):
+    if (respuesta.mimetype not in TIPOS_COMPRIMIBLES or respuesta.status_code < 200 or
+            respuesta.status_code in (204, 304) or respuesta.direct_passthrough or
+            'Content-Encoding' in respuesta.headers):
+        return respuesta
+
+    respuesta.vary.add('Accept-Encoding')
+    codificacion = request.accept_encodings.best_match(CODIFICACIONES)
+    if codificacion is None:
+        return respuesta
+
+    compresor = Compresor(codificacion)
+    if respuesta.is_streamed:
+        fragmentos = respuesta.response
+
+        def generar():
+            try:
+                for fragmento in fragmentos:
+                    if isinstance(fragmento, str):
+                        fragmento = fragmento.encode('utf-8')
+                    if fragmento:
+                        yield compresor.comprimir(fragmento)
+                yield compresor.terminar()
+            finally:
+                if hasattr(fragmentos, 'close'):
+                    fragmentos.close()
+
+        respuesta.response = generar()
+        respuesta.headers.pop('Content-Length', None)
+    else:
+        datos = respuesta.get_data()
+        if len(datos) < COMPRESION_MINIMO_BYTES:
+            return respuesta
+        respuesta.set_data(compresor.comprimir(datos) + compresor.terminar())
+
+    respuesta.headers['Content-Encoding'] = codificacion
+    return respuesta
+
+### FUNCIÓN ###
+# Nombre: terminar_perfil
+# Descripción: Detiene el perfil iniciado por iniciar_perfil y lo entrega: con
+#    RMAPI_PERFIL_DIR se guarda en ese directorio (.prof para herramientas como
+#    snakeviz y .txt legible) y se indica el nombre en X-Perfil-Archivo; si no,
+#    la respuesta se sustituye por el texto del perfil como archivo adjunto y el
+#    status original va en X-Perfil-Status. En streaming solo se perfila hasta
+#    que se crea la respuesta. Se define antes de registrar_metricas y
+#    agregar_server_timing para ejecutarse después de ellas: las métricas y
+#    Server-Timing corresponden a la petición perfilada, no al adjunto.
+# Parámetros:
+#   - respuesta: Respuesta de Flask.
+# Respuesta: La respuesta original o la del perfil.
+###############
+@app.after_request
+def terminar_perfil(respuesta):
+    perfil = g.pop('perfil', None)
+    if perfil is None:
+        return respuesta
+    perfil.disable()
+
+    texto = io.StringIO()
+    estadisticas = pstats.Stats(perfil, stream=texto)
+    texto.write(f'{request.method} {request.full_path} -> {respuesta.status_code}\n')
+    estadisticas.sort_stats('cumulative').print_stats(LINEAS_PERFIL)
+    estadisticas.sort_stats('tottime').print_stats(LINEAS_PERFIL)
+
+    endpoint = request.endpoint or 'sin_ruta'
+    nombre = f"perfil-{endpoint}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.urandom(3).hex()}"
+
+    if DIRECTORIO_PERFILES:
+        os.makedirs(DIRECTORIO_PERFILES, exist_ok=True)
+        estadisticas.dump_stats(os.path.join(DIRECTORIO_PERFILES, f'{nombre}.prof'))
+        with open(os.path.join(DIRECTORIO_PERFILES, f'{nombre}.txt'), 'w', encoding='utf-8') as archivo:
+            archivo.write(texto.getvalue())
+        respuesta.headers['X-Perfil-Archivo'] = f'{nombre}.prof'
+        return respuesta
+
+    adjunto = app.response_class(texto.getvalue(), status=200, mimetype='text/plain', headers={
+        'Content-Disposition': f'attachment; filename="{nombre}.txt"',
+        'X-Perfil-Status': str(respuesta.status_code),
+    })
+    return adjunto
+
+### FUNCIÓN ###
+# Nombre: registrar_metricas
+# Descripción: Registra la petición en las métricas del proceso. Se define
+#    después de comprimir_respuesta para ejecutarse antes que ella y poder leer
+#    el code de los errores sin descomprimir. En streaming la latencia llega
+#    hasta que se devuelve la respuesta (el primer byte), y los elementos se
+#    suman al terminar el stream.
+# Parámetros:
+#   - respuesta: Respuesta de Flask.
+# Respuesta: La misma respuesta.
+###############
+@app.after_request
+def registrar_metricas(respuesta):
+    inicio = g.get('inicio_peticion')
+    if inicio is None:
+        return respuesta
+
+    codigo = None
+    if respuesta.status_code >= 400 and respuesta.mimetype == 'application/json' and not respuesta.is_streamed:
+        cuerpo = respuesta.get_json(silent=True)
+        if isinstance(cuerpo, dict):
+            codigo = cuerpo.get('code')
+
+    metricas.registrar(etiqueta_endpoint(), request.method, respuesta.status_code, codigo,
+                       perf_counter() - inicio, g.get('elementos') if respuesta.status_code == 200 else None)
+    return respuesta
+
+### FUNCIÓN ###
+# Nombre: agregar_server_timing
+# Descripción: Agrega la cabecera Server-Timing con la duración (ms) de la
+#    validación, la generación y la serialización de la petición, y el total.
+#    La validación va del inicio hasta la primera obtención de aleatoriedad; la
+#    serialización es la de respuesta_json o respuesta_binaria. En streaming la
+#    generación y la serialización ocurren mientras se envía el cuerpo, así que
+#    solo se informan la validación y el total hasta el primer byte.
+# Parámetros:
+#   - respuesta: Respuesta de Flask.
+# Respuesta: La misma respuesta.
+###############
+@app.after_request
+def agregar_server_timing(respuesta):
+    inicio = g.get('inicio_peticion')
+    if inicio is None:
+        return respuesta
+
+    fin = perf_counter()
+    inicio_generacion = g.get('inicio_generacion')
+    inicio_serializacion = g.get('inicio_serializacion')
+    fin_serializacion = g.get('fin_serializacion')
+
+    fin_validacion = inicio_generacion or inicio_serializacion or fin
+    metricas_tiempo = [('validacion', fin_validacion - inicio)]
+    if inicio_generacion is not None and inicio_serializacion is not None:
+        metricas_tiempo.append(('generacion', inicio_serializacion - inicio_generacion))
+    if inicio_serializacion is not None and fin_serializacion is not None:
+        metricas_tiempo.append(('serializacion', fin_serializacion - inicio_serializacion))
+    metricas_tiempo.append(('total', fin - inicio))
+
+    respuesta.headers['Server-Timing'] = ', '.join(f'{nombre};dur={segundos * 1000:.3f}' for nombre, segundos in metricas_tiempo)
+    return respuesta
+
+### FUNCIÓN ###
+# Nombre: escapar_etiqueta
+# Descripción: Escapa un valor de etiqueta del formato de texto de Prometheus.
+# Parámetros:
+#   - valor: Valor de la etiqueta.
+# Respuesta: Texto escapado.
+###############
+def escapar_etiqueta(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+### API DOC ###
+# Nombre: metrics
+# Descripción: Métricas de la API en el formato de texto de Prometheus, sumadas
+#    entre todos los workers.
+# Respuesta: Texto con las métricas.
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Métricas de la API en formato Prometheus.
+    ---
+    tags:
+      - Métricas
+    produces:
+      - text/plain
+    responses:
+      200:
+        description: Contadores de peticiones, errores, elementos generados e histogramas de latencia por endpoint, sumados entre todos los workers.
+    """
+    metricas.volcar()
+    totales = metricas.sumar_procesos()
+    lineas = []
+
+    lineas.append('# HELP rmapi_peticiones_total Peticiones atendidas por endpoint, método y status.')
+    lineas.append('# TYPE rmapi_peticiones_total counter')
+    for clave, valor in sorted(totales['peticiones'].items()):
+        endpoint, metodo, status = clave.split('\t')
+        lineas.append(f'rmapi_peticiones_total{{endpoint="{escapar_etiqueta(endpoint)}",metodo="{metodo}",status="{status}"}} {valor}')
+
+    lineas.append('# HELP rmapi_errores_total Errores por endpoint y code de la respuesta.')
+    lineas.append('# TYPE rmapi_errores_total counter')
+    for clave, valor in sorted(totales['errores'].items()):
+        endpoint, codigo = clave.split('\t')
+        lineas.append(f'rmapi_errores_total{{endpoint="{escapar_etiqueta(endpoint)}",code="{escapar_etiqueta(codigo)}"}} {valor}')
+
+    lineas.append('# HELP rmapi_elementos_generados_total Elementos generados por endpoint (suma de cantidad).')
+    lineas.append('# TYPE rmapi_elementos_generados_total counter')
+    for endpoint, valor in sorted(totales['elementos'].items()):
+        lineas.append(f'rmapi_elementos_generados_total{{endpoint="{escapar_etiqueta(endpoint)}"}} {valor}')
+
+    lineas.append('# HELP rmapi_latencia_segundos Latencia de las peticiones por endpoint.')
+    lineas.append('# TYPE rmapi_latencia_segundos histogram')
+    for endpoint, histograma in sorted(totales['latencias'].items()):
+        etiqueta = escapar_etiqueta(endpoint)
+        acumulado = 0
+        for limite, conteo in zip(LIMITES_LATENCIA + ('+Inf',), histograma):
+            acumulado += conteo
+            lineas.append(f'rmapi_latencia_segundos_bucket{{endpoint="{etiqueta}",le="{limite}"}} {acumulado}')
+        lineas.append(f'rmapi_latencia_segundos_sum{{endpoint="{etiqueta}"}} {histograma[-1]}')
+        lineas.append(f'rmapi_latencia_segundos_count{{endpoint="{etiqueta}"}} {acumulado}')
+
+    return app.response_class('\n'.join(lineas) + '\n', status=200, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+### FUNCIÓN ###
+# Nombre: leer_especificacion
+# Descripción: Lee la especificación OpenAPI generada con generar_openapi.py.
+# Respuesta: Contenido del archivo en bytes, o None si no se ha generado.
+###############
+def leer_especificacion():
+    try:
+        with open(ARCHIVO_OPENAPI, 'rb') as archivo:
+            return archivo.read()
+    except FileNotFoundError:
+        return None
+
+ESPECIFICACION_OPENAPI = leer_especificacion() if MODO_PRODUCCION else None
+
+# Archivos de Swagger UI incluidos en el paquete flasgger (versión fijada en
+# requirements.txt). Se localizan sin importar flasgger, así el modo producción
+# no depende de un CDN externo ni carga flasgger.
+def directorio_swagger_ui():
+    especificacion = importlib.util.find_spec('flasgger')
+    if especificacion is None or not especificacion.submodule_search_locations:
+        return None
+    return os.path.join(especificacion.submodule_search_locations[0], 'ui3', 'static')
+
+DIRECTORIO_SWAGGER_UI = directorio_swagger_ui() if MODO_PRODUCCION else None
+
+# Página de Swagger UI del modo producción
+PAGINA_SWAGGER_UI = '''<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>RandomMiscellaneousAPI</title>
+<link rel="stylesheet" href="/flasgger_static/swagger-ui.css">
+</head>
+<body>
+<div id="swagger-ui"></div>
+<script src="/flasgger_static/swagger-ui-bundle.js"></script>
+<script>SwaggerUIBundle({url: "/apispec_1.json", dom_id: "#swagger-ui"});</script>
+</body>
+</html>
+'''
+
+### API DOC ###
+# Nombre: especificacion_openapi
+# Descripción: Sirve la especificación OpenAPI precompilada (modo producción).
+#    Usa la misma ruta que flasgger para que los clientes no cambien.
+# Respuesta: JSON con la especificación, o error 404 si no se ha generado.
+def especificacion_openapi():
+    if ESPECIFICACION_OPENAPI is None:
+        return respuesta_error('La especificación no se ha generado. Ejecuta generar_openapi.py.', 1005, 404)
+    return app.response_class(ESPECIFICACION_OPENAPI, status=200, mimetype='application/json')
+
+### API DOC ###
+# Nombre: documentacion_swagger
+# Descripción: Swagger UI del modo producción, apuntando a la especificación
+#    precompilada.
+# Respuesta: Página HTML.
+def documentacion_swagger():
+    return app.response_class(PAGINA_SWAGGER_UI, status=200, mimetype='text/html')
+
+### API DOC ###
+# Nombre: archivos_swagger_ui
+# Descripción: Sirve los archivos de Swagger UI de flasgger en el modo
+#    producción, en la misma ruta que usa flasgger.
+# Parámetros:
+#   - archivo: Nombre del archivo dentro de ui3/static.
+# Respuesta: El archivo, o error 404 si flasgger no está instalado.
+def archivos_swagger_ui(archivo):
+    if DIRECTORIO_SWAGGER_UI is None:
+        return respuesta_error('Swagger UI no está instalado en este servidor.', 1005, 404)
+    return send_from_directory(DIRECTORIO_SWAGGER_UI, archivo)
+
+if MODO_PRODUCCION:
+    app.add_url_rule('/apispec_1.json', 'especificacion_openapi', especificacion_openapi)
+    app.add_url_rule('/apidocs/', 'documentacion_swagger', documentacion_swagger)
+    app.add_url_rule('/flasgger_static/<path:archivo>', 'archivos_swagger_ui', archivos_swagger_ui)
 
 ### API DOC ###
 # Nombre: home
@@ -59,13 +2701,17 @@ def home():
         "fecha": "19/07/2025",
         "version": "1.2.2",
         "descripcion": "RandomMiscellaneousAPI es una API desarrollada con Flask que permite generar diversos datos aleatorios útiles para pruebas, simulaciones, juegos, educación o desarrollo de software. Entre sus funcionalidades se incluyen la generación de números aleatorios, lanzamientos de moneda, selección aleatoria de elementos desde listas, coordenadas geográficas, fechas, contraseñas seguras, colores en formato hexadecimal y mucho más. La API es altamente configurable y está diseñada para ofrecer respuestas claras, estructuradas y listas para integrarse en sistemas frontend, scripts automatizados o entornos de desarrollo.",
-        "requisitos": ["pip install Flask", "pip install flask-cors", "pip install flasgger", "pip install faker"],
+        "requisitos": ["pip install Flask", "pip install flask-cors", "pip install flasgger", "pip install faker", "pip install numpy"],
         "librerias": {
-            "flask": ["Flask", "jsonify", "request"],
+            "flask": ["Flask", "jsonify", "request", "g", "json.provider.DefaultJSONProvider"],
             "flask-cors": ["CORS"],
             "flasgger": ["Swagger"],
             "faker": ["Faker"],
-            "random": ["randint", "sample", "uniform", "choices", "choice"],
+            "numpy": ["random.default_rng"],
+            "orjson": ["dumps"],
+            "msgpack": ["packb"],
+            "cbor2": ["dumps", "CBORTag"],
+            "random": ["Random"],
             "datetime": ["datetime", "timedelta"]
         }
     }
@@ -79,29 +2725,33 @@ def home():
 #   - lim_inferior: Límite inferior (por defecto 0).
 #   - lim_superior: Límite superior (por defecto 100).
 #   - cantidad: Cantidad de números aleatorios a generar (por defecto 1).
+#   - masivo: Si es 1, genera los números con NumPy y permite hasta MAX_CANTIDAD_MASIVO (por defecto 0).
+#   - formato: json, octet, msgpack o cbor; si no se indica se usa la cabecera Accept (por defecto json).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con los números aleatorios generados.
 ###########
 @app.route('/api/NumAleatorio', methods=['GET'])
-def NumAleatorio():
+@con_parametros(
+    Parametro('lim_inferior', defecto=1),
+    Parametro('lim_superior', defecto=100),
+    parametro_cantidad(descripcion='Cantidad de números a generar.', masivo=True, **MENSAJES_CANTIDAD_NUMEROS),
+    PARAMETRO_MASIVO,
+    PARAMETRO_FORMATO,
+    PARAMETRO_STREAM,
+    reglas=(
+        REGLA_STREAM_JSON,
+        (lambda valores: valores['lim_inferior'] >= valores['lim_superior'],
+         1002, 'El límite inferior debe ser menor que el superior.'),
+        (lambda valores: (valores['masivo'] or valores['stream'] or valores['formato'] != 'json')
+         and (valores['lim_inferior'] < -2**63 or valores['lim_superior'] >= 2**63),
+         1002, 'En modo masivo, stream o binario los límites deben caber en un entero de 64 bits.'),
+    )
+)
+def NumAleatorio(parametros):
     """
     Genera números aleatorios entre un límite inferior y superior.
     ---
-    parameters:
-      - name: lim_inferior
-        in: query
-        type: integer
-        required: false
-        default: 1
-      - name: lim_superior
-        in: query
-        type: integer
-        required: false
-        default: 100
-      - name: cantidad
-        in: query
-        type: integer
-        required: false
-        default: 1
     responses:
       200:
         description: Un número aleatorio generado
@@ -113,42 +2763,44 @@ def NumAleatorio():
           application/json: {"code":1002,"error":true,
           "message":"El límite inferior debe ser menor que el superior.","status":400}
     """
-    lim_inferior = request.args.get('lim_inferior', 1, type=int)
-    lim_superior = request.args.get('lim_superior', 100, type=int)
-    cantidad = request.args.get('cantidad', 1, type=int)
-
-    if lim_inferior >= lim_superior:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'El límite inferior debe ser menor que el superior.',
-            'code': 1002
-        }), 400
-
-    if cantidad <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad debe ser mayor a cero.',
-            'code': 1001
-        }), 400
-
-    if cantidad > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'El límite de la cantidad debe ser menor a 100.',
-            'code': 1000
-        }), 400
-
-    numeros = [randint(lim_inferior, lim_superior) for _ in range(cantidad)]
+    lim_inferior = parametros['lim_inferior']
+    lim_superior = parametros['lim_superior']
+    cantidad = parametros['cantidad']
+    masivo = parametros['masivo']
+    stream = parametros['stream']
+    formato = parametros['formato']
+    binario = formato != 'json'
 
-    return jsonify({
-        'status': 200,
-        'error': False,
+    error_formato = validar_formato(formato)
+    if error_formato:
+        return error_formato
+
+    # NumPy solo se carga para los modos masivo, stream y binario
+    if masivo or stream or binario:
+        rng_np = obtener_rng_np()
+
+    if stream:
+        bloques = (
+            rng_np.integers(lim_inferior, lim_superior, size=tamano, endpoint=True).tolist()
+            for tamano in tamanos_bloque(cantidad)
+        )
+        return respuesta_stream(stream, ('aleatorio',), chain.from_iterable(bloques))
+
+    if binario:
+        numeros = rng_np.integers(lim_inferior, lim_superior, size=cantidad, endpoint=True, dtype='<i8')
+        return respuesta_binaria(formato, 'aleatorios', numeros, 79, {'cantidad': cantidad})
+
+    if masivo:
+        numeros = rng_np.integers(lim_inferior, lim_superior, size=cantidad, endpoint=True)
+        return respuesta_masiva('aleatorios', ','.join(map(str, numeros.tolist())), cantidad)
+
+    rng = obtener_rng()
+    numeros = [rng.randint(lim_inferior, lim_superior) for _ in range(cantidad)]
+
+    return respuesta_json({
         'aleatorios': numeros,
         'cantidad': cantidad
-        }), 200
+    })
 
 ### API ###
 # Nombre: NumDecimalAleatorio
@@ -159,36 +2811,36 @@ def NumAleatorio():
 #   - lim_superior: Límite superior (por defecto 100).
 #   - decimales: Cantidad de decimales (por defecto 2).
 #   - cantidad: Cantidad de números decimales aleatorios a generar (por defecto 1).
+#   - masivo: Si es 1, genera los números con NumPy y permite hasta MAX_CANTIDAD_MASIVO (por defecto 0).
+#   - formato: json, octet, msgpack o cbor; si no se indica se usa la cabecera Accept (por defecto json).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con los números decimales aleatorios generados.
 ############
 @app.route('/api/NumDecimalAleatorio', methods=['GET'])
-def NumDecimalAleatorio():
+@con_parametros(
+    Parametro('lim_inferior', 'decimal', 1.0),
+    Parametro('lim_superior', 'decimal', 100.0),
+    Parametro('decimales', defecto=2, minimo=0, maximo=MAX_DECIMALES, codigo_minimo=1002, codigo_maximo=1002,
+              mensaje=f'El rango de decimales debe ser entre 0 y {MAX_DECIMALES}.'),
+    parametro_cantidad(descripcion='Cantidad de números decimales a generar.', masivo=True, **MENSAJES_CANTIDAD_NUMEROS),
+    PARAMETRO_MASIVO,
+    PARAMETRO_FORMATO,
+    PARAMETRO_STREAM,
+    reglas=(
+        REGLA_STREAM_JSON,
+        (lambda valores: valores['lim_inferior'] >= valores['lim_superior'],
+         1003, 'El límite inferior debe ser menor que el superior.'),
+        # NumPy no acepta límites infinitos ni un rango que se desborde
+        (lambda valores: (valores['masivo'] or valores['stream'] or valores['formato'] != 'json')
+         and not math.isfinite(valores['lim_superior'] - valores['lim_inferior']),
+         1003, 'En modo masivo, stream o binario los límites y su diferencia deben ser números finitos.'),
+    )
+)
+def NumDecimalAleatorio(parametros):
     """
     Genera números decimales aleatorios entre un límite inferior y superior.
     ---
-    parameters:
-      - name: lim_inferior
-        in: query
-        type: number
-        format: float
-        required: false
-        default: 1.0
-      - name: lim_superior
-        in: query
-        type: number
-        format: float
-        required: false
-        default: 100.0
-      - name: decimales
-        in: query
-        type: integer
-        required: false
-        default: 2
-      - name: cantidad
-        in: query
-        type: integer
-        required: false
-        default: 1
     responses:
       200:
         description: Un número decimal aleatorio generado
@@ -200,51 +2852,47 @@ def NumDecimalAleatorio():
           application/json: {"code":1003,"error":true,
           "message":"El límite inferior debe ser menor que el superior.","status":400}
     """
-    lim_inferior = request.args.get('lim_inferior', 1, type=float)
-    lim_superior = request.args.get('lim_superior', 100, type=float)
-    decimales = request.args.get('decimales', 2, type=int)
-    cantidad = request.args.get('cantidad', 1, type=int)
-
-    if lim_inferior >= lim_superior:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'El límite inferior debe ser menor que el superior.',
-            'code': 1003
-        }), 400
-
-    if decimales < 0 or decimales > 10:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'El rango de decimales debe ser entre 0 y 10.',
-            'code': 1002
-        }), 400
-
-    if cantidad <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad debe ser mayor a cero.',
-            'code': 1001
-        }), 400
-    
-    if cantidad > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'El límite de la cantidad debe ser menor a 100.',
-            'code': 1000
-        }), 400
-
-    numeros = [f"{uniform(lim_inferior, lim_superior):.{decimales}f}" for _ in range(cantidad)]
+    lim_inferior = parametros['lim_inferior']
+    lim_superior = parametros['lim_superior']
+    decimales = parametros['decimales']
+    cantidad = parametros['cantidad']
+    masivo = parametros['masivo']
+    stream = parametros['stream']
+    formato = parametros['formato']
+    binario = formato != 'json'
 
-    return jsonify({
-        'status': 200,
-        'error': False,
+    error_formato = validar_formato(formato)
+    if error_formato:
+        return error_formato
+
+    # NumPy solo se carga para los modos masivo, stream y binario
+    if masivo or stream or binario:
+        rng_np = obtener_rng_np()
+
+    if stream:
+        formato = f'{{:.{decimales}f}}'.format
+        bloques = (
+            map(formato, rng_np.uniform(lim_inferior, lim_superior, size=tamano).tolist())
+            for tamano in tamanos_bloque(cantidad)
+        )
+        return respuesta_stream(stream, ('aleatorio',), chain.from_iterable(bloques))
+
+    if binario:
+        numeros = rng_np.uniform(lim_inferior, lim_superior, size=cantidad).round(decimales).astype('<f8')
+        return respuesta_binaria(formato, 'aleatorios', numeros, 86, {'cantidad': cantidad, 'decimales': decimales})
+
+    if masivo:
+        numeros = rng_np.uniform(lim_inferior, lim_superior, size=cantidad)
+        formato = f'"{{:.{decimales}f}}"'.format
+        return respuesta_masiva('aleatorios', ','.join(map(formato, numeros.tolist())), cantidad)
+
+    rng = obtener_rng()
+    numeros = [f"{rng.uniform(lim_inferior, lim_superior):.{decimales}f}" for _ in range(cantidad)]
+
+    return respuesta_json({
         'aleatorios': numeros,
         'cantidad': cantidad
-        }), 200
+    })
 
 ### API ###
 # Nombre: BarajaAleatoria
@@ -253,81 +2901,294 @@ def NumDecimalAleatorio():
 # Parámetros:
 #   - cartas_por_mano: Cantidad de cartas por mano (por defecto 1).
 #   - manos: Cantidad de manos a repartir (por defecto 1).
+#   - mazos: Mazos que forman el zapato del que se reparte (por defecto 1, máximo MAX_MAZOS).
+#   - comodines: Comodines por mazo, 0 a 2 (por defecto 0).
+#   - enteros: 1 para devolver el código entero de cada carta en lugar de su nombre (por defecto 0).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - compact: 1 para devolver los resultados como arreglo, sin claves numeradas (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con las manos de cartas generadas.
 ###########
 @app.route('/api/BarajaAleatoria', methods=['GET'])
-def BarajaAleatoria():
+@con_parametros(
+    Parametro('cartas_por_mano', defecto=1, minimo=1, etiqueta='La cantidad de cartas por mano',
+              mensaje_minimo='Las cantidades de manos y cartas deben ser mayores a 0.'),
+    Parametro('manos', defecto=1, minimo=1, etiqueta='La cantidad de manos',
+              mensaje_minimo='Las cantidades de manos y cartas deben ser mayores a 0.'),
+    PARAMETRO_MAZOS,
+    PARAMETRO_COMODINES,
+    PARAMETRO_ENTEROS,
+    PARAMETRO_STREAM,
+    PARAMETRO_COMPACT,
+    reglas=(
+        (lambda valores: valores['cartas_por_mano'] * valores['manos']
+         > valores['mazos'] * (len(BARAJA) + valores['comodines']),
+         1002, 'No hay suficientes cartas en la baraja para repartir sin repetir.'),
+    )
+)
+def BarajaAleatoria(parametros):
     """
     Genera manos de cartas aleatorias de una baraja inglesa.
     ---
-    parameters:
-      - name: cartas_por_mano
-        in: query
-        type: integer
-        required: false
-        default: 1
-      - name: manos
-        in: query
-        type: integer
-        required: false
-        default: 1
     responses:
       200:
         description: Una carta aleatoria generada
         examples:
-          application/json: {"cartas_por_mano":1,"error":false,"manos":[{"mano_1":["10C"]}],
-          "status":200,"total_cartas":1}
+          application/json: {"cartas_por_mano":1,"comodines":0,"error":false,"manos":[{"mano_1":["10C"]}],
+          "mazos":1,"status":200,"total_cartas":1}
       400:
         description: No hay suficientes cartas en la baraja para repartir sin repetir.
         examples:
           application/json: {"code":1002,"error":true,
           "message":"No hay suficientes cartas en la baraja para repartir sin repetir.","status":400}
     """
-    cartas_por_mano = request.args.get('cartas_por_mano', 1, type=int)
-    manos = request.args.get('manos', 1, type=int)
-
-    if cartas_por_mano <= 0 or manos <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'Las cantidades de manos y cartas deben ser mayores a 0.',
-            'code': 1001
-            }), 400
-
-    baraja = [
-        "AS", "2S", "3S", "4S", "5S", "6S", "7S", "8S", "9S", "10S", "JS", "QS", "KS",
-        "AD", "2D", "3D", "4D", "5D", "6D", "7D", "8D", "9D", "10D", "JD", "QD", "KD",
-        "AC", "2C", "3C", "4C", "5C", "6C", "7C", "8C", "9C", "10C", "JC", "QC", "KC",
-        "AH", "2H", "3H", "4H", "5H", "6H", "7H", "8H", "9H", "10H", "JH", "QH", "KH"
-    ]
-
+    cartas_por_mano = parametros['cartas_por_mano']
+    manos = parametros['manos']
+    mazos = parametros['mazos']
+    comodines = parametros['comodines']
+    stream = parametros['stream']
     total_cartas = cartas_por_mano * manos
 
-    if total_cartas > len(baraja):
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'No hay suficientes cartas en la baraja para repartir sin repetir.',
-            'code': 1002
-            }), 400
-
-    cartas_repartidas = sample(baraja, total_cartas)
-    manos_repartidas = []
-
-    for i in range(manos):
-        inicio = i * cartas_por_mano
-        fin = inicio + cartas_por_mano
-        manos_repartidas.append({
-            f"mano_{i+1}": cartas_repartidas[inicio:fin]
-        })
+    codigos = cartas_aleatorias(total_cartas, mazos, comodines).reshape(manos, cartas_por_mano)
+    # Solo se convierten a texto las cartas repartidas
+    manos_repartidas = codigos.tolist()
+    if not parametros['enteros']:
+        manos_repartidas = [[NOMBRES_CARTAS[codigo] for codigo in mano] for mano in manos_repartidas]
+
+    if stream:
+        return respuesta_stream(stream, ('cartas',), manos_repartidas)
+
+    if parametros['compact'] != 1:
+        manos_repartidas = [{f"mano_{i+1}": mano} for i, mano in enumerate(manos_repartidas)]
+
+    return respuesta_json({
+        'manos': manos_repartidas,
+        'cartas_por_mano': cartas_por_mano,
+        'total_cartas': total_cartas,
+        'mazos': mazos,
+        'comodines': comodines
+    })
+
+### API ###
+# Nombre: SesionBaraja
+# Tipo: POST
+# Descripción: Crea una sesión de baraja: un zapato barajado del que se roban
+#    cartas en varias peticiones sin repetir. Las sesiones se guardan en
+#    DIRECTORIO_SESIONES (en memoria si hay un solo proceso), así cualquier
+#    worker las atiende, y caducan tras RMAPI_SESION_TTL segundos sin usarse.
+# Parámetros:
+#   - mazos: Mazos del zapato (por defecto 1, máximo MAX_MAZOS).
+#   - comodines: Comodines por mazo, 0 a 2 (por defecto 0).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
+# Respuesta: JSON con el identificador de la sesión y las cartas restantes.
+###########
+@app.route('/api/SesionBaraja', methods=['POST'])
+@con_parametros(
+    PARAMETRO_MAZOS,
+    PARAMETRO_COMODINES
+)
+def SesionBaraja(parametros):
+    """
+    Crea una sesión de baraja con un zapato barajado.
+    ---
+    responses:
+      200:
+        description: Sesión creada
+        examples:
+          application/json: {"comodines":0,"error":false,"mazos":8,"restantes":416,
+          "sesion":"q3Jb0cVf9sKx2LdA","status":200,"total":416,"ttl":1800}
+      503:
+        description: No hay memoria disponible para más sesiones
+        examples:
+          application/json: {"code":1006,"error":true,
+          "message":"No hay memoria disponible para más sesiones. Intenta más tarde.","status":503}
+    """
+    mazos = parametros['mazos']
+    comodines = parametros['comodines']
+
+    cartas = zapato_barajado(mazos, comodines)
+    sesion = sesiones_baraja.crear(cartas, mazos, comodines)
+
+    if sesion is None:
+        return respuesta_error('No hay memoria disponible para más sesiones. Intenta más tarde.', 1006, 503)
+
+    return respuesta_json({
+        'sesion': sesion,
+        'restantes': len(cartas),
+        'total': len(cartas),
+        'mazos': mazos,
+        'comodines': comodines,
+        'ttl': SESION_TTL_SEGUNDOS
+    })
+
+### API ###
+# Nombre: EstadoSesionBaraja
+# Tipo: GET
+# Descripción: Consulta cuántas cartas quedan en una sesión de baraja.
+# Parámetros:
+#   - sesion: Identificador de la sesión (en la ruta).
+# Respuesta: JSON con las cartas restantes y el tamaño del zapato.
+###########
+@app.route('/api/SesionBaraja/<sesion>', methods=['GET'])
+@con_parametros()
+def EstadoSesionBaraja(parametros, sesion):
+    """
+    Consulta cuántas cartas quedan en una sesión de baraja.
+    ---
+    parameters:
+      - name: sesion
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: Estado de la sesión
+        examples:
+          application/json: {"comodines":0,"error":false,"mazos":8,"restantes":410,
+          "sesion":"q3Jb0cVf9sKx2LdA","status":200,"total":416}
+      404:
+        description: La sesión no existe o ya caducó
+        examples:
+          application/json: {"code":1005,"error":true,"message":"La sesión no existe o ya caducó.","status":404}
+    """
+    estado = sesiones_baraja.estado(sesion)
+
+    if estado is None:
+        return sesion_no_encontrada()
+
+    return respuesta_json({'sesion': sesion, **estado})
+
+### API ###
+# Nombre: RobarSesionBaraja
+# Tipo: POST
+# Descripción: Roba cartas de una sesión de baraja. Las cartas robadas ya no
+#    vuelven a salir hasta barajar de nuevo.
+# Parámetros:
+#   - sesion: Identificador de la sesión (en la ruta).
+#   - cantidad: Cantidad de cartas a robar (por defecto 1).
+#   - enteros: 1 para devolver el código entero de cada carta (por defecto 0).
+# Respuesta: JSON con las cartas robadas y las restantes.
+###########
+@app.route('/api/SesionBaraja/<sesion>/robar', methods=['POST'])
+@con_parametros(
+    Parametro('cantidad', defecto=1, minimo=1, etiqueta='La cantidad de cartas', descripcion='Cartas a robar.'),
+    PARAMETRO_ENTEROS
+)
+def RobarSesionBaraja(parametros, sesion):
+    """
+    Roba cartas de una sesión de baraja.
+    ---
+    parameters:
+      - name: sesion
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: Cartas robadas
+        examples:
+          application/json: {"cantidad":2,"cartas":["7H","QS"],"comodines":0,"error":false,"mazos":8,
+          "restantes":414,"sesion":"q3Jb0cVf9sKx2LdA","status":200,"total":416}
+      400:
+        description: No quedan suficientes cartas
+        examples:
+          application/json: {"code":1003,"error":true,
+          "message":"La cantidad excede las cartas restantes de la sesión (414).","status":400}
+      404:
+        description: La sesión no existe o ya caducó
+        examples:
+          application/json: {"code":1005,"error":true,"message":"La sesión no existe o ya caducó.","status":404}
+    """
+    cantidad = parametros['cantidad']
+    resultado = sesiones_baraja.robar(sesion, cantidad)
+
+    if resultado is None:
+        return sesion_no_encontrada()
+
+    codigos, estado = resultado
+    if codigos is None:
+        return respuesta_error(f"La cantidad excede las cartas restantes de la sesión ({estado['restantes']}).", 1003)
+
+    cartas = list(codigos) if parametros['enteros'] else [NOMBRES_CARTAS[codigo] for codigo in codigos]
+
+    return respuesta_json({
+        'sesion': sesion,
+        'cartas': cartas,
+        'cantidad': cantidad,
+        **estado
+    })
+
+### API ###
+# Nombre: BarajarSesionBaraja
+# Tipo: POST
+# Descripción: Devuelve todas las cartas al zapato de la sesión y lo baraja.
+# Parámetros:
+#   - sesion: Identificador de la sesión (en la ruta).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
+# Respuesta: JSON con el estado de la sesión.
+###########
+@app.route('/api/SesionBaraja/<sesion>/barajar', methods=['POST'])
+@con_parametros()
+def BarajarSesionBaraja(parametros, sesion):
+    """
+    Devuelve todas las cartas al zapato de la sesión y lo baraja.
+    ---
+    parameters:
+      - name: sesion
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: Zapato barajado
+        examples:
+          application/json: {"comodines":0,"error":false,"mazos":8,"restantes":416,
+          "sesion":"q3Jb0cVf9sKx2LdA","status":200,"total":416}
+      404:
+        description: La sesión no existe o ya caducó
+        examples:
+          application/json: {"code":1005,"error":true,"message":"La sesión no existe o ya caducó.","status":404}
+    """
+    estado = sesiones_baraja.barajar(sesion)
+
+    if estado is None:
+        return sesion_no_encontrada()
+
+    return respuesta_json({'sesion': sesion, **estado})
+
+### API ###
+# Nombre: CerrarSesionBaraja
+# Tipo: DELETE
+# Descripción: Elimina una sesión de baraja y libera su memoria.
+# Parámetros:
+#   - sesion: Identificador de la sesión (en la ruta).
+# Respuesta: JSON con el identificador de la sesión eliminada.
+###########
+@app.route('/api/SesionBaraja/<sesion>', methods=['DELETE'])
+@con_parametros()
+def CerrarSesionBaraja(parametros, sesion):
+    """
+    Elimina una sesión de baraja.
+    ---
+    parameters:
+      - name: sesion
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: Sesión eliminada
+        examples:
+          application/json: {"error":false,"sesion":"q3Jb0cVf9sKx2LdA","status":200}
+      404:
+        description: La sesión no existe o ya caducó
+        examples:
+          application/json: {"code":1005,"error":true,"message":"La sesión no existe o ya caducó.","status":404}
+    """
+    if not sesiones_baraja.cerrar(sesion):
+        return sesion_no_encontrada()
 
-    return jsonify({
-        'status': 200,
-        'error': False,
-        'manos': manos_repartidas,
-        'cartas_por_mano': cartas_por_mano,
-        'total_cartas': total_cartas
-    }), 200
+    return respuesta_json({'sesion': sesion})
 
 ### API ###
 # Nombre: LanzamientosMoneda
@@ -335,19 +3196,24 @@ def BarajaAleatoria():
 # Descripción: Genera lanzamientos de moneda con resultados entre cara o cruz.
 # Parámetros:
 #   - lanzamientos: Cantidad de lanzamientos de moneda (por defecto 1).
+#   - resumen: 1 para devolver solo la cantidad de caras y cruces (por defecto 0).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - compact: 1 para devolver los resultados como arreglo, sin claves numeradas (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con los lanzamientos de moneda.
 ###########
 @app.route('/api/LanzamientosMoneda', methods=['GET'])
-def LanzamientoMoneda():
+@con_parametros(
+    parametro_cantidad('lanzamientos', 'La cantidad de lanzamientos', 'Cantidad de lanzamientos de moneda.', resumen=True),
+    PARAMETRO_RESUMEN,
+    PARAMETRO_STREAM,
+    PARAMETRO_COMPACT,
+    reglas=(REGLA_RESUMEN_STREAM,)
+)
+def LanzamientoMoneda(parametros):
     """
     Genera lanzamientos de moneda con resultados entre cara o cruz.
     ---
-    parameters:
-      - name: lanzamientos
-        in: query
-        type: integer
-        required: false
-        default: 1
     responses:
       200:
         description: Un lanzamiento de moneda
@@ -360,36 +3226,38 @@ def LanzamientoMoneda():
           application/json: {"code":1001,"error":true,
           "message":"La cantidad de lanzamientos debe ser mayor a 0.","status":400}
     """
-    lanzamientos = request.args.get('lanzamientos', 1, type=int)
-
-    if lanzamientos <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de lanzamientos debe ser mayor a 0.',
-            'code': 1001
-            }), 400
-    
-    if lanzamientos > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de lanzamientos debe ser menor a 100.',
-            'code': 1000
-            }), 400
+    lanzamientos = parametros['lanzamientos']
+    stream = parametros['stream']
+
+    if parametros['resumen']:
+        caras = int(obtener_rng_np().binomial(lanzamientos, 0.5))
+        return respuesta_json({
+            "resumen": {"Cara": caras, "Cruz": lanzamientos - caras},
+            "total_lanzamientos": lanzamientos
+        })
+
+    rng = obtener_rng()
+
+    if stream:
+        resultados = ("Cara" if rng.uniform(0, 1) >= 0.5 else "Cruz" for _ in range(lanzamientos))
+        return respuesta_stream(stream, ('resultado',), resultados)
+
+    if parametros['compact'] == 1:
+        return respuesta_json({
+            "lanzamientos": ["Cara" if rng.uniform(0, 1) >= 0.5 else "Cruz" for _ in range(lanzamientos)],
+            "total_lanzamientos": lanzamientos
+        })
 
     lanzamientos_dict = {}
     for i in range(1, lanzamientos + 1):
-        lanzamientos_dict[f"lanzamiento_{i}"] = "Cara" if uniform(0, 1) >= 0.5 else "Cruz"
+        lanzamientos_dict[f"lanzamiento_{i}"] = "Cara" if rng.uniform(0, 1) >= 0.5 else "Cruz"
 
     respuesta = {
-        "status": 200,
-        "error": False,
         "lanzamientos": [lanzamientos_dict],
         "total_lanzamientos": lanzamientos
     }
 
-    return jsonify(respuesta), 200
+    return respuesta_json(respuesta)
 
 ### API ###
 # Nombre: LanzamientosDado
@@ -398,25 +3266,29 @@ def LanzamientoMoneda():
 # Parámetros:
 #   - lanzamientos: Cantidad de lanzamientos de dado (por defecto 1).
 #   - dados: Cantidad de dados a lanzar por lanzamiento (por defecto 1).
+#   - resumen: 1 para devolver solo cuántas veces salió cada cara (por defecto 0).
+#   - sumas: Con resumen=1, 1 para incluir cuántas veces salió cada suma (por defecto 0).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - compact: 1 para devolver los resultados como arreglo, sin claves numeradas (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con los lanzamientos de dado.
 ###########
 
 @app.route('/api/LanzamientosDado', methods=['GET'])
-def LanzamientoDado():
+@con_parametros(
+    parametro_cantidad('lanzamientos', 'La cantidad de lanzamientos', 'Cantidad de lanzamientos de dado.', resumen=True),
+    Parametro('dados', defecto=1, minimo=1, maximo=MAX_DADOS, etiqueta='La cantidad de dados', codigo_minimo=1002,
+              descripcion='Cantidad de dados por lanzamiento.'),
+    PARAMETRO_RESUMEN,
+    Parametro('sumas', defecto=0, descripcion='Con resumen=1, 1 para incluir la distribución de la suma de los dados.'),
+    PARAMETRO_STREAM,
+    PARAMETRO_COMPACT,
+    reglas=(REGLA_RESUMEN_STREAM,)
+)
+def LanzamientoDado(parametros):
     """
     Genera lanzamientos de un dado con resultados entre 1 y 6.
     ---
-    parameters:
-      - name: lanzamientos
-        in: query
-        type: integer
-        required: false
-        default: 1
-      - name: dados
-        in: query
-        type: integer
-        required: false
-        default: 1
     responses:
       200:
         description: Un lanzamiento de un dado
@@ -429,54 +3301,38 @@ def LanzamientoDado():
           application/json: {"code":1002,"error":true,
           "message":"La cantidad de dados debe ser mayor a 0.","status":400}
     """
-    lanzamientos = request.args.get('lanzamientos', 1, type=int)
-    dados = request.args.get('dados', 1, type=int)
-
-    if lanzamientos <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de lanzamientos debe ser mayor a 0.',
-            'code': 1001
-            }), 400
-    
-    if lanzamientos > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de lanzamientos debe ser menor a 100.',
-            'code': 1000
-            }), 400
-    
-    if dados <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de dados debe ser mayor a 0.',
-            'code': 1002
-            }), 400
-    
-    if dados > 10:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de dados debe ser menor a 10.',
-            'code': 1000
-            }), 400
+    lanzamientos = parametros['lanzamientos']
+    dados = parametros['dados']
+    stream = parametros['stream']
 
-    lanzamientos_dict = {}
-    for i in range(1, lanzamientos + 1):
-        lanzamientos_dict[f"lanzamiento_{i}"] = [randint(1, 6) for _ in range(dados)]
+    if parametros['resumen']:
+        return respuesta_json({
+            "resumen": resumen_dados(lanzamientos, dados, parametros['sumas']),
+            "total_lanzamientos": lanzamientos,
+            "dados_por_lanzamiento": dados
+        })
+
+    if stream:
+        bloques = (dados_aleatorios(tamano, dados) for tamano in tamanos_bloque(lanzamientos))
+        return respuesta_stream(stream, ('dados',), chain.from_iterable(bloques))
+
+    resultados = dados_aleatorios(lanzamientos, dados)
+
+    if parametros['compact'] == 1:
+        lanzamientos_lista = resultados
+    else:
+        lanzamientos_lista = [{
+            f"lanzamiento_{i+1}": resultado
+            for i, resultado in enumerate(resultados)
+        }]
 
     respuesta = {
-        "status": 200,
-        "error": False,
-        "lanzamientos": [lanzamientos_dict],
+        "lanzamientos": lanzamientos_lista,
         "total_lanzamientos": lanzamientos,
         "dados_por_lanzamiento": dados
     }
 
-    return jsonify(respuesta), 200
+    return respuesta_json(respuesta)
 
 ### API ###
 # Nombre: NombreAleatorio
@@ -484,19 +3340,21 @@ def LanzamientoDado():
 # Descripción: Genera nombres aleatorios utilizando la librería Faker.
 # Parámetros:
 #   - cantidad: Cantidad de nombres a generar (por defecto 1).
+#   - locale: Locale de Faker con el que se generan los nombres (por defecto es_MX).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con los nombres generados.
 ###########
 @app.route('/api/NombreAleatorio', methods=['GET'])
-def NombreAleatorio():
+@con_parametros(
+    parametro_cantidad(etiqueta='La cantidad de nombres', descripcion='Cantidad de nombres a generar.'),
+    Parametro('locale', 'texto', FAKER_LOCALE_DEFECTO, descripcion='Locale de Faker, por ejemplo es_MX, en_US o fr_FR.'),
+    PARAMETRO_STREAM
+)
+def NombreAleatorio(parametros):
     """
     Genera nombres aleatorios utilizando la librería Faker.
     ---
-    parameters:
-      - name: cantidad
-        in: query
-        type: integer
-        required: false
-        default: 1
     responses:
       200:
         description: Un nombre aleatorio generado
@@ -508,33 +3366,28 @@ def NombreAleatorio():
           application/json: {"code":1001,"error":true,
           "message":"La cantidad de nombres debe ser mayor a 0.","status":400}
     """
-    cantidad = request.args.get('cantidad', 1, type=int)
-
-    if cantidad <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de nombres debe ser mayor a 0.',
-            'code': 1001
-            }), 400
-    
-    if cantidad > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de nombres debe ser menor a 100.',
-            'code': 1000
-            }), 400
-
-    fake = Faker('es_MX')
-    nombres = [fake.name() for _ in range(cantidad)]
+    cantidad = parametros['cantidad']
+    locale = parametros['locale']
+    stream = parametros['stream']
 
-    return jsonify({
-        'status': 200,
-        'error': False,
+    from faker.config import AVAILABLE_LOCALES
+
+    if locale not in AVAILABLE_LOCALES:
+        return respuesta_error(f'Locale no válido: {locale}. Usa un locale de Faker, por ejemplo es_MX o en_US.', 1002)
+
+    fake, candado = obtener_faker(locale)
+    rng = obtener_rng()
+
+    if stream:
+        return respuesta_stream(stream, ('nombre',), nombres_faker(fake, candado, rng, cantidad))
+
+    nombres = list(nombres_faker(fake, candado, rng, cantidad))
+
+    return respuesta_json({
         'nombres': nombres,
-        'cantidad': cantidad
-        }), 200
+        'cantidad': cantidad,
+        'locale': locale
+    })
 
 ### API ###
 # Nombre: DecisionAleatoria
@@ -542,19 +3395,21 @@ def NombreAleatorio():
 # Descripción: Genera decisiones aleatorias entre Si y No.
 # Parámetros:
 #   - cantidad: Cantidad de decisiones a generar (por defecto 1).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - compact: 1 para devolver los resultados como arreglo, sin claves numeradas (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 #Respuesta: JSON con las decisiones generadas.
 ###########
 @app.route('/api/DecisionAleatoria', methods=['GET'])
-def DecisionAleatoria():
+@con_parametros(
+    parametro_cantidad(etiqueta='La cantidad de decisiones', descripcion='Cantidad de decisiones a generar.'),
+    PARAMETRO_STREAM,
+    PARAMETRO_COMPACT
+)
+def DecisionAleatoria(parametros):
     """
     Genera decisiones aleatorias entre Si y No.
     ---
-    parameters:
-      - name: cantidad
-        in: query
-        type: integer
-        required: false
-        default: 1
     responses:
       200:
         description: Una decisión aleatoria
@@ -567,38 +3422,32 @@ def DecisionAleatoria():
           application/json: {"code":1001,"error":true,
           "message":"La cantidad de decisiones debe ser mayor a 0.","status":400}
     """
-    cantidad = request.args.get('cantidad', 1, type=int)
-
-    if cantidad <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de decisiones debe ser mayor a 0.',
-            'code': 1001,
-            }), 400
-    
-    if cantidad > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de decisiones debe ser menor a 100.',
-            'code': 1000,
-            }), 400
+    cantidad = parametros['cantidad']
+    stream = parametros['stream']
 
     decisiones = ["Si", "No"]
+    rng = obtener_rng()
+
+    if stream:
+        return respuesta_stream(stream, ('decision',), (rng.sample(decisiones, 1)[0] for _ in range(cantidad)))
+
+    if parametros['compact'] == 1:
+        return respuesta_json({
+            "decisiones": [rng.sample(decisiones, 1)[0] for _ in range(cantidad)],
+            "total_decisiones": cantidad
+        })
+
     decisiones_dict = {}
 
     for i in range(1, cantidad + 1):
-        decisiones_dict[f"decisión_{i}"] = sample(decisiones, 1)[0]
+        decisiones_dict[f"decisión_{i}"] = rng.sample(decisiones, 1)[0]
 
     respuesta = {
-        "status": 200,
-        "error": False,
         "decisiones": [decisiones_dict],
         "total_decisiones": cantidad
     }
 
-    return jsonify(respuesta), 200
+    return respuesta_json(respuesta)
 
 ### API ###
 # Nombre: LetraAleatoria
@@ -606,19 +3455,19 @@ def DecisionAleatoria():
 # Descripción: Genera letras aleatorias del alfabeto inglés entre A y Z.
 # Parámetros:
 #   - cantidad: Cantidad de letras a generar (por defecto 1).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con las letras generadas.
 ###########
 @app.route('/api/LetraAleatoria', methods=['GET'])
-def LetraAleatoria():
+@con_parametros(
+    parametro_cantidad(etiqueta='La cantidad de letras', descripcion='Cantidad de letras a generar.'),
+    PARAMETRO_STREAM
+)
+def LetraAleatoria(parametros):
     """
     Genera letras aleatorias del alfabeto inglés entre A y Z.
     ---
-    parameters:
-      - name: cantidad
-        in: query
-        type: integer
-        required: false
-        default: 1
     responses:
       200:
         description: Una letra aleatoria
@@ -630,32 +3479,19 @@ def LetraAleatoria():
           application/json: {"code":1001,"error":true,
           "message":"La cantidad de letras debe ser mayor a 0.","status":400}
     """
-    cantidad = request.args.get('cantidad', 1, type=int)
-
-    if cantidad <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de letras debe ser mayor a 0.',
-            'code': 1001
-            }), 400
-    
-    if cantidad > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de letras debe ser menor a 100.',
-            'code': 1000
-            }), 400
-
-    letras = [chr(randint(65, 90)) for _ in range(cantidad)]
+    cantidad = parametros['cantidad']
+    stream = parametros['stream']
 
-    return jsonify({
-        'status': 200,
-        'error': False,
+    if stream:
+        bloques = (letras_aleatorias(tamano) for tamano in tamanos_bloque(cantidad))
+        return respuesta_stream(stream, ('letra',), chain.from_iterable(bloques))
+
+    letras = letras_aleatorias(cantidad)
+
+    return respuesta_json({
         'letras': letras,
         'cantidad': cantidad
-        }), 200
+    })
 
 ### API ###
 # Nombre: CaracterAleatorio
@@ -663,19 +3499,19 @@ def LetraAleatoria():
 # Descripción: Genera caracteres aleatorios del conjunto ASCII imprimible.
 # Parámetros:
 #   - cantidad: Cantidad de caracteres a generar (por defecto 1).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con los caracteres generados.
 ###########
 @app.route('/api/CaracterAleatorio', methods=['GET'])
-def CaracterAleatorio():
+@con_parametros(
+    parametro_cantidad(etiqueta='La cantidad de caracteres', descripcion='Cantidad de caracteres a generar.'),
+    PARAMETRO_STREAM
+)
+def CaracterAleatorio(parametros):
     """
     Genera caracteres aleatorios del conjunto ASCII imprimible.
     ---
-    parameters:
-      - name: cantidad
-        in: query
-        type: integer
-        required: false
-        default: 1
     responses:
       200:
         description: Un caracter aleatorio generado
@@ -687,42 +3523,32 @@ def CaracterAleatorio():
           application/json: {"code":1001,"error":true,
           "message":"La cantidad de caracteres debe ser mayor a 0.","status":400}
     """
-    cantidad = request.args.get('cantidad', 1, type=int)
-
-    if cantidad <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de caracteres debe ser mayor a 0.',
-            'code': 1001
-            }), 400
-    
-    if cantidad > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de caracteres debe ser menor a 100.',
-            'code': 1000
-            }), 400
-
-    caracteres_validos = [chr(i) for i in range(32, 255) if i != 127]
-    caracteres = [choice(caracteres_validos) for _ in range(cantidad)]
+    cantidad = parametros['cantidad']
+    stream = parametros['stream']
 
-    return jsonify({
-        'status': 200,
-        'error': False,
+    rng = obtener_rng()
+
+    if stream:
+        return respuesta_stream(stream, ('caracter',), (rng.choice(CARACTERES_VALIDOS) for _ in range(cantidad)))
+
+    caracteres = [rng.choice(CARACTERES_VALIDOS) for _ in range(cantidad)]
+
+    return respuesta_json({
         'caracteres': caracteres,
         'cantidad': cantidad
-        }), 200
+    })
 
 ### API ###
 # Nombre: PiedraPapelTijera
 # Tipo: GET
 # Descripción: Genera una decisión aleatoria entre piedra, papel o tijera.
+# Parámetros:
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con la decisión generada.
 ###########
 @app.route('/api/PiedraPapelTijera', methods=['GET'])
-def PiedraPapelTijera():
+@con_parametros()
+def PiedraPapelTijera(parametros):
     """
     Genera una decisión aleatoria entre piedra, papel o tijera.
     ---
@@ -733,13 +3559,12 @@ def PiedraPapelTijera():
           application/json: {"decision":"Piedra","error":false,"status":200}
     """
     opciones = ["Piedra", "Papel", "Tijera"]
-    decision = sample(opciones, 1)[0]
+    rng = obtener_rng()
+    decision = rng.sample(opciones, 1)[0]
 
-    return jsonify({
-        'status': 200,
-        'error': False,
+    return respuesta_json({
         'decision': decision
-        }), 200
+    })
 
 ### API ###
 # Nombre: EmojiAleatorio
@@ -747,19 +3572,19 @@ def PiedraPapelTijera():
 # Descripción: Genera un emoji aleatorio.
 # Parámetros:
 #   - cantidad: Cantidad de emojis a generar (por defecto 1).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con el emoji generado.
 ###########
 @app.route('/api/EmojiAleatorio', methods=['GET'])
-def EmojiAleatorio():
+@con_parametros(
+    parametro_cantidad(etiqueta='La cantidad de emojis', descripcion='Cantidad de emojis a generar.'),
+    PARAMETRO_STREAM
+)
+def EmojiAleatorio(parametros):
     """
     Genera uno o varios emojis aleatorios.
     ---
-    parameters:
-      - name: cantidad
-        in: query
-        type: integer
-        required: false
-        default: 1
     responses:
       200:
         description: Emojis aleatorios generados
@@ -770,46 +3595,21 @@ def EmojiAleatorio():
         examples:
           application/json: {"code":1001,"error":true,"message":"La cantidad de emojis debe ser mayor a 0.","status":400}
     """
-    cantidad = request.args.get('cantidad', 1, type=int)
-
-    if cantidad <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de emojis debe ser mayor a 0.',
-            'code': 1001
-        }), 400
-
-    if cantidad > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de emojis debe ser menor a 100.',
-            'code': 1000
-        }), 400
-
-    emoji_rangos = [
-        (0x1F600, 0x1F64F),  # Emoticons
-        (0x1F300, 0x1F5FF),  # Símbolos y pictogramas
-        (0x1F680, 0x1F6FF),  # Transporte y mapas
-        (0x1F1E6, 0x1F1FF),  # Banderas
-        (0x1F900, 0x1F9FF),  # Símbolos suplementarios
-        (0x1FA70, 0x1FAFF),  # Extensión de símbolos
-    ]
+    cantidad = parametros['cantidad']
+    stream = parametros['stream']
 
-    # Función interna para elegir un emoji válido
-    def emoji_aleatorio():
-        r = choice(emoji_rangos)
-        return chr(choice(range(r[0], r[1] + 1)))
+    rng = obtener_rng()
 
-    emojis = [emoji_aleatorio() for _ in range(cantidad)]
+    # Se elige un rango y después un emoji dentro de él
+    if stream:
+        return respuesta_stream(stream, ('emoji',), (chr(rng.choice(rng.choice(EMOJI_RANGOS))) for _ in range(cantidad)))
 
-    return jsonify({
-        'status': 200,
-        'error': False,
+    emojis = [chr(rng.choice(rng.choice(EMOJI_RANGOS))) for _ in range(cantidad)]
+
+    return respuesta_json({
         'emojis': emojis,
         'cantidad': cantidad
-    }), 200
+    })
 
 ### API ###
 # Nombre: CoordenadaAleatoria
@@ -817,19 +3617,21 @@ def EmojiAleatorio():
 # Descripción: Genera coordenadas geográficas aleatorias con latitud y longitud.
 # Parámetros:
 #   - cantidad: Cantidad de coordenadas a generar (por defecto 1).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - compact: 1 para devolver los resultados como arreglo, sin claves numeradas (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con las coordenadas generadas.
 ###########
 @app.route('/api/CoordenadaAleatoria', methods=['GET'])
-def CoordenadasAleatorias():
+@con_parametros(
+    parametro_cantidad(etiqueta='La cantidad de coordenadas', descripcion='Cantidad de coordenadas a generar.'),
+    PARAMETRO_STREAM,
+    PARAMETRO_COMPACT
+)
+def CoordenadasAleatorias(parametros):
     """
     Genera coordenadas geográficas aleatorias con latitud y longitud.
     ---
-    parameters:
-      - name: cantidad
-        in: query
-        type: integer
-        required: false
-        default: 1
     responses:
       200:
         description: Una coordenada geográfica
@@ -843,39 +3645,42 @@ def CoordenadasAleatorias():
           application/json: {"code":1001,"error":true,
           "message":"La cantidad de coordenadas debe ser mayor a 0.","status":400}
     """
-    cantidad = request.args.get('cantidad', 1, type=int)
-
-    if cantidad <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de coordenadas debe ser mayor a 0.',
-            'code': 1001,
-            }), 400
-    
-    if cantidad > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de coordenadas debe ser menor a 100.',
-            'code': 1000,
-            }), 400
+    cantidad = parametros['cantidad']
+    stream = parametros['stream']
+
+    rng = obtener_rng()
+
+    if stream:
+        coordenadas = (
+            (round(rng.uniform(-89.999999, 89.999999), 6), round(rng.uniform(-179.999999, 179.999999), 6))
+            for _ in range(cantidad)
+        )
+        return respuesta_stream(stream, ('latitud', 'longitud'), coordenadas)
+
+    if parametros['compact'] == 1:
+        # Pares [latitud, longitud]
+        resultado = [
+            [round(rng.uniform(-89.999999, 89.999999), 6), round(rng.uniform(-179.999999, 179.999999), 6)]
+            for _ in range(cantidad)
+        ]
+        return respuesta_json({
+            'coordenadas': resultado,
+            'cantidad': cantidad
+        })
 
     resultado = {}
     for i in range(1, cantidad + 1):
-        latitud = round(uniform(-89.999999, 89.999999), 6)
-        longitud = round(uniform(-179.999999, 179.999999), 6)
+        latitud = round(rng.uniform(-89.999999, 89.999999), 6)
+        longitud = round(rng.uniform(-179.999999, 179.999999), 6)
         resultado[f'coordenada_{i}'] = {
             'latitud': latitud,
             'longitud': longitud
         }
 
-    return jsonify({
-        'status' : 200,
-        'error' : False,
-        'coordenadas' : resultado,
-        'cantidad' : cantidad
-        }), 200
+    return respuesta_json({
+        'coordenadas': resultado,
+        'cantidad': cantidad
+    })
 
 ### API ###
 # Nombre: PaisAleatorio
@@ -883,112 +3688,58 @@ def CoordenadasAleatorias():
 # Descripción: Genera un país aleatorio de una lista predefinida.
 # Parámetros:
 #   - cantidad: Cantidad de países a generar (por defecto 1).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con los países generados.
 ###########
 @app.route('/api/PaisAleatorio', methods=['GET'])
-def PaisAleatorio():
+@con_parametros(
+    parametro_cantidad(etiqueta='La cantidad de países', descripcion='Cantidad de países a generar.'),
+    Parametro('continente', 'opcion', '', descripcion='Puede ser uno o varios separados por coma.'),
+    PARAMETRO_STREAM
+)
+def PaisAleatorio(parametros):
     """
     Genera uno o varios países aleatorios, con opción de filtrar por continentes.
     ---
-    parameters:
-      - name: cantidad
-        in: query
-        type: integer
-        required: false
-        default: 1
-      - name: continente
-        in: query
-        type: string
-        required: false
-        description: Puede ser uno o varios separados por coma.
     responses:
       200:
         description: Países aleatorios generados
       400:
         description: Petición inválida
     """
-    cantidad = request.args.get('cantidad', 1, type=int)
-    continente_str = request.args.get('continente', '').lower()
-
-    if cantidad <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de países debe ser mayor a 0.',
-            'code': 1001
-        }), 400
-
-    if cantidad > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad de países debe ser menor a 100.',
-            'code': 1000
-        }), 400
-
-    paises_por_continente = {
-        'america': ["Argentina", "Bahamas", "Barbados", "Belice", "Bolivia", "Brasil", "Canadá", "Chile", "Colombia", "Costa Rica",
-            "Cuba", "Dominica", "Ecuador", "El Salvador", "Estados Unidos", "Granada", "Guatemala", "Guyana", "Haití",
-            "Honduras", "Jamaica", "México", "Nicaragua", "Panamá", "Paraguay", "Perú", "República Dominicana",
-            "San Cristóbal y Nieves", "Santa Lucía", "San Vicente y las Granadinas", "Surinam", "Trinidad y Tobago",
-            "Uruguay", "Venezuela"],
-        'europa': ["Alemania", "Andorra", "Austria", "Bélgica", "Bosnia y Herzegovina", "Bulgaria", "Chipre", "Croacia",
-            "Dinamarca", "Eslovaquia", "Eslovenia", "España", "Estonia", "Finlandia", "Francia", "Grecia", "Hungría",
-            "Irlanda", "Islandia", "Italia", "Kosovo", "Letonia", "Liechtenstein", "Lituania", "Luxemburgo", "Malta",
-            "Moldavia", "Mónaco", "Montenegro", "Noruega", "Países Bajos", "Polonia", "Portugal", "Reino Unido",
-            "República Checa", "Rumania", "Rusia", "San Marino", "Serbia", "Suecia", "Suiza", "Ucrania", "Vaticano"],
-        'asia': ["Afganistán", "Arabia Saudita", "Armenia", "Azerbaiyán", "Bangladés", "Baréin", "Birmania", "Brunéi", "Bután",
-            "Camboya", "Catar", "China", "Corea del Norte", "Corea del Sur", "Emiratos Árabes Unidos", "Filipinas",
-            "Georgia", "India", "Indonesia", "Irak", "Irán", "Israel", "Japón", "Jordania", "Kazajistán", "Kirguistán",
-            "Kuwait", "Laos", "Líbano", "Malasia", "Maldivas", "Mongolia", "Nepal", "Omán", "Pakistán", "Singapur",
-            "Siria", "Sri Lanka", "Tayikistán", "Tailandia", "Timor Oriental", "Turkmenistán", "Turquía", "Uzbekistán",
-            "Vietnam", "Yemen"],
-        'africa': ["Angola", "Argelia", "Benín", "Botsuana", "Burkina Faso", "Burundi", "Cabo Verde", "Camerún", "Chad",
-            "Comoras", "Congo", "Costa de Marfil", "Egipto", "Eritrea", "Esuatini", "Etiopía", "Gabón", "Gambia",
-            "Ghana", "Guinea", "Guinea-Bisáu", "Guinea Ecuatorial", "Kenia", "Lesoto", "Liberia", "Libia", "Madagascar",
-            "Malaui", "Malí", "Marruecos", "Mauricio", "Mauritania", "Mozambique", "Namibia", "Níger", "Nigeria",
-            "República Centroafricana", "República Democrática del Congo", "Ruanda", "Santo Tomé y Príncipe",
-            "Senegal", "Seychelles", "Sierra Leona", "Somalia", "Sudáfrica", "Sudán", "Sudán del Sur", "Tanzania",
-            "Togo", "Túnez", "Uganda", "Yibuti", "Zambia", "Zimbabue"],
-        'oceania': ["Australia", "Fiyi", "Islas Marshall", "Islas Salomón", "Kiribati", "Micronesia", "Nauru", "Nueva Zelanda",
-            "Palaos", "Papúa Nueva Guinea", "Samoa", "Tonga", "Tuvalu", "Vanuatu"]
-    }
-
-    pais_a_continente = {
-        pais: continente
-        for continente, paises in paises_por_continente.items()
-        for pais in paises
-    }
+    cantidad = parametros['cantidad']
+    continente_str = parametros['continente']
+    stream = parametros['stream']
 
     if continente_str:
         continentes = [c.strip() for c in continente_str.split(',')]
-        continentes_invalidos = [c for c in continentes if c not in paises_por_continente]
+        continentes_invalidos = [c for c in continentes if c not in PAISES_POR_CONTINENTE]
 
         if continentes_invalidos:
-            return jsonify({
-                'status': 400,
-                'error': True,
-                'message': f"Continente(s) no válido(s): {', '.join(continentes_invalidos)}. Usa america, europa, asia, africa, oceania.",
-                'code': 1002
-            }), 400
-
-        paises_filtrados = sum((paises_por_continente[c] for c in continentes), [])
+            return respuesta_error(f"Continente(s) no válido(s): {', '.join(continentes_invalidos)}. Usa america, europa, asia, africa, oceania.", 1002)
+
+        paises_filtrados = PAISES_POR_FILTRO[frozenset(continentes)]
     else:
-        paises_filtrados = list(pais_a_continente.keys())
+        paises_filtrados = PAISES_POR_FILTRO[frozenset()]
+
+    rng = obtener_rng()
+
+    if stream:
+        paises = (rng.choice(paises_filtrados) for _ in range(cantidad))
+        return respuesta_stream(stream, ('pais', 'continente'), ((pais, PAIS_A_CONTINENTE[pais]) for pais in paises))
 
-    seleccionados = choices(paises_filtrados, k=cantidad)
+    seleccionados = rng.choices(paises_filtrados, k=cantidad)
 
     resultado = [
-        {"pais": pais, "continente": pais_a_continente[pais]}
+        {"pais": pais, "continente": PAIS_A_CONTINENTE[pais]}
         for pais in seleccionados
     ]
 
-    return jsonify({
-        'status': 200,
-        'error': False,
+    return respuesta_json({
         'cantidad': cantidad,
         'paises': resultado
-    }), 200
+    })
 
 ### API ###
 # Nombre: BinarioAleatorio
@@ -997,24 +3748,24 @@ def PaisAleatorio():
 # Parámetros:
 #   - longitud: Longitud del número binario (por defecto 1).
 #   - cantidad: Cantidad de números binarios a generar (por defecto 1).
+#   - formato: json, octet, msgpack o cbor; si no se indica se usa la cabecera Accept (por defecto json).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con los números binarios generados.
 ###########
 @app.route('/api/BinarioAleatorio', methods=['GET'])
-def BinarioAleatorio():
+@con_parametros(
+    parametro_cantidad(descripcion='Cantidad de números binarios a generar.', masivo=True),
+    Parametro('longitud', defecto=8, minimo=1, maximo=MAX_LONGITUD_BINARIO, etiqueta='La longitud', codigo_minimo=1002,
+              descripcion='Cantidad de bits de cada número.'),
+    PARAMETRO_FORMATO,
+    PARAMETRO_STREAM,
+    reglas=(REGLA_STREAM_JSON,)
+)
+def BinarioAleatorio(parametros):
     """
     Genera un número binario aleatorio de una longitud específica.
     ---
-    parameters:
-      - name: cantidad
-        in: query
-        type: integer
-        required: false
-        default: 1
-      - name: longitud
-        in: query
-        type: integer
-        required: false
-        default: 8
     responses:
       200:
         description: Un numero binario de longitud 8
@@ -1027,50 +3778,33 @@ def BinarioAleatorio():
           application/json: {"code":1002,"error":true,
           "message":"La longitud debe ser mayor a 0.","status":400}
     """
-    longitud = request.args.get('longitud', 8, type=int)
-    cantidad = request.args.get('cantidad', 1, type=int)
-
-    if cantidad <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad debe ser mayor a 0.',
-            'code': 1001
-            }), 400
-    
-    if cantidad > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad debe ser menor a 100.',
-            'code': 1000
-            }), 400
-    
-    if longitud <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La longitud debe ser mayor a 0.',
-            'code': 1002
-            }), 400
-    
-    if longitud > 128:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La longitud debe ser menor a 128.',
-            'code': 1000
-            }), 400
-
-    binarios = [''.join(choices('01', k=longitud)) for _ in range(cantidad)]
+    longitud = parametros['longitud']
+    cantidad = parametros['cantidad']
+    stream = parametros['stream']
+    formato = parametros['formato']
 
-    return jsonify({
-        'status': 200,
-        'error': False,
+    error_formato = validar_formato(formato)
+    if error_formato:
+        return error_formato
+
+    if stream:
+        bloques = (binarios_aleatorios(tamano, longitud) for tamano in tamanos_bloque(cantidad))
+        return respuesta_stream(stream, ('binario',), chain.from_iterable(bloques))
+
+    if formato != 'json':
+        import numpy as np
+
+        # Cada número ocupa ceil(longitud / 8) bytes, con el bit más significativo primero
+        empaquetados = np.packbits(bits_aleatorios(cantidad, longitud), axis=1)
+        return respuesta_binaria(formato, 'binarios', empaquetados, 64, {'longitud': longitud, 'cantidad': cantidad})
+
+    binarios = binarios_aleatorios(cantidad, longitud)
+
+    return respuesta_json({
         'binarios': binarios,
         'longitud': longitud,
         'cantidad': cantidad
-    }), 200
+    })
 
 ### API ###
 # Nombre: SeleccionAleatoria
@@ -1080,28 +3814,31 @@ def BinarioAleatorio():
 #   - valores: Lista de elementos a seleccionar.
 #   - cantidad: Cantidad de elementos a seleccionar (por defecto 1).
 #   - unicos: Si se deben seleccionar elementos únicos (por defecto 1).
+#   - pesos: Peso de cada valor, separados por comas (opcional).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - compact: 1 para devolver los resultados como arreglo, sin claves numeradas (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con los elementos seleccionados.
 ###########
 @app.route('/api/SeleccionAleatoria', methods=['GET'])
-def SeleccionAleatoria():
+@con_parametros(
+    Parametro('valores_str', 'texto', requerido=True,
+              mensaje='Debes proporcionar una lista de valores separados por comas.',
+              descripcion='Valores separados por comas.'),
+    parametro_cantidad(descripcion='Cantidad de elementos a seleccionar.'),
+    Parametro('unicos', defecto=1, descripcion='1 para seleccionar sin repetir.'),
+    Parametro('pesos', 'texto', '', descripcion='Peso de cada valor separados por comas, por ejemplo 5,3,2.'),
+    PARAMETRO_STREAM,
+    PARAMETRO_COMPACT,
+    reglas=(
+        (lambda valores: valores['unicos'] and valores['cantidad'] > valores['valores_str'].count(',') + 1,
+         1003, 'La cantidad solicitada excede el número de valores disponibles sin repetir.'),
+    )
+)
+def SeleccionAleatoria(parametros):
     """
     Selecciona aleatoriamente elementos de una lista dada.
     ---
-    parameters:
-      - name: valores
-        in: query separado por comas
-        type: string
-        required: true
-      - name: cantidad
-        in: query
-        type: integer
-        required: false
-        default: 1
-      - name: unicos
-        in: query [0 - Valores repetibles, 1 - Valores únicos]
-        type: integer
-        required: false
-        default: 1
     responses:
       200:
         description: Una selección aleatoria de 3 colores
@@ -1115,86 +3852,345 @@ def SeleccionAleatoria():
           application/json: {"code":1002,"error":true,
           "message":"Debes proporcionar una lista de valores separados por comas.","status":400}
     """
-    valores_str = request.args.get('valores_str')
-    cantidad = request.args.get('cantidad', 1, type=int)
-    unicos = request.args.get('unicos', 1, type=int)
-
-    if not valores_str:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'Debes proporcionar una lista de valores separados por comas.',
-            'code': 1002
-        }), 400
+    valores = parametros['valores_str'].split(',')
+    cantidad = parametros['cantidad']
+    unicos = parametros['unicos']
+    stream = parametros['stream']
+    tabla = None
 
-    valores = valores_str.split(',')
+    if parametros['pesos']:
+        tabla, error = obtener_tabla_alias(parametros['valores_str'], parametros['pesos'])
+        if error:
+            return respuesta_error(error, 1002)
+        if unicos and cantidad > tabla.positivos:
+            return respuesta_error('La cantidad solicitada excede el número de valores con peso mayor a 0.', 1003)
 
-    if cantidad <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad debe ser mayor a 0.',
-            'code': 1001
-        }), 400
-    
-    if cantidad > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad debe ser menor a 100.',
-            'code': 1000
-        }), 400
-
-    if unicos:
-        if cantidad > len(valores):
-            return jsonify({
-                'status': 400,
-                'error': True,
-                'message': 'La cantidad solicitada excede el número de valores disponibles sin repetir.',
-                'code': 1003
-            }), 400
-        seleccion = sample(valores, cantidad)
+    rng = obtener_rng()
+
+    if tabla is not None:
+        rng_np = obtener_rng_np()
+        if unicos:
+            seleccion = tabla.muestrear_sin_repeticion(rng_np, cantidad)
+        elif stream:
+            seleccion = chain.from_iterable(tabla.muestrear(rng_np, tamano) for tamano in tamanos_bloque(cantidad))
+        else:
+            seleccion = tabla.muestrear(rng_np, cantidad)
+    elif unicos:
+        seleccion = rng.sample(valores, cantidad)
+    elif stream:
+        seleccion = (rng.choice(valores) for _ in range(cantidad))
     else:
-        seleccion = choices(valores, k=cantidad)
+        seleccion = rng.choices(valores, k=cantidad)
 
-    seleccion_formateada = {
-        f"seleccion_{i+1}": valor for i, valor in enumerate(seleccion)
-    }
+    if stream:
+        return respuesta_stream(stream, ('seleccion',), seleccion)
 
-    return jsonify({
+    if parametros['compact'] == 1:
+        seleccion_formateada = seleccion
+    else:
+        seleccion_formateada = {
+            f"seleccion_{i+1}": valor for i, valor in enumerate(seleccion)
+        }
+
+    respuesta = {
         'valores': valores,
-        'status': 200,
-        'error': False,
         'seleccionados': seleccion_formateada,
         'cantidad': cantidad,
         'unicos': bool(unicos)
-    }), 200
+    }
+    if tabla is not None:
+        respuesta['pesos'] = tabla.pesos.tolist()
+
+    return respuesta_json(respuesta)
+
+### API ###
+# Nombre: SeleccionAleatoriaCuerpo
+# Tipo: POST
+# Descripción: Selecciona aleatoriamente elementos de una lista enviada en el
+#    cuerpo de la petición, para listas que no caben en la query string. El
+#    cuerpo se lee por bloques: sin repetir se usa muestreo de reservorio y solo
+#    se guardan los elementos seleccionados; con repetición se guarda una sola
+#    copia de la lista.
+# Parámetros:
+#   - cuerpo: Arreglo JSON (application/json), un valor JSON por línea
+#     (application/x-ndjson) o un valor de texto por línea (text/plain).
+#   - cantidad: Cantidad de elementos a seleccionar (por defecto 1).
+#   - unicos: Si se deben seleccionar elementos únicos (por defecto 1).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - compact: 1 para devolver los resultados como arreglo, sin claves numeradas (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
+# Respuesta: JSON con los elementos seleccionados y el total de valores recibidos.
+###########
+@app.route('/api/SeleccionAleatoria', methods=['POST'])
+@con_parametros(
+    parametro_cantidad(descripcion='Cantidad de elementos a seleccionar.'),
+    Parametro('unicos', defecto=1, descripcion='1 para seleccionar sin repetir.'),
+    PARAMETRO_STREAM,
+    PARAMETRO_COMPACT
+)
+def SeleccionAleatoriaCuerpo(parametros):
+    """
+    Selecciona aleatoriamente elementos de una lista enviada en el cuerpo.
+    ---
+    consumes:
+      - application/json
+      - application/x-ndjson
+      - text/plain
+    parameters:
+      - name: valores
+        in: body
+        required: true
+        description: Arreglo JSON de valores, o un valor por línea con text/plain o application/x-ndjson.
+        schema:
+          type: array
+          items: {}
+    responses:
+      200:
+        description: Una selección aleatoria de los valores enviados
+        examples:
+          application/json: {"cantidad":2,"error":false,
+          "seleccionados":{"seleccion_1":"verde","seleccion_2":"rojo"},"status":200,
+          "total_valores":3,"unicos":true}
+      400:
+        description: Cuerpo no válido
+        examples:
+          application/json: {"code":1002,"error":true,
+          "message":"El cuerpo debe ser un arreglo JSON o un valor por línea.","status":400}
+    """
+    cantidad = parametros['cantidad']
+    unicos = parametros['unicos']
+    stream = parametros['stream']
+    rng = obtener_rng()
+
+    try:
+        if unicos:
+            seleccion, total = muestra_reservorio(bloques_cuerpo(), cantidad, rng)
+        else:
+            valores = list(chain.from_iterable(bloques_cuerpo()))
+            total = len(valores)
+    except ValueError:
+        return respuesta_error('El cuerpo debe ser un arreglo JSON o un valor por línea.', 1002)
+
+    if total == 0:
+        return respuesta_error('Debes proporcionar al menos un valor.', 1002)
+    if unicos and cantidad > total:
+        return respuesta_error('La cantidad solicitada excede el número de valores disponibles sin repetir.', 1003)
+
+    if not unicos:
+        if stream:
+            seleccion = (rng.choice(valores) for _ in range(cantidad))
+        else:
+            seleccion = rng.choices(valores, k=cantidad)
+
+    if stream:
+        return respuesta_stream(stream, ('seleccion',), seleccion)
+
+    if parametros['compact'] == 1:
+        seleccion_formateada = seleccion
+    else:
+        seleccion_formateada = {
+            f"seleccion_{i+1}": valor for i, valor in enumerate(seleccion)
+        }
+
+    return respuesta_json({
+        'seleccionados': seleccion_formateada,
+        'cantidad': cantidad,
+        'unicos': bool(unicos),
+        'total_valores': total
+    })
+
+### API ###
+# Nombre: MuestraReservorio
+# Tipo: POST
+# Descripción: Selecciona k líneas aleatorias de un cuerpo de cualquier tamaño,
+#    por ejemplo un archivo de texto. El cuerpo se lee por bloques y solo se
+#    guardan las k líneas del reservorio (algoritmo L). Con pesos=1 cada línea
+#    es "peso<TAB>valor" y la probabilidad de cada valor es proporcional a su peso.
+# Parámetros:
+#   - cuerpo: Un valor por línea (o "peso<TAB>valor" con pesos=1).
+#   - cantidad: Cantidad de líneas a seleccionar (por defecto 1, máximo MAX_RESERVORIO).
+#   - pesos: 1 para muestreo ponderado (por defecto 0).
+#   - compact: 1 para devolver los resultados como arreglo, sin claves numeradas (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
+# Respuesta: JSON con las líneas seleccionadas y el total de líneas leídas.
+###########
+@app.route('/api/MuestraReservorio', methods=['POST'])
+@con_parametros(
+    Parametro('cantidad', defecto=1, minimo=1, maximo=MAX_RESERVORIO,
+              descripcion=f'Cantidad de líneas a seleccionar. Máximo {MAX_RESERVORIO}.'),
+    Parametro('pesos', defecto=0, descripcion='1 si cada línea es "peso<TAB>valor" para un muestreo ponderado.'),
+    PARAMETRO_COMPACT
+)
+def MuestraReservorio(parametros):
+    """
+    Selecciona líneas aleatorias de un cuerpo de cualquier tamaño.
+    ---
+    consumes:
+      - text/plain
+    parameters:
+      - name: lineas
+        in: body
+        required: true
+        description: Un valor por línea, o "peso<TAB>valor" con pesos=1.
+        schema:
+          type: string
+    responses:
+      200:
+        description: Dos líneas aleatorias del cuerpo
+        examples:
+          application/json: {"cantidad":2,"error":false,"ponderado":false,
+          "seleccionados":{"seleccion_1":"linea 8123","seleccion_2":"linea 17"},"status":200,
+          "total_valores":10000}
+      400:
+        description: Líneas con peso no válidas
+        examples:
+          application/json: {"code":1002,"error":true,
+          "message":"Cada línea debe tener un peso mayor o igual a 0, un tabulador y el valor.","status":400}
+    """
+    cantidad = parametros['cantidad']
+    ponderado = parametros['pesos'] == 1
+    rng = obtener_rng()
+    bloques = leer_bloques_lineas(request.stream)
+
+    if ponderado:
+        try:
+            seleccion, total, positivos = muestra_reservorio_ponderada(bloques_ponderados(bloques), cantidad, rng)
+        except ValueError:
+            return respuesta_error('Cada línea debe tener un peso mayor o igual a 0, un tabulador y el valor.', 1002)
+        if total and cantidad > positivos:
+            return respuesta_error('La cantidad solicitada excede el número de valores con peso mayor a 0.', 1003)
+    else:
+        try:
+            seleccion, total = muestra_reservorio(bloques, cantidad, rng)
+        except ValueError:
+            return respuesta_error('El cuerpo debe ser texto UTF-8 con un valor por línea.', 1002)
+
+    if total == 0:
+        return respuesta_error('Debes proporcionar al menos un valor.', 1002)
+    if cantidad > total:
+        return respuesta_error('La cantidad solicitada excede el número de valores disponibles sin repetir.', 1003)
+
+    if parametros['compact'] == 1:
+        seleccion_formateada = seleccion
+    else:
+        seleccion_formateada = {
+            f"seleccion_{i+1}": valor for i, valor in enumerate(seleccion)
+        }
+
+    return respuesta_json({
+        'seleccionados': seleccion_formateada,
+        'cantidad': cantidad,
+        'ponderado': ponderado,
+        'total_valores': total
+    })
+
+### API ###
+# Nombre: MezclaAleatoria
+# Tipo: POST
+# Descripción: Devuelve las líneas del cuerpo en orden aleatorio, para datos
+#    más grandes que la memoria. Las líneas que no caben en RMAPI_MEZCLA_MEMORIA
+#    se reparten al azar en archivos temporales que se mezclan uno por uno; la
+#    salida se envía en streaming y los archivos se borran al terminar.
+# Parámetros:
+#   - cuerpo: Un valor por línea.
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
+# Respuesta: Texto con las mismas líneas en orden aleatorio.
+###########
+@app.route('/api/MezclaAleatoria', methods=['POST'])
+@con_parametros()
+def MezclaAleatoria(parametros):
+    """
+    Devuelve las líneas del cuerpo en orden aleatorio.
+    ---
+    consumes:
+      - text/plain
+    produces:
+      - text/plain
+      - application/json
+    parameters:
+      - name: lineas
+        in: body
+        required: true
+        description: Un valor por línea.
+        schema:
+          type: string
+    responses:
+      200:
+        description: Las líneas mezcladas, una por línea
+        examples:
+          text/plain: "linea 3\\nlinea 1\\nlinea 2\\n"
+      413:
+        description: El cuerpo excede el tamaño máximo
+        examples:
+          application/json: {"code":1000,"error":true,
+          "message":"El cuerpo debe ser menor a 17179869184 bytes.","status":413}
+    """
+    mensaje_limite = f'El cuerpo debe ser menor a {MAX_MEZCLA_BYTES} bytes.'
+    if (request.content_length or 0) > MAX_MEZCLA_BYTES:
+        return respuesta_error(mensaje_limite, 1000, 413)
+
+    mezcla = MezclaExterna(obtener_rng_np())
+    try:
+        for lineas in leer_bloques_bytes(request.stream):
+            mezcla.agregar(lineas)
+            if mezcla.bytes > MAX_MEZCLA_BYTES:
+                mezcla.limpiar()
+                return respuesta_error(mensaje_limite, 1000, 413)
+    except BaseException:
+        mezcla.limpiar()
+        raise
+
+    if mezcla.total == 0:
+        return respuesta_error('Debes proporcionar al menos un valor.', 1002)
+
+    endpoint = etiqueta_endpoint()
+    total = mezcla.total
+
+    def generar():
+        yield from mezcla.generar()
+        metricas.sumar_elementos(endpoint, total)
+
+    respuesta = app.response_class(stream_with_context(generar()), status=200, mimetype='text/plain')
+    respuesta.headers['X-Total-Lineas'] = str(total)
+    # Si el cliente se desconecta antes de leer la respuesta el generador no
+    # llega a ejecutarse; los archivos se borran al cerrar la respuesta
+    respuesta.call_on_close(mezcla.limpiar)
+    return respuesta
 
 ### API ###
 # Nombre: ContraseñaAleatoria
 # Tipo: GET
 # Descripción: Genera una contraseña aleatoria con caracteres alfanuméricos y símbolos.
+#    Usa os.urandom (generador criptográficamente seguro) salvo que se indique seed.
 # Parámetros:
-#   - longitud: Longitud de la contraseña (por defecto 8).
-#   - cantidad: Cantidad de contraseñas a generar (por defecto 1).
+#   - longitud: Longitud de la contraseña (por defecto 8, máximo MAX_LONGITUD_CONTRASENA).
+#   - cantidad: Cantidad de contraseñas a generar (por defecto 1, máximo MAX_CANTIDAD_CONTRASENAS).
+#   - requiere_digito: Si es 1, cada contraseña tiene al menos un dígito (por defecto 0).
+#   - requiere_simbolo: Si es 1, cada contraseña tiene al menos un símbolo (por defecto 0).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - compact: 1 para devolver los resultados como arreglo, sin claves numeradas (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con las contraseñas generadas.
 ###########
 @app.route('/api/ContraseñaAleatoria', methods=['GET'])
-def ContraseñaAleatoria():
+@con_parametros(
+    parametro_cantidad(descripcion='Cantidad de contraseñas a generar.', maximo=MAX_CANTIDAD_CONTRASENAS),
+    Parametro('longitud', defecto=8, minimo=1, maximo=MAX_LONGITUD_CONTRASENA, codigo_minimo=1002, codigo_maximo=1002,
+              mensaje=f'La longitud debe ser mayor a 0 y menor a {MAX_LONGITUD_CONTRASENA}.'),
+    Parametro('requiere_digito', defecto=0, descripcion='1 para garantizar al menos un dígito por contraseña.'),
+    Parametro('requiere_simbolo', defecto=0, descripcion='1 para garantizar al menos un símbolo por contraseña.'),
+    PARAMETRO_STREAM,
+    PARAMETRO_COMPACT,
+    Parametro('seed', descripcion='Semilla para obtener resultados reproducibles. Con seed las contraseñas ya no son criptográficamente seguras.'),
+    reglas=(
+        (lambda valores: valores['longitud'] < bool(valores['requiere_digito']) + bool(valores['requiere_simbolo']),
+         1002, 'La longitud no alcanza para incluir los caracteres requeridos.'),
+    )
+)
+def ContraseñaAleatoria(parametros):
     """
     Genera una contraseña aleatoria con caracteres alfanuméricos y símbolos.
     ---
-    parameters:
-      - name: cantidad
-        in: query
-        type: integer
-        required: false
-        default: 1
-      - name: longitud
-        in: query
-        type: integer
-        required: false
-        default: 8
     responses:
       200:
         description: Contraseña aleatoria de 8 caracteres
@@ -1207,52 +4203,34 @@ def ContraseñaAleatoria():
           application/json: {"code":1001,"error":true,
           "message":"La cantidad debe ser mayor a 0.","status":400}
     """
-    longitud = request.args.get('longitud', 8, type=int)
-    cantidad = request.args.get('cantidad', 1, type=int)
-
-    if cantidad <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad debe ser mayor a 0.',
-            'code': 1001
-            }), 400
-    
-    if cantidad > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad debe ser menor a 100.',
-            'code': 1000
-            }), 400
-    
-    if longitud <= 0 or longitud > 128:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La longitud debe ser mayor a 0 y menor a 128.',
-            'code': 1002
-            }), 400
-
-    caracteres = (
-        'abcdefghijklmnopqrstuvwxyz'
-        'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-        '0123456789'
-        '!#$%&*-=+?'
-    )
+    longitud = parametros['longitud']
+    cantidad = parametros['cantidad']
+    stream = parametros['stream']
 
-    contrasenas = {
-        f"contraseña_{i+1}": ''.join(choices(caracteres, k=longitud))
-        for i in range(cantidad)
-    }
+    clases_requeridas = [
+        clase for clase, requerida in (('digitos', parametros['requiere_digito']), ('simbolos', parametros['requiere_simbolo']))
+        if requerida
+    ]
 
-    return jsonify({
-        'status': 200,
-        'error': False,
+    leer = obtener_rng().randbytes if g.get('semilla') is not None else os.urandom
+
+    if stream:
+        bloques = (generar_contrasenas(tamano, longitud, clases_requeridas, leer) for tamano in tamanos_bloque(cantidad))
+        return respuesta_stream(stream, ('contrasena',), chain.from_iterable(bloques))
+
+    contrasenas = generar_contrasenas(cantidad, longitud, clases_requeridas, leer)
+
+    if not parametros['compact'] == 1:
+        contrasenas = {
+            f"contraseña_{i+1}": contrasena
+            for i, contrasena in enumerate(contrasenas)
+        }
+
+    return respuesta_json({
         'contrasenas': contrasenas,
         'longitud': longitud,
         'cantidad': cantidad
-    }), 200
+    })
 
 ### API ###
 # Nombre: FechaAleatoria
@@ -1262,29 +4240,28 @@ def ContraseñaAleatoria():
 #   - fecha_inicial: Fecha inicial (por defecto 01/01/2000).
 #   - fecha_final: Fecha final (por defecto la fecha actual).
 #   - cantidad: Cantidad de fechas a generar (por defecto 1).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - compact: 1 para devolver los resultados como arreglo, sin claves numeradas (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con la fecha aleatoria generada.
 ###########
 @app.route('/api/FechaAleatoria', methods=['GET'])
-def FechaAleatoria():
+@con_parametros(
+    Parametro('fecha_inicial', 'fecha', '01/01/2000', codigo=1003, mensaje='Formato de fecha inválido. Usa DD/MM/YYYY.'),
+    Parametro('fecha_final', 'fecha', lambda: datetime.combine(datetime.today(), datetime.min.time()), codigo=1003,
+              mensaje='Formato de fecha inválido. Usa DD/MM/YYYY.', descripcion='Por defecto la fecha actual.'),
+    parametro_cantidad(descripcion='Cantidad de fechas a generar.'),
+    PARAMETRO_STREAM,
+    PARAMETRO_COMPACT,
+    reglas=(
+        (lambda valores: valores['fecha_inicial'] > valores['fecha_final'],
+         1002, 'La fecha inicial no puede ser posterior a la fecha final.'),
+    )
+)
+def FechaAleatoria(parametros):
     """
     Genera una fecha aleatoria entre dos fechas dadas.
     ---
-    parameters:
-      - name: fecha_inicial
-        in: query
-        type: string
-        required: false
-        default: 01/01/2000
-      - name: fecha_final
-        in: query
-        type: string
-        required: false
-        default: fecha actual
-      - name: cantidad
-        in: query
-        type: integer
-        required: false
-        default: 1
     responses:
       200:
         description: Fecha aleatoria
@@ -1297,60 +4274,32 @@ def FechaAleatoria():
           application/json: {"code":1003,"error":true,
           "message":"Formato de fecha inválido. Usa DD/MM/YYYY.","status":400}
     """
-    fecha_inicial_str = request.args.get('fecha_inicial', '01/01/2000')
-    fecha_final_str = request.args.get(
-        'fecha_final',
-        datetime.today().strftime('%d/%m/%Y')
-    )
-    cantidad = request.args.get('cantidad', 1, type=int)
-
-    try:
-        fecha_inicial = datetime.strptime(fecha_inicial_str, '%d/%m/%Y')
-        fecha_final = datetime.strptime(fecha_final_str, '%d/%m/%Y')
-    except ValueError:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'Formato de fecha inválido. Usa DD/MM/YYYY.',
-            'code': 1003
-            }), 400
-
-    if cantidad <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad debe ser mayor a 0.',
-            'code': 1001
-            }), 400
-    
-    if cantidad > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad debe ser menor a 100.',
-            'code': 1000
-            }), 400
-
-    if fecha_inicial > fecha_final:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La fecha inicial no puede ser posterior a la fecha final.',
-            'code': 1002
-            }), 400
+    fecha_inicial = parametros['fecha_inicial']
+    fecha_final = parametros['fecha_final']
+    cantidad = parametros['cantidad']
+    stream = parametros['stream']
 
     delta = (fecha_final - fecha_inicial).days
-    fechas_aleatorias = {
-        f"fecha_{i+1}": (fecha_inicial + timedelta(days=randint(0, delta))).strftime('%d/%m/%Y')
-        for i in range(cantidad)
-    }
+    rng = obtener_rng()
 
-    return jsonify({
-        'status': 200,
-        'error': False,
+    if stream:
+        fechas = ((fecha_inicial + timedelta(days=rng.randint(0, delta))).strftime('%d/%m/%Y') for _ in range(cantidad))
+        return respuesta_stream(stream, ('fecha',), fechas)
+
+    fechas_aleatorias = [
+        (fecha_inicial + timedelta(days=rng.randint(0, delta))).strftime('%d/%m/%Y')
+        for _ in range(cantidad)
+    ]
+
+    if not parametros['compact'] == 1:
+        fechas_aleatorias = {
+            f"fecha_{i+1}": fecha for i, fecha in enumerate(fechas_aleatorias)
+        }
+
+    return respuesta_json({
         'fechas_aleatorias': fechas_aleatorias,
         'cantidad': cantidad
-    }), 200
+    })
 
 ### API ###
 # Nombre: HoraAleatoria
@@ -1360,35 +4309,28 @@ def FechaAleatoria():
 #   - hora_inicial: Hora inicial (por defecto 00:00:00).
 #   - hora_final: Hora final (por defecto 23:59:59).
 #   - cantidad: Cantidad de horas a generar (por defecto 1).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - compact: 1 para devolver los resultados como arreglo, sin claves numeradas (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con la hora aleatoria generada.
 ###########
 @app.route('/api/HoraAleatoria', methods=['GET'])
-def HoraAleatoria():
+@con_parametros(
+    Parametro('hora_inicial', 'hora', '00:00:00', codigo=1003, mensaje='Formato de hora inválido. Usa HH:MM:SS.'),
+    Parametro('hora_final', 'hora', '23:59:59', codigo=1003, mensaje='Formato de hora inválido. Usa HH:MM:SS.'),
+    Parametro('formato', 'opcion', '24h', opciones=('24h', '12h'), codigo=1004, mensaje='Formato no válido. Usa "12h" o "24h".'),
+    parametro_cantidad(descripcion='Cantidad de horas a generar.'),
+    PARAMETRO_STREAM,
+    PARAMETRO_COMPACT,
+    reglas=(
+        (lambda valores: valores['hora_inicial'] > valores['hora_final'],
+         1002, 'La hora inicial no puede ser posterior a la hora final.'),
+    )
+)
+def HoraAleatoria(parametros):
     """
     Genera una hora aleatoria entre dos horas dadas.
     ---
-    parameters:
-      - name: hora_inicial
-        in: query
-        type: string
-        required: false
-        default: 00:00:00
-      - name: hora_final
-        in: query
-        type: string
-        required: false
-        default: '23:59:59'
-      - name: formato
-        in: query
-        type: string
-        required: false
-        default: '24h'
-        enum: ['24h', '12h']
-      - name: cantidad
-        in: query
-        type: integer
-        required: false
-        default: 1
     responses:
       200:
         description: Hora aleatoria
@@ -1401,76 +4343,45 @@ def HoraAleatoria():
           application/json: {"code":1003,"error":true,
           "message":"Formato de hora inválido. Usa HH:MM:SS.","status":400}
     """
-    hora_inicial_str = request.args.get('hora_inicial', '00:00:00')
-    hora_final_str = request.args.get('hora_final', '23:59:59')
-    formato = request.args.get('formato', '24h').lower()
-    cantidad = request.args.get('cantidad', 1, type=int)
-
-    try:
-        hora_inicial = datetime.strptime(hora_inicial_str, '%H:%M:%S').time()
-        hora_final = datetime.strptime(hora_final_str, '%H:%M:%S').time()
-    except ValueError:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'Formato de hora inválido. Usa HH:MM:SS.',
-            'code': 1003
-        }), 400
-
-    if cantidad <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad debe ser mayor a 0.',
-            'code': 1001
-        }), 400
-
-    if cantidad > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad debe ser menor a 100.',
-            'code': 1000
-        }), 400
-
-    if hora_inicial > hora_final:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La hora inicial no puede ser posterior a la hora final.',
-            'code': 1002
-        }), 400
-
-    if formato not in ['24h', '12h']:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'Formato no válido. Usa "12h" o "24h".',
-            'code': 1004
-        }), 400
+    hora_inicial = parametros['hora_inicial']
+    hora_final = parametros['hora_final']
+    formato = parametros['formato']
+    cantidad = parametros['cantidad']
+    stream = parametros['stream']
 
     formato_strftime = '%I:%M:%S %p' if formato == '12h' else '%H:%M:%S'
 
-    horas_aleatorias = {
-        f"hora_{i+1}": (
+    rng = obtener_rng()
+
+    if stream:
+        inicio = datetime.combine(datetime.today(), hora_inicial)
+        rango_segundos = (datetime.combine(datetime.today(), hora_final) - inicio).seconds
+        horas = ((inicio + timedelta(seconds=rng.randint(0, rango_segundos))).strftime(formato_strftime) for _ in range(cantidad))
+        return respuesta_stream(stream, ('hora',), horas)
+
+    horas_aleatorias = [
+        (
             datetime.combine(datetime.today(), hora_inicial) +
-            timedelta(seconds=randint(0, (datetime.combine(datetime.today(), hora_final) -
+            timedelta(seconds=rng.randint(0, (datetime.combine(datetime.today(), hora_final) -
                                           datetime.combine(datetime.today(), hora_inicial)).seconds))
         ).strftime(formato_strftime) if formato == '12h' else
         (
             datetime.combine(datetime.today(), hora_inicial) +
-            timedelta(seconds=randint(0, (datetime.combine(datetime.today(), hora_final) -
+            timedelta(seconds=rng.randint(0, (datetime.combine(datetime.today(), hora_final) -
                                           datetime.combine(datetime.today(), hora_inicial)).seconds))
         ).strftime(formato_strftime)
-        for i in range(cantidad)
-    }
+        for _ in range(cantidad)
+    ]
 
-    return jsonify({
-        'status': 200,
-        'error': False,
+    if not parametros['compact'] == 1:
+        horas_aleatorias = {
+            f"hora_{i+1}": hora for i, hora in enumerate(horas_aleatorias)
+        }
+
+    return respuesta_json({
         'horas_aleatorias': horas_aleatorias,
         'cantidad': cantidad
-    }), 200
+    })
 
 ### API ###
 # Nombre: ColorAleatorio
@@ -1478,19 +4389,21 @@ def HoraAleatoria():
 # Descripción: Genera un color aleatorio en formato hexadecimal.
 # Parámetros:
 #   - cantidad: Cantidad de colores a generar (por defecto 1).
+#   - stream: Formato de salida en streaming, ndjson o csv (opcional).
+#   - compact: 1 para devolver los resultados como arreglo, sin claves numeradas (opcional).
+#   - seed: Semilla para obtener resultados reproducibles (opcional).
 # Respuesta: JSON con los colores generados.
 ###########
 @app.route('/api/ColorAleatorio', methods=['GET'])
-def ColorAleatorio():
+@con_parametros(
+    parametro_cantidad(descripcion='Cantidad de colores a generar.'),
+    PARAMETRO_STREAM,
+    PARAMETRO_COMPACT
+)
+def ColorAleatorio(parametros):
     """
     Genera un color aleatorio en formato hexadecimal.
     ---
-    parameters:
-      - name: cantidad
-        in: query
-        type: integer
-        required: false
-        default: 1
     responses:
       200:
         description: Color hexadecimal aleatorio
@@ -1503,36 +4416,148 @@ def ColorAleatorio():
           application/json: {"code":1001,"error":true,
           "message":"La cantidad debe ser mayor a 0.","status":400}
     """
-    cantidad = request.args.get('cantidad', 1, type=int)
-
-    if cantidad <= 0:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad debe ser mayor a 0.',
-            'code': 1001,
-            }), 400
-    
-    if cantidad > 100:
-        return jsonify({
-            'status': 400,
-            'error': True,
-            'message': 'La cantidad debe ser menor a 100.',
-            'code': 1000,
-            }), 400
-
-    colores = {
-        f"color_{i+1}": '#{:02x}{:02x}{:02x}'.format(randint(0, 255), randint(0, 255), randint(0, 255))
-        for i in range(cantidad)
-    }
+    cantidad = parametros['cantidad']
+    stream = parametros['stream']
 
-    return jsonify({
-        'status': 200,
-        'error': False,
+    if stream:
+        bloques = (colores_aleatorios(tamano) for tamano in tamanos_bloque(cantidad))
+        return respuesta_stream(stream, ('color',), chain.from_iterable(bloques))
+
+    colores = colores_aleatorios(cantidad)
+
+    if not parametros['compact'] == 1:
+        colores = {
+            f"color_{i+1}": color
+            for i, color in enumerate(colores)
+        }
+
+    return respuesta_json({
         'colores': colores,
         'cantidad': cantidad
     })
 
+### API ###
+# Nombre: batch
+# Tipo: POST
+# Descripción: Ejecuta varias llamadas a los endpoints generadores en una sola
+#    petición HTTP. Cada llamada se resuelve en el mismo proceso contra la
+#    función del endpoint, sin volver a pasar por la red, y su cuerpo JSON se
+#    inserta tal cual en la respuesta sin decodificarlo de nuevo.
+# Parámetros (cuerpo JSON):
+#   - Lista de objetos {"endpoint": "NumAleatorio", "params": {"cantidad": 5}}.
+# Respuesta: JSON con un resultado por llamada, en el mismo orden. Cada
+#    resultado es la respuesta del endpoint o un objeto de error.
+###########
+@app.route('/api/batch', methods=['POST'])
+def batch():
+    """
+    Ejecuta varias llamadas a los endpoints generadores en una sola petición.
+    ---
+    parameters:
+      - name: llamadas
+        in: body
+        required: true
+        description: Lista de llamadas con el nombre del endpoint y sus parámetros.
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              endpoint:
+                type: string
+                example: NumAleatorio
+              params:
+                type: object
+                example: {"cantidad": 3}
+    responses:
+      200:
+        description: Resultados de cada llamada
+        examples:
+          application/json: {"cantidad":2,"error":false,"resultados":[
+          {"aleatorios":[88],"cantidad":1,"error":false,"status":200},
+          {"code":1002,"error":true,"message":"Endpoint no encontrado: Foo.","status":404}],"status":200}
+      400:
+        description: Cuerpo de la petición inválido
+        examples:
+          application/json: {"code":1002,"error":true,
+          "message":"El cuerpo debe ser una lista de llamadas en formato JSON.","status":400}
+    """
+    llamadas = request.get_json(silent=True)
+
+    if not isinstance(llamadas, list):
+        return respuesta_error('El cuerpo debe ser una lista de llamadas en formato JSON.', 1002)
+
+    if len(llamadas) <= 0:
+        return respuesta_error('La cantidad de llamadas debe ser mayor a 0.', 1001)
+
+    if len(llamadas) > MAX_LLAMADAS_BATCH:
+        return respuesta_error(f'La cantidad de llamadas debe ser menor a {MAX_LLAMADAS_BATCH}.', 1000)
+
+    # Las llamadas marcan sus fases en su propio contexto; para Server-Timing
+    # del lote todas cuentan como generación
+    marcar_generacion()
+    adaptador = app.url_map.bind('localhost')
+    resultados = [ejecutar_llamada(adaptador, llamada) for llamada in llamadas]
+
+    return respuesta_json({'cantidad': len(resultados)}, {'resultados': b'[' + b','.join(resultados) + b']'})
+
+### FUNCIÓN ###
+# Nombre: ejecutar_llamada
+# Descripción: Resuelve una llamada del lote contra la función del endpoint
+#    correspondiente, dentro de un contexto de petición propio.
+# Parámetros:
+#   - adaptador: MapAdapter de las rutas de la aplicación.
+#   - llamada: Objeto {"endpoint": ..., "params": {...}} de la llamada.
+# Respuesta: Cuerpo JSON en bytes de la respuesta del endpoint o del error.
+###############
+def ejecutar_llamada(adaptador, llamada):
+    def error(status, message, code):
+        return app.json.codificar({'status': status, 'error': True, 'message': message, 'code': code})
+
+    if not isinstance(llamada, dict) or not isinstance(llamada.get('endpoint'), str):
+        return error(400, 'Cada llamada debe tener un "endpoint" de tipo texto.', 1002)
+
+    params = llamada.get('params', {})
+    if not isinstance(params, dict):
+        return error(400, 'Los "params" de la llamada deben ser un objeto.', 1002)
+
+    if 'stream' in params:
+        return error(400, 'El parámetro stream no está disponible dentro de un lote.', 1004)
+
+    # Un lote de llamadas masivas juntaría millones de valores en una sola respuesta
+    if 'masivo' in params:
+        return error(400, 'El parámetro masivo no está disponible dentro de un lote.', 1004)
+
+    # Solo se rechazan los formatos binarios; HoraAleatoria usa formato=12h/24h
+    formato = str(params.get('formato', '')).lower()
+    if formato != 'json' and formato in FORMATOS_RESPUESTA:
+        return error(400, 'Dentro de un lote solo está disponible el formato json.', 1004)
+
+    nombre = llamada['endpoint']
+    ruta = nombre if nombre.startswith('/') else f'/api/{nombre}'
+
+    try:
+        endpoint, argumentos = adaptador.match(ruta, method='GET')
+    except HTTPException:
+        return error(404, f'Endpoint no encontrado: {nombre}.', 1002)
+
+    if not ruta.startswith('/api/') or endpoint == 'batch':
+        return error(404, f'Endpoint no encontrado: {nombre}.', 1002)
+
+    query = {clave: str(valor) for clave, valor in params.items()}
+    # Contexto de aplicación propio para que cada llamada tenga su propio g
+    with app.app_context(), app.test_request_context(ruta, method='GET', query_string=query):
+        try:
+            respuesta = app.preprocess_request()
+            if respuesta is None:
+                respuesta = app.view_functions[endpoint](**argumentos)
+            respuesta = app.make_response(respuesta)
+        except Exception:
+            app.logger.exception('Error en la llamada %s del lote', nombre)
+            return error(500, f'Error interno al ejecutar {nombre}.', 1003)
+
+    return respuesta.get_data()
+
 # Ejecutar servidor
 if __name__ == '__main__':
     app.run()
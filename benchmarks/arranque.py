@@ -0,0 +1,127 @@
+### DOCUMENTACIÓN ###
+# Nombre: arranque.py
+# Descripción: Benchmark de arranque de RandomMiscellaneousAPI. Mide, en
+#    procesos nuevos de Python:
+#      - El tiempo total de importación del módulo según python -X importtime
+#        y los paquetes que más tardan en importarse.
+#      - El tiempo hasta la primera respuesta: desde que arranca el intérprete
+#        hasta que se responde la primera petición (con el cliente de pruebas
+#        de Flask, sin red).
+#    Se ejecuta desde la carpeta del proyecto:
+#        python benchmarks/arranque.py [--repeticiones 5] [--produccion] [--salida arranque.json]
+#####################
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULO = 'RandomMiscellaneousAPI'
+
+# Código que ejecuta el proceso hijo para medir la primera respuesta
+PRIMERA_RESPUESTA = f'''
+import {MODULO} as api
+respuesta = api.app.test_client().get('/api/NumAleatorio')
+assert respuesta.status_code == 200
+'''
+
+### FUNCIÓN ###
+# Nombre: entorno
+# Descripción: Variables de entorno de los procesos hijos.
+# Parámetros:
+#   - produccion: True para arrancar con RMAPI_PRODUCCION=1.
+# Respuesta: Diccionario con el entorno.
+###############
+def entorno(produccion):
+    variables = dict(os.environ)
+    variables.pop('RMAPI_PRODUCCION', None)
+    if produccion:
+        variables['RMAPI_PRODUCCION'] = '1'
+    return variables
+
+### FUNCIÓN ###
+# Nombre: medir_importtime
+# Descripción: Importa el módulo con python -X importtime y lee el informe.
+# Parámetros:
+#   - produccion: True para arrancar con RMAPI_PRODUCCION=1.
+# Respuesta: Tupla (microsegundos totales, {paquete de primer nivel: microsegundos}).
+###############
+def medir_importtime(produccion):
+    proceso = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {MODULO}'],
+        cwd=RAIZ, env=entorno(produccion), capture_output=True, text=True, check=True
+    )
+
+    total = 0
+    paquetes = {}
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith('import time:') or 'cumulative' in linea:
+            continue
+        _, acumulado, nombre = linea[len('import time:'):].split('|')
+        sangria = len(nombre) - len(nombre.lstrip())
+        if nombre.strip() == MODULO:
+            total = int(acumulado)
+        elif sangria == 3:
+            # Importación hecha directamente por el módulo
+            paquete = nombre.strip().split('.')[0]
+            paquetes[paquete] = paquetes.get(paquete, 0) + int(acumulado)
+
+    return total, paquetes
+
+### FUNCIÓN ###
+# Nombre: medir_primera_respuesta
+# Descripción: Lanza un intérprete nuevo que importa la API y responde una
+#    petición, y mide el tiempo total.
+# Parámetros:
+#   - produccion: True para arrancar con RMAPI_PRODUCCION=1.
+# Respuesta: Segundos transcurridos.
+###############
+def medir_primera_respuesta(produccion):
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, '-c', PRIMERA_RESPUESTA], cwd=RAIZ, env=entorno(produccion), check=True)
+    return time.perf_counter() - inicio
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de arranque de RandomMiscellaneousAPI.')
+    parser.add_argument('--repeticiones', type=int, default=5, help='Procesos lanzados por medición.')
+    parser.add_argument('--produccion', action='store_true', help='Arrancar con RMAPI_PRODUCCION=1.')
+    parser.add_argument('--salida', help='Archivo JSON donde guardar los resultados.')
+    args = parser.parse_args()
+
+    importaciones = [medir_importtime(args.produccion) for _ in range(args.repeticiones)]
+    primeras = [medir_primera_respuesta(args.produccion) for _ in range(args.repeticiones)]
+
+    totales = [total / 1e6 for total, _ in importaciones]
+    paquetes = {}
+    for _, medicion in importaciones:
+        for paquete, microsegundos in medicion.items():
+            paquetes.setdefault(paquete, []).append(microsegundos / 1e6)
+    mas_lentos = sorted(
+        ((paquete, statistics.median(tiempos)) for paquete, tiempos in paquetes.items()),
+        key=lambda par: par[1], reverse=True
+    )[:10]
+
+    resultados = {
+        'python': sys.version.split()[0],
+        'produccion': args.produccion,
+        'repeticiones': args.repeticiones,
+        'importtime_s': {'mediana': statistics.median(totales), 'minimo': min(totales)},
+        'primera_respuesta_s': {'mediana': statistics.median(primeras), 'minimo': min(primeras)},
+        'paquetes_mas_lentos_s': dict(mas_lentos),
+    }
+
+    print(f"importtime: mediana {resultados['importtime_s']['mediana']:.3f}s, mínimo {resultados['importtime_s']['minimo']:.3f}s")
+    print(f"primera respuesta: mediana {resultados['primera_respuesta_s']['mediana']:.3f}s, mínimo {resultados['primera_respuesta_s']['minimo']:.3f}s")
+    for paquete, segundos in mas_lentos:
+        print(f'  {paquete:<24}{segundos:.3f}s')
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(resultados, archivo, ensure_ascii=False, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+### DOCUMENTACIÓN ###
+# Nombre: endpoints.py
+# Descripción: Benchmark de los endpoints de RandomMiscellaneousAPI. Recorre
+#    todas las rutas con el cliente de pruebas de Flask a varias cantidades y
+#    mide peticiones por segundo, latencia p50/p99 y memoria asignada por
+#    petición (pico de tracemalloc). Cada ejecución se compara con la línea
+#    base guardada en benchmarks/linea_base.json y termina con código 1 si
+#    algún caso empeora más de la tolerancia.
+#    Se ejecuta desde la carpeta del proyecto:
+#        python benchmarks/endpoints.py                  # comparar con la línea base
+#        python benchmarks/endpoints.py --guardar        # actualizar la línea base
+#        python benchmarks/endpoints.py --filtro Color   # solo algunos casos
+#    Las peticiones de cada caso se reparten en rondas que recorren todos los
+#    casos, así una ralentización pasajera de la máquina afecta a una sola
+#    ronda: rps y p50 son los de la mejor ronda y p99 la mediana de las rondas.
+#    Los tiempos dependen de la máquina, así que la línea base debe generarse
+#    en la misma máquina (o del mismo tipo) en la que se compara.
+#####################
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from urllib.parse import urlencode
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINEA_BASE = os.path.join(RAIZ, 'benchmarks', 'linea_base.json')
+sys.path.insert(0, RAIZ)
+
+from RandomMiscellaneousAPI import app
+
+# Casos: (ruta, argumento de cantidad, argumentos fijos, cantidades)
+CANTIDADES = (1, 10, 100)
+CASOS = (
+    ('/api/NumAleatorio', 'cantidad', {}, CANTIDADES),
+    ('/api/NumAleatorio', 'cantidad', {'masivo': 1}, (1000, 100000)),
+    # Enteros de más de 64 bits: orjson no los codifica y se usa json
+    ('/api/NumAleatorio', 'cantidad', {'lim_superior': 10**23}, (1, 100)),
+    ('/api/NumDecimalAleatorio', 'cantidad', {}, CANTIDADES),
+    ('/api/BarajaAleatoria', 'manos', {'cartas_por_mano': 1}, (1, 10, 52)),
+    ('/api/LanzamientosMoneda', 'lanzamientos', {}, CANTIDADES),
+    ('/api/LanzamientosDado', 'lanzamientos', {'dados': 2}, CANTIDADES),
+    ('/api/NombreAleatorio', 'cantidad', {}, CANTIDADES),
+    ('/api/DecisionAleatoria', 'cantidad', {}, CANTIDADES),
+    ('/api/LetraAleatoria', 'cantidad', {}, CANTIDADES),
+    ('/api/CaracterAleatorio', 'cantidad', {}, CANTIDADES),
+    ('/api/PiedraPapelTijera', None, {}, (1,)),
+    ('/api/EmojiAleatorio', 'cantidad', {}, CANTIDADES),
+    ('/api/CoordenadaAleatoria', 'cantidad', {}, CANTIDADES),
+    ('/api/PaisAleatorio', 'cantidad', {}, CANTIDADES),
+    ('/api/BinarioAleatorio', 'cantidad', {'longitud': 16}, CANTIDADES),
+    ('/api/SeleccionAleatoria', 'cantidad', {'valores_str': 'rojo,verde,azul,amarillo', 'unicos': 0}, CANTIDADES),
+    ('/api/ContraseñaAleatoria', 'cantidad', {'longitud': 16}, CANTIDADES),
+    ('/api/FechaAleatoria', 'cantidad', {}, CANTIDADES),
+    ('/api/HoraAleatoria', 'cantidad', {}, CANTIDADES),
+    ('/api/ColorAleatorio', 'cantidad', {}, CANTIDADES),
+)
+
+### FUNCIÓN ###
+# Nombre: urls_casos
+# Descripción: Construye la URL de cada combinación de caso y cantidad.
+# Respuesta: Lista de URLs.
+###############
+def urls_casos():
+    urls = []
+    for ruta, argumento, fijos, cantidades in CASOS:
+        for cantidad in cantidades:
+            argumentos = dict(fijos)
+            if argumento is not None:
+                argumentos[argumento] = cantidad
+            urls.append(f'{ruta}?{urlencode(argumentos)}' if argumentos else ruta)
+    return urls
+
+### FUNCIÓN ###
+# Nombre: medir_ronda
+# Descripción: Ejecuta una ronda de peticiones de un caso y mide su latencia.
+# Parámetros:
+#   - cliente: Cliente de pruebas de Flask.
+#   - url: URL del caso.
+#   - peticiones: Peticiones de la ronda.
+# Respuesta: Tupla (rps, p50 en segundos, p99 en segundos).
+###############
+def medir_ronda(cliente, url, peticiones):
+    latencias = []
+    inicio_ronda = time.perf_counter()
+    for _ in range(peticiones):
+        inicio = time.perf_counter()
+        cliente.get(url).get_data()
+        latencias.append(time.perf_counter() - inicio)
+    rps = peticiones / (time.perf_counter() - inicio_ronda)
+
+    latencias.sort()
+    return rps, latencias[len(latencias) // 2], latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))]
+
+### FUNCIÓN ###
+# Nombre: medir_memoria
+# Descripción: Mide con tracemalloc el pico de memoria asignada durante una
+#    petición (mediana de varias), aparte de las rondas de tiempo.
+# Parámetros:
+#   - cliente: Cliente de pruebas de Flask.
+#   - url: URL del caso.
+#   - peticiones: Peticiones medidas.
+# Respuesta: Kilobytes.
+###############
+def medir_memoria(cliente, url, peticiones):
+    picos = []
+    tracemalloc.start()
+    for _ in range(peticiones):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        cliente.get(url).get_data()
+        _, pico = tracemalloc.get_traced_memory()
+        picos.append(pico - base)
+    tracemalloc.stop()
+    return statistics.median(picos) / 1024
+
+### FUNCIÓN ###
+# Nombre: comparar
+# Descripción: Compara un resultado con su línea base.
+# Parámetros:
+#   - actual: Resultado del caso.
+#   - base: Resultado guardado en la línea base.
+#   - tolerancia: Fracción de empeoramiento permitida en rps y p50.
+#   - tolerancia_p99: Fracción de empeoramiento permitida en p99.
+#   - tolerancia_memoria: Fracción de empeoramiento permitida en memoria.
+# Respuesta: Lista de textos con las regresiones encontradas.
+###############
+def comparar(actual, base, tolerancia, tolerancia_p99, tolerancia_memoria):
+    regresiones = []
+    if actual['rps'] < base['rps'] * (1 - tolerancia):
+        regresiones.append(f"rps {base['rps']} -> {actual['rps']}")
+    if actual['p50_ms'] > base['p50_ms'] * (1 + tolerancia):
+        regresiones.append(f"p50_ms {base['p50_ms']} -> {actual['p50_ms']}")
+    if actual['p99_ms'] > base['p99_ms'] * (1 + tolerancia_p99):
+        regresiones.append(f"p99_ms {base['p99_ms']} -> {actual['p99_ms']}")
+    # Margen fijo de 1 KB para no fallar por ruido en casos muy pequeños
+    if actual['pico_kb'] > base['pico_kb'] * (1 + tolerancia_memoria) + 1:
+        regresiones.append(f"pico_kb {base['pico_kb']} -> {actual['pico_kb']}")
+    return regresiones
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de los endpoints de RandomMiscellaneousAPI.')
+    parser.add_argument('--peticiones', type=int, default=200, help='Peticiones medidas por caso.')
+    parser.add_argument('--rondas', type=int, default=5, help='Rondas en las que se reparten las peticiones.')
+    parser.add_argument('--calentamiento', type=int, default=20, help='Peticiones sin medir antes de empezar.')
+    parser.add_argument('--tolerancia', type=float, default=0.35, help='Empeoramiento permitido en rps y p50 (0.35 = 35%%).')
+    parser.add_argument('--tolerancia-p99', type=float, default=1.0, help='Empeoramiento permitido en p99.')
+    parser.add_argument('--tolerancia-memoria', type=float, default=0.20, help='Empeoramiento permitido en memoria por petición.')
+    parser.add_argument('--filtro', default='', help='Solo los casos cuya URL contenga este texto.')
+    parser.add_argument('--guardar', action='store_true', help='Guardar los resultados como nueva línea base.')
+    parser.add_argument('--linea-base', default=LINEA_BASE, help='Archivo JSON de la línea base.')
+    args = parser.parse_args()
+
+    cliente = app.test_client()
+    urls = [url for url in urls_casos() if args.filtro in url]
+
+    for url in urls:
+        for _ in range(args.calentamiento):
+            respuesta = cliente.get(url)
+            if respuesta.status_code != 200:
+                raise SystemExit(f'{url} respondió {respuesta.status_code}: {respuesta.get_data(as_text=True)[:200]}')
+
+    por_ronda = max(args.peticiones // args.rondas, 1)
+    rondas = {url: [] for url in urls}
+    for _ in range(args.rondas):
+        for url in urls:
+            gc.collect()
+            rondas[url].append(medir_ronda(cliente, url, por_ronda))
+
+    resultados = {}
+    for url in urls:
+        rps, p50, p99 = zip(*rondas[url])
+        resultados[url] = {
+            'rps': round(max(rps), 1),
+            'p50_ms': round(min(p50) * 1000, 3),
+            'p99_ms': round(statistics.median(p99) * 1000, 3),
+            'pico_kb': round(medir_memoria(cliente, url, max(args.peticiones // 10, 5)), 1),
+        }
+
+    base = {}
+    if not args.guardar and os.path.exists(args.linea_base):
+        with open(args.linea_base, encoding='utf-8') as archivo:
+            base = json.load(archivo)['casos']
+
+    regresiones = 0
+    print(f"{'caso':<72}{'rps':>10}{'p50 ms':>10}{'p99 ms':>10}{'pico KB':>10}")
+    for url, resultado in resultados.items():
+        print(f"{url:<72}{resultado['rps']:>10}{resultado['p50_ms']:>10}{resultado['p99_ms']:>10}{resultado['pico_kb']:>10}")
+        if url in base:
+            for texto in comparar(resultado, base[url], args.tolerancia, args.tolerancia_p99, args.tolerancia_memoria):
+                print(f'    REGRESIÓN: {texto}')
+                regresiones += 1
+        elif base:
+            print('    (sin línea base)')
+
+    if args.guardar:
+        with open(args.linea_base, 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'python': sys.version.split()[0],
+                'peticiones': args.peticiones,
+                'rondas': args.rondas,
+                'casos': resultados,
+            }, archivo, ensure_ascii=False, indent=2)
+            archivo.write('\n')
+        print(f'Línea base guardada en {args.linea_base}')
+    elif not base:
+        print(f'No hay línea base en {args.linea_base}; usa --guardar para crearla.')
+
+    if regresiones:
+        print(f'{regresiones} regresiones respecto a la línea base.')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+### DOCUMENTACIÓN ###
+# Nombre: generar_openapi.py
+# Descripción: Genera la especificación OpenAPI de RandomMiscellaneousAPI a
+#    partir de los docstrings de las vistas (con flasgger) y la guarda en
+#    static/openapi.json. Se ejecuta una vez en la construcción:
+#        python generar_openapi.py
+#    Con RMAPI_PRODUCCION=1 la API sirve ese archivo en /apispec_1.json sin
+#    importar flasgger.
+#####################
+
+import json
+import os
+
+# La especificación se genera siempre con flasgger
+os.environ.pop('RMAPI_PRODUCCION', None)
+
+from RandomMiscellaneousAPI import app, ARCHIVO_OPENAPI
+
+if __name__ == '__main__':
+    respuesta = app.test_client().get('/apispec_1.json')
+    if respuesta.status_code != 200:
+        raise SystemExit(f'No se pudo generar la especificación (status {respuesta.status_code}).')
+
+    os.makedirs(os.path.dirname(ARCHIVO_OPENAPI), exist_ok=True)
+    with open(ARCHIVO_OPENAPI, 'w', encoding='utf-8') as archivo:
+        json.dump(respuesta.get_json(), archivo, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+    print(f'Especificación guardada en {ARCHIVO_OPENAPI}')
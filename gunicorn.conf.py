@@ -0,0 +1,61 @@
+### DOCUMENTACIÓN ###
+# Nombre: gunicorn.conf.py
+# Descripción: Configuración de gunicorn para RandomMiscellaneousAPI. gunicorn
+#    la carga automáticamente al ejecutarse desde esta carpeta:
+#        gunicorn
+#    La aplicación se precarga en el proceso maestro (preload_app) para que los
+#    workers arranquen rápido compartiendo memoria por copy-on-write, y en cada
+#    worker se vuelven a sembrar los generadores aleatorios después del fork.
+# Variables de entorno:
+#   - PORT: Puerto en el que escucha el servidor (por defecto 8000).
+#   - WEB_CONCURRENCY: Cantidad de workers (por defecto 2 * CPUs + 1).
+#   - RMAPI_HILOS: Hilos por worker (por defecto 2).
+#   - RMAPI_METRICAS_DIR: Directorio donde los workers comparten sus métricas
+#     (por defecto uno temporal propio de esta ejecución).
+#   - RMAPI_SESIONES_DIR: Directorio donde los workers comparten las sesiones
+#     de baraja (por defecto uno temporal propio de esta ejecución).
+#####################
+
+import multiprocessing
+import os
+
+wsgi_app = 'RandomMiscellaneousAPI:app'
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+preload_app = True
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('RMAPI_HILOS', 2))
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+# Nombre: on_starting
+# Descripción: Se ejecuta en el maestro al arrancar. Borra las métricas y las
+#    sesiones de baraja que hayan quedado de una ejecución anterior en los
+#    mismos directorios.
+def on_starting(server):
+    from RandomMiscellaneousAPI import limpiar_metricas, limpiar_sesiones
+    limpiar_metricas()
+    limpiar_sesiones()
+
+# Nombre: when_ready
+# Descripción: Se ejecuta en el maestro antes de crear los workers. Importa
+#    NumPy y construye la instancia de Faker del locale por defecto, que la API
+#    carga al primer uso, para que los workers los hereden ya cargados.
+def when_ready(server):
+    import numpy
+    from RandomMiscellaneousAPI import obtener_faker, FAKER_LOCALE_DEFECTO
+    obtener_faker(FAKER_LOCALE_DEFECTO)
+
+# Nombre: post_fork
+# Descripción: Se ejecuta en cada worker recién creado. Vuelve a sembrar los
+#    generadores para que ningún worker repita la secuencia de otro.
+def post_fork(server, worker):
+    from RandomMiscellaneousAPI import reiniciar_generadores
+    reiniciar_generadores()
+
+# Nombre: on_exit
+# Descripción: Se ejecuta en el maestro al detener el servidor. Borra los
+#    archivos de métricas de los workers y los de las sesiones de baraja.
+def on_exit(server):
+    from RandomMiscellaneousAPI import limpiar_metricas, limpiar_sesiones
+    limpiar_metricas()
+    limpiar_sesiones()